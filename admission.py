@@ -0,0 +1,164 @@
+"""
+수락 제어(admission control) 모듈
+클라이언트별 토큰 버킷과 전체 동시 생성 수 제한으로 생성 요청을 받을지 결정합니다.
+자리가 없으면 짧은 대기열에서 기다리고, 그래도 없으면 바로 거절하여
+이미 수락된 요청의 지연 시간과 API 할당량을 보호합니다.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import metrics
+from rate_limit import TokenBucket
+
+
+class AdmissionRejected(Exception):
+    """요청을 수락할 수 없을 때 발생합니다. retry_after는 다시 시도할 때까지의 권장 시간(초)입니다."""
+
+    def __init__(self, message: str, reason: str, retry_after: float):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After 헤더 값 (정수 초, 최소 1)"""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class AdmissionController:
+    """클라이언트별 속도 제한과 전체 동시 실행 수 제한
+
+    - requests_per_minute/burst: 클라이언트마다 분당 요청 수와 순간 허용량 (0이면 제한 없음)
+    - max_in_flight: 동시에 실행할 수 있는 생성 요청 수
+    - max_waiting: 자리가 날 때까지 기다릴 수 있는 요청 수 (넘으면 즉시 거절)
+    - wait_timeout: 대기열에서 기다리는 최대 시간(초)
+    - max_clients: 버킷을 유지할 클라이언트 수 (오래 사용하지 않은 클라이언트부터 정리)
+    """
+
+    def __init__(self, max_in_flight: int = 8, max_waiting: int = 16, wait_timeout: float = 2.0,
+                 requests_per_minute: float = 10, burst: Optional[float] = None,
+                 max_clients: int = 10000, overload_retry_after: float = 2.0):
+        self.max_in_flight = max_in_flight
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.max_clients = max_clients
+        self.overload_retry_after = overload_retry_after
+
+        self._buckets: 'OrderedDict[str, TokenBucket]' = OrderedDict()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._stats = {'admitted': 0, 'queued': 0, 'rate_limited': 0, 'overloaded': 0}
+
+    def _bucket(self, client_id: str) -> TokenBucket:
+        with self._condition:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = self._buckets[client_id] = TokenBucket.per_minute(self.requests_per_minute, self.burst)
+                while len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client_id)
+            return bucket
+
+    def _reject(self, reason: str, message: str, retry_after: float):
+        with self._condition:
+            self._stats[reason] += 1
+        metrics.ADMISSION_DECISIONS.inc(outcome=reason)
+        raise AdmissionRejected(message, reason, retry_after)
+
+    def _check_rate(self, client_id: str):
+        if self.requests_per_minute <= 0:
+            return
+        bucket = self._bucket(client_id)
+        if not bucket.try_acquire():
+            self._reject('rate_limited', '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.',
+                         bucket.time_until_available())
+
+    def _acquire_slot(self):
+        with self._condition:
+            if self._in_flight < self.max_in_flight and self._waiting == 0:
+                self._in_flight += 1
+                self._stats['admitted'] += 1
+                outcome = 'admitted'
+            elif self._waiting >= self.max_waiting:
+                outcome = None
+            else:
+                self._waiting += 1
+                self._stats['queued'] += 1
+                deadline = time.monotonic() + self.wait_timeout
+                try:
+                    while self._in_flight >= self.max_in_flight:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                if self._in_flight < self.max_in_flight:
+                    self._in_flight += 1
+                    self._stats['admitted'] += 1
+                    outcome = 'queued'
+                else:
+                    outcome = None
+
+        if outcome is None:
+            self._reject('overloaded', '서버가 혼잡합니다. 잠시 후 다시 시도해주세요.', self.overload_retry_after)
+        metrics.ADMISSION_DECISIONS.inc(outcome=outcome)
+
+    def acquire(self, client_id: str):
+        """클라이언트 속도 제한을 확인하고 실행 자리를 얻습니다. 수락할 수 없으면 AdmissionRejected를 발생시킵니다.
+
+        성공하면 작업이 끝난 뒤 반드시 release()를 호출해야 합니다.
+        """
+        self._check_rate(client_id)
+        try:
+            self._acquire_slot()
+        except AdmissionRejected:
+            # 혼잡으로 거절한 요청은 클라이언트의 요청 수에 넣지 않습니다
+            self.refund(client_id)
+            raise
+
+    def refund(self, client_id: str):
+        """처리되지 않은 요청(혼잡 거절, 잘못된 입력)에 사용한 클라이언트의 요청 수를 돌려줍니다."""
+        if self.requests_per_minute <= 0:
+            return
+        with self._condition:
+            bucket = self._buckets.get(client_id)
+        if bucket is not None:
+            bucket.refund()
+
+    def release(self):
+        """실행 자리를 반납하고 기다리는 요청 하나를 깨웁니다."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def admit(self, client_id: str):
+        """with 블록 동안 실행 자리를 차지합니다. 블록 안에서 refund(client_id)를 호출할 수 있습니다."""
+        self.acquire(client_id)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, int]:
+        """현재 실행/대기 중인 요청 수와 수락·거절 횟수를 반환합니다."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update({
+                'in_flight': self._in_flight,
+                'max_in_flight': self.max_in_flight,
+                'waiting': self._waiting,
+                'max_waiting': self.max_waiting,
+                'clients': len(self._buckets),
+            })
+            return stats
@@ -0,0 +1,90 @@
+"""
+API 응답 처리 모듈
+/api/ 응답을 UTF-8 그대로(\\uXXXX 이스케이프 없이) 직렬화하고,
+강한 ETag와 If-None-Match(304), gzip 압축, ?fields= 필드 선택을 적용합니다.
+"""
+
+import gzip
+import hashlib
+from typing import Dict, Optional, Set
+
+from flask import Flask, request
+
+
+# 필드 선택과 관계없이 항상 포함하는 필드
+ALWAYS_FIELDS = ('success', 'error')
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html')
+
+
+def requested_fields() -> Optional[Set[str]]:
+    """?fields=a,b 쿼리에서 요청한 최상위 필드 집합을 반환합니다. 지정하지 않았으면 None입니다."""
+    value = request.args.get('fields')
+    if value is None:
+        return None
+    return {field.strip() for field in value.split(',') if field.strip()}
+
+
+def select_fields(payload: Dict, fields: Optional[Set[str]] = None) -> Dict:
+    """응답 딕셔너리에서 요청한 필드만 남깁니다.
+
+    값이 호출 가능한 객체이면 필드가 선택된 경우에만 호출하여 값을 계산합니다
+    (예: text_content를 요청하지 않으면 텍스트 변환을 하지 않음).
+    """
+    if fields is None:
+        fields = requested_fields()
+    selected = {}
+    for key, value in payload.items():
+        if fields is not None and key not in fields and key not in ALWAYS_FIELDS:
+            continue
+        selected[key] = value() if callable(value) else value
+    return selected
+
+
+def _accepts_gzip() -> bool:
+    return request.accept_encodings['gzip'] > 0
+
+
+def init_app(app: Flask, min_size: int = 1024, compress_level: int = 6, prefix: str = '/api/'):
+    """애플리케이션에 응답 처리를 등록합니다.
+
+    - min_size 바이트 이상인 응답만 gzip으로 압축합니다.
+    - ETag는 GET/HEAD 요청의 200 응답에만 붙이며, 압축본은 별도의 ETag(-gzip 접미사)를 가집니다.
+    - 스트리밍 응답(SSE, ZIP)과 파일 응답은 건드리지 않습니다.
+    """
+    app.json.ensure_ascii = False
+    app.json.compact = True
+
+    @app.after_request
+    def process_api_response(response):
+        if not request.path.startswith(prefix):
+            return response
+        if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers:
+            return response
+
+        body = response.get_data()
+        compress = (
+            len(body) >= min_size
+            and response.mimetype in COMPRESSIBLE_MIMETYPES
+            and _accepts_gzip()
+        )
+        if len(body) >= min_size and response.mimetype in COMPRESSIBLE_MIMETYPES:
+            response.vary.add('Accept-Encoding')
+
+        if request.method in ('GET', 'HEAD') and response.status_code == 200:
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            if compress:
+                etag += '-gzip'
+            response.set_etag(etag)
+            if request.if_none_match.contains(etag):
+                # 본문을 보내지 않으므로 압축할 필요도 없습니다
+                response.status_code = 304
+                response.set_data(b'')
+                response.headers.pop('Content-Type', None)
+                response.headers.pop('Content-Length', None)
+                return response
+
+        if compress:
+            response.set_data(gzip.compress(body, compresslevel=compress_level))
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
@@ -3,29 +3,73 @@ Flask 웹 애플리케이션
 인스타툰 스토리보드 생성기의 웹 인터페이스를 제공합니다.
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
 import json
 import os
 import io
 from datetime import datetime
-from docx import Document
-from docx.shared import Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from main import InstaToonGenerator
+import threading
+import time
+from functools import wraps
 from config import Config
+from admission import AdmissionController, AdmissionRejected
+from jobs import JobManager, QueueFullError, PRIORITIES
+from docx_render import DocxRenderer, DOCX_MIMETYPE
+from bulk_export import iter_export_zip
+from storage import content_hash, filename_for, id_from_filename
+from storyboard_model import load_storyboard, normalize_storyboard
+from storyboard_schema import validate_storyboard
+import api_response
+import assets
+import metrics
+from api_response import select_fields
 
-# 글로벌 생성기 인스턴스
-generator = InstaToonGenerator()
+# 글로벌 생성기 인스턴스 (첫 사용 시 생성)
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def get_generator():
+    """글로벌 생성기를 반환합니다. 처음 호출될 때 한 번만 생성합니다.
+    
+    main 모듈(requests, GPT 클라이언트 포함)도 이때 임포트하여 '/' 같은 요청의 콜드 스타트를 줄입니다.
+    """
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                from main import InstaToonGenerator
+                _generator = InstaToonGenerator()
+    return _generator
+
+
+def warmup():
+    """생성기를 만들고 GPT API 연결을 미리 열어 둡니다 (첫 생성 요청의 연결 지연 제거)."""
+    generator = get_generator()
+    if generator.gpt_client and generator.gpt_client.warmup():
+        print("GPT API 연결 예열 완료")
+
+# DOCX 렌더러 (같은 스토리보드의 반복 다운로드는 캐시된 바이트를 사용)
+docx_renderer = DocxRenderer(max_entries=Config.DOCX_CACHE_MAX_ENTRIES)
 
 # Vercel 배포를 위한 애플리케이션 팩토리
 def create_app():
     """Flask 애플리케이션 팩토리"""
+    # 정적 파일은 assets 모듈이 지문 URL과 압축본으로 제공합니다
     app = Flask(__name__, 
-                static_folder='static',
-                static_url_path='/static',
+                static_folder=None,
                 template_folder='templates')
     CORS(app)
+    api_response.init_app(app, min_size=Config.API_GZIP_MIN_BYTES)
+    assets.init_app(app, os.path.join(app.root_path, 'static'))
+    metrics.init_app(app)
+    
+    if not Config.LAZY_INIT:
+        get_generator()
+    if Config.WARMUP_ON_START:
+        # 첫 요청을 막지 않도록 백그라운드에서 생성기를 만들고 API 연결을 엽니다
+        threading.Thread(target=warmup, name='warmup', daemon=True).start()
     
     return app
 
@@ -33,143 +77,215 @@ def create_app():
 app = create_app()
 
 
+@metrics.timed('text')
 def storyboard_to_text(storyboard):
     """스토리보드를 읽기 쉬운 텍스트 형태로 변환합니다."""
+    board = load_storyboard(storyboard)
     text_lines = []
     
     # 제목과 주제
-    text_lines.append(f"📖 {storyboard['wholeTitle']}")
+    text_lines.append(f"📖 {board.title}")
     text_lines.append("=" * 50)
-    text_lines.append(f"📝 핵심 주제: {storyboard['storyTopic']}")
+    text_lines.append(f"📝 핵심 주제: {board.topic}")
     text_lines.append("")
     
     # 해시태그
-    hashtags_text = " ".join(storyboard['hashtags'])
+    hashtags_text = " ".join(board.hashtags)
     text_lines.append(f"🏷️ 해시태그: {hashtags_text}")
     text_lines.append("")
     text_lines.append("=" * 50)
     text_lines.append("")
     
     # 페이지별 내용
-    for page in storyboard['pages']:
-        text_lines.append(f"📄 페이지 {page['page']}")
+    for page in board.pages:
+        text_lines.append(f"📄 페이지 {page.number}")
         text_lines.append("-" * 30)
         
         # 등장인물
-        characters = ", ".join(page['character'])
+        characters = ", ".join(page.characters)
         text_lines.append(f"👥 등장인물: {characters}")
         
         # 배경
-        text_lines.append(f"🎬 배경: {page['background']}")
+        text_lines.append(f"🎬 배경: {page.background}")
         
         # 대사
         text_lines.append("💬 대사:")
-        for char, dialogue in page['dialogue'].items():
+        for char, dialogue in page.dialogue.items():
             text_lines.append(f"   {char}: \"{dialogue}\"")
         
         # 표정/포즈
-        text_lines.append(f"🎭 표정/포즈: {page['expressionPose']}")
+        text_lines.append(f"🎭 표정/포즈: {page.expression_pose}")
         text_lines.append("")
     
     return "\n".join(text_lines)
 
 
-def create_docx_from_storyboard(storyboard):
-    """스토리보드를 DOCX 문서로 변환합니다."""
-    doc = Document()
+@app.route('/')
+def index():
+    """메인 페이지"""
+    return render_template('index.html')
+
+
+def _parse_user_input(data):
+    """요청 본문에서 사용자 입력을 추출하고 검증합니다.
     
-    # 문서 제목
-    title = doc.add_heading(storyboard['wholeTitle'], 0)
-    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    (user_input, None) 또는 검증 실패 시 (None, 오류 응답)을 반환합니다.
+    """
+    data = data or {}
     
-    # 핵심 주제
-    doc.add_heading('📝 핵심 주제', level=1)
-    doc.add_paragraph(storyboard['storyTopic'])
+    # 입력값 검증
+    if not data.get('plot'):
+        return None, (jsonify({'error': '줄거리는 필수 입력 항목입니다.'}), 400)
     
-    # 해시태그
-    doc.add_heading('🏷️ 해시태그', level=1)
-    hashtags_text = " ".join(storyboard['hashtags'])
-    doc.add_paragraph(hashtags_text)
+    if not data.get('pages'):
+        return None, (jsonify({'error': '분량은 필수 입력 항목입니다.'}), 400)
     
-    # 페이지별 내용
-    doc.add_heading('📖 스토리보드', level=1)
+    user_input = {
+        'characters': data.get('characters', ''),
+        'keywords': data.get('keywords', ''),
+        'plot': data.get('plot', ''),
+        'pages': data.get('pages', '')
+    }
     
-    for page in storyboard['pages']:
-        # 페이지 제목
-        page_heading = doc.add_heading(f"페이지 {page['page']}", level=2)
-        
-        # 등장인물
-        doc.add_paragraph().add_run("👥 등장인물: ").bold = True
-        characters = ", ".join(page['character'])
-        doc.add_paragraph(characters)
-        
-        # 배경
-        doc.add_paragraph().add_run("🎬 배경: ").bold = True
-        doc.add_paragraph(page['background'])
-        
-        # 대사
-        doc.add_paragraph().add_run("💬 대사: ").bold = True
-        dialogue_para = doc.add_paragraph()
-        for char, dialogue in page['dialogue'].items():
-            dialogue_para.add_run(f"{char}: \"{dialogue}\"\n")
-        
-        # 표정/포즈
-        doc.add_paragraph().add_run("🎭 표정/포즈: ").bold = True
-        doc.add_paragraph(page['expressionPose'])
-        
-        # 페이지 구분선 (마지막 페이지가 아닌 경우)
-        if page != storyboard['pages'][-1]:
-            doc.add_paragraph("-" * 50)
+    print(f"사용자 입력 받음: {user_input}")
     
-    return doc
+    if not get_generator().validate_input(user_input['plot'], user_input['pages']):
+        return None, (jsonify({'error': '입력값이 올바르지 않습니다.'}), 400)
+    
+    # GPT 클라이언트 상태 확인
+    if not get_generator().gpt_client:
+        return None, (jsonify({'error': 'GPT 클라이언트가 초기화되지 않았습니다. API 키를 확인해주세요.'}), 500)
+    
+    return user_input, None
 
 
-@app.route('/')
-def index():
-    """메인 페이지"""
-    return render_template('index.html')
+# 생성 요청 수락 제어 (클라이언트별 속도 제한 + 전체 동시 실행 수 제한)
+admission = AdmissionController(
+    max_in_flight=Config.ADMISSION_MAX_IN_FLIGHT,
+    max_waiting=Config.ADMISSION_MAX_WAITING,
+    wait_timeout=Config.ADMISSION_WAIT_SECONDS,
+    requests_per_minute=Config.CLIENT_REQUESTS_PER_MINUTE,
+    burst=Config.CLIENT_BURST,
+    max_clients=Config.ADMISSION_MAX_CLIENTS,
+    overload_retry_after=Config.ADMISSION_RETRY_AFTER_SECONDS
+) if Config.ADMISSION_ENABLED else None
+
+
+def _client_id():
+    """속도 제한에 사용할 클라이언트 식별자 (IP 주소)를 반환합니다."""
+    if Config.TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get('X-Forwarded-For', '')
+        if forwarded.strip():
+            return forwarded.split(',')[0].strip()
+    return request.remote_addr or 'unknown'
+
 
+def _rejected_response(error):
+    """수락 거절을 429 응답과 Retry-After 헤더로 변환합니다."""
+    return jsonify({'error': str(error), 'reason': error.reason}), 429, {'Retry-After': error.retry_after_header}
+
+
+def admission_required(view):
+    """생성 API가 실행되는 동안 수락 제어의 실행 자리를 차지하게 합니다.
+    
+    잘못된 입력으로 4xx를 반환한 요청은 클라이언트의 요청 수에서 빼 줍니다.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if admission is None:
+            return view(*args, **kwargs)
+        client_id = _client_id()
+        try:
+            with admission.admit(client_id):
+                response = app.make_response(view(*args, **kwargs))
+                if 400 <= response.status_code < 500:
+                    admission.refund(client_id)
+                return response
+        except AdmissionRejected as e:
+            return _rejected_response(e)
+    return wrapper
 
-@app.route('/static/<path:filename>')
-def serve_static(filename):
-    """정적 파일 서빙"""
-    return send_file(os.path.join('static', filename))
+
+def _wants_fresh(data):
+    """요청이 캐시를 건너뛴 새 변형 생성을 원하는지 확인합니다."""
+    value = (data or {}).get('fresh', False)
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+
+def _save_storyboard(storyboard):
+    """생성된 스토리보드를 저장소에 저장하고 다운로드 파일명을 반환합니다. 실패하면 None을 반환합니다."""
+    record = get_generator().save_result(storyboard)
+    return record['filename'] if record else None
+
+
+def _parse_candidates(data):
+    """요청의 후보 수(candidates)를 확인합니다. (후보 수, None) 또는 (None, 오류 응답)을 반환합니다."""
+    value = (data or {}).get('candidates', 1)
+    try:
+        candidates = int(value)
+    except (TypeError, ValueError):
+        return None, (jsonify({'error': 'candidates는 숫자여야 합니다.'}), 400)
+    if not 1 <= candidates <= Config.MAX_CANDIDATES:
+        return None, (jsonify({'error': f'candidates는 1~{Config.MAX_CANDIDATES} 사이여야 합니다.'}), 400)
+    return candidates, None
+
+
+def _generate_candidates(user_input, candidates):
+    """한 번의 요청으로 여러 후보를 생성하고, 가장 높은 점수의 후보와 전체 후보 목록을 응답합니다.
+    
+    모든 후보를 저장소에 저장하므로 나머지 후보는 GET /api/storyboards/<id>로 조회할 수 있습니다.
+    """
+    ranked = get_generator().generate_candidates(user_input, candidates)
+    if not ranked:
+        return jsonify({'error': '스토리보드 생성에 실패했습니다. GPT 응답을 확인해주세요.'}), 500
+    
+    print(f"후보 {len(ranked)}개 생성 완료 (최고 점수 {ranked[0]['score']})")
+    
+    summaries = []
+    for rank, candidate in enumerate(ranked, 1):
+        record = get_generator().save_result(candidate['storyboard'])
+        summaries.append({
+            'rank': rank,
+            'id': record['id'] if record else None,
+            'filename': record['filename'] if record else None,
+            'wholeTitle': candidate['storyboard'].get('wholeTitle'),
+            'score': candidate['score'],
+            'scores': candidate['scores'],
+        })
+    
+    storyboard = ranked[0]['storyboard']
+    return jsonify(select_fields({
+        'success': True,
+        'storyboard': storyboard,
+        'text_content': lambda: storyboard_to_text(storyboard),
+        'filename': summaries[0]['filename'],
+        'candidates': summaries
+    }))
 
 
 @app.route('/api/generate', methods=['POST'])
+@admission_required
 def generate_storyboard():
     """스토리보드 생성 API"""
     try:
         data = request.json
+        user_input, error_response = _parse_user_input(data)
+        if error_response:
+            return error_response
         
-        # 입력값 검증
-        if not data.get('plot'):
-            return jsonify({'error': '줄거리는 필수 입력 항목입니다.'}), 400
-        
-        if not data.get('pages'):
-            return jsonify({'error': '분량은 필수 입력 항목입니다.'}), 400
-        
-        # 입력값 검증
-        user_input = {
-            'characters': data.get('characters', ''),
-            'keywords': data.get('keywords', ''),
-            'plot': data.get('plot', ''),
-            'pages': data.get('pages', '')
-        }
-        
-        print(f"사용자 입력 받음: {user_input}")
-        
-        if not generator.validate_input(user_input['plot'], user_input['pages']):
-            return jsonify({'error': '입력값이 올바르지 않습니다.'}), 400
-        
-        # GPT 클라이언트 상태 확인
-        if not generator.gpt_client:
-            return jsonify({'error': 'GPT 클라이언트가 초기화되지 않았습니다. API 키를 확인해주세요.'}), 500
+        candidates, error_response = _parse_candidates(data)
+        if error_response:
+            return error_response
         
         print("스토리보드 생성 시작...")
         
-        # 스토리보드 생성
-        storyboard = generator.generate_storyboard(user_input)
+        if candidates > 1:
+            return _generate_candidates(user_input, candidates)
+        
+        # 스토리보드 생성 (fresh=true이면 캐시를 건너뛰고 새로 생성)
+        storyboard = get_generator().generate_storyboard(user_input, use_cache=not _wants_fresh(data))
         
         if not storyboard:
             return jsonify({'error': '스토리보드 생성에 실패했습니다. GPT 응답을 확인해주세요.'}), 500
@@ -177,24 +293,15 @@ def generate_storyboard():
         print("스토리보드 생성 완료")
         
         # 결과 저장 (선택사항)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"storyboard_{timestamp}.json"
+        filename = _save_storyboard(storyboard)
         
-        try:
-            generator.save_result(storyboard, filename)
-            print(f"결과 파일 저장 완료: {filename}")
-        except Exception as e:
-            print(f"파일 저장 오류: {e}")
-        
-        # 텍스트 형태로 변환
-        text_content = storyboard_to_text(storyboard)
-        
-        return jsonify({
+        # 텍스트 변환은 ?fields= 로 text_content를 제외하면 생략됩니다
+        return jsonify(select_fields({
             'success': True,
             'storyboard': storyboard,
-            'text_content': text_content,
+            'text_content': lambda: storyboard_to_text(storyboard),
             'filename': filename
-        })
+        }))
         
     except json.JSONDecodeError as e:
         error_msg = f'잘못된 JSON 형식입니다: {str(e)}'
@@ -213,6 +320,185 @@ def generate_storyboard():
         return jsonify({'error': error_msg}), 500
 
 
+def _sse_event(event, data):
+    """Server-Sent Events 형식의 메시지를 만듭니다."""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@app.route('/api/generate/stream', methods=['POST'])
+def generate_storyboard_stream():
+    """스토리보드 스트리밍 생성 API (SSE)
+    
+    wholeTitle, storyTopic, hashtags 및 각 페이지를 완성되는 즉시 전송하고,
+    마지막에 done 이벤트로 전체 스토리보드와 텍스트 변환 결과를 보냅니다.
+    """
+    data = request.get_json(silent=True)
+    user_input, error_response = _parse_user_input(data)
+    if error_response:
+        return error_response
+    use_cache = not _wants_fresh(data)
+    
+    # 스트림은 응답을 반환한 뒤에도 생성이 계속되므로 실행 자리는 응답이 닫힐 때 반납합니다
+    if admission is not None:
+        try:
+            admission.acquire(_client_id())
+        except AdmissionRejected as e:
+            return _rejected_response(e)
+    
+    def event_stream():
+        try:
+            for event, value in get_generator().stream_storyboard(user_input, use_cache=use_cache):
+                if event == 'done':
+                    value = {
+                        'storyboard': value,
+                        'text_content': storyboard_to_text(value),
+                        'filename': _save_storyboard(value)
+                    }
+                yield _sse_event(event, value)
+        except Exception as e:
+            print(f"스트리밍 API 오류: {e}")
+            yield _sse_event('error', f'서버 오류: {str(e)}')
+    
+    response = Response(
+        stream_with_context(event_stream()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+    if admission is not None:
+        response.call_on_close(admission.release)
+    return response
+
+
+@app.route('/api/regenerate-page', methods=['POST'])
+@admission_required
+def regenerate_page():
+    """단일 페이지 재생성 API
+    
+    기존 스토리보드와 페이지 번호(선택적으로 수정 요청)를 받아 해당 페이지만 다시 생성합니다.
+    """
+    data = request.get_json(silent=True) or {}
+    storyboard = data.get('storyboard')
+    
+    if not isinstance(storyboard, dict):
+        return jsonify({'error': '스토리보드 데이터가 없습니다.'}), 400
+    
+    # 이전 필드 이름이나 문자열 페이지 번호도 다른 API와 같이 정규화한 뒤 페이지를 찾습니다
+    storyboard = normalize_storyboard(storyboard).storyboard
+    errors = validate_storyboard(storyboard) if storyboard is not None else ['사용할 수 있는 페이지가 없습니다']
+    if errors:
+        return jsonify({'error': f'스토리보드 형식이 올바르지 않습니다: {errors[0]}'}), 400
+    
+    try:
+        page_number = int(data.get('page'))
+    except (TypeError, ValueError):
+        return jsonify({'error': '페이지 번호를 숫자로 입력해주세요.'}), 400
+    
+    if not any(page['page'] == page_number for page in storyboard['pages']):
+        return jsonify({'error': f'{page_number}페이지를 찾을 수 없습니다.'}), 400
+    
+    if not get_generator().gpt_client:
+        return jsonify({'error': 'GPT 클라이언트가 초기화되지 않았습니다. API 키를 확인해주세요.'}), 500
+    
+    updated = get_generator().regenerate_page(storyboard, page_number, data.get('instructions', ''))
+    if not updated:
+        return jsonify({'error': '페이지 재생성에 실패했습니다. GPT 응답을 확인해주세요.'}), 500
+    
+    return jsonify(select_fields({
+        'success': True,
+        'storyboard': updated,
+        'page': next(page for page in updated['pages'] if page['page'] == page_number),
+        'text_content': lambda: storyboard_to_text(updated),
+        'filename': _save_storyboard(updated)
+    }))
+
+
+def run_generation_job(payload):
+    """작업 워커에서 스토리보드를 생성합니다. 결과는 /api/generate 응답과 같은 형태입니다."""
+    storyboard = get_generator().generate_storyboard(payload['user_input'], use_cache=payload.get('use_cache', True))
+    
+    if not storyboard:
+        raise RuntimeError('스토리보드 생성에 실패했습니다. GPT 응답을 확인해주세요.')
+    
+    return {
+        'success': True,
+        'storyboard': storyboard,
+        'text_content': storyboard_to_text(storyboard),
+        'filename': _save_storyboard(storyboard)
+    }
+
+
+# 작업 관리자 (워커는 첫 작업이 들어올 때 시작됩니다)
+job_manager = JobManager(
+    run_generation_job,
+    workers=Config.JOB_WORKERS,
+    max_queue=Config.JOB_MAX_QUEUE,
+    result_ttl=Config.JOB_RESULT_TTL_SECONDS,
+    default_deadline=Config.JOB_DEFAULT_DEADLINE_SECONDS
+) if Config.JOBS_ENABLED else None
+
+
+def _jobs_disabled_response():
+    return jsonify({'error': '비동기 작업이 비활성화되어 있습니다. /api/generate를 사용해주세요.'}), 404
+
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """스토리보드 생성 작업 등록 API
+    
+    작업 ID를 즉시 반환하며, 결과는 GET /api/jobs/<job_id>로 조회합니다.
+    """
+    if job_manager is None:
+        return _jobs_disabled_response()
+    
+    data = request.get_json(silent=True)
+    user_input, error_response = _parse_user_input(data)
+    if error_response:
+        return error_response
+    
+    priority = data.get('priority', 'interactive')
+    if priority not in PRIORITIES:
+        return jsonify({'error': f"priority는 {', '.join(PRIORITIES)} 중 하나여야 합니다."}), 400
+    
+    deadline_seconds = data.get('deadline_seconds')
+    try:
+        deadline_seconds = float(deadline_seconds) if deadline_seconds is not None else None
+    except (TypeError, ValueError):
+        return jsonify({'error': 'deadline_seconds는 숫자여야 합니다.'}), 400
+    
+    try:
+        job = job_manager.submit(
+            {'user_input': user_input, 'use_cache': not _wants_fresh(data)},
+            priority=priority,
+            deadline_seconds=deadline_seconds
+        )
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+    
+    response = job.to_dict()
+    response['status_url'] = f"/api/jobs/{job.id}"
+    return jsonify(response), 202
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """작업 상태 및 결과 조회 API"""
+    if job_manager is None:
+        return _jobs_disabled_response()
+    
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    
+    payload = job.to_dict()
+    if isinstance(payload.get('result'), dict):
+        payload['result'] = select_fields(payload['result'])
+    return jsonify(payload)
+
+
 @app.route('/api/download-docx', methods=['POST'])
 def download_docx():
     """DOCX 파일 다운로드"""
@@ -223,13 +509,8 @@ def download_docx():
         if not storyboard:
             return jsonify({'error': '스토리보드 데이터가 없습니다.'}), 400
         
-        # DOCX 문서 생성
-        doc = create_docx_from_storyboard(storyboard)
-        
-        # 메모리에 저장
-        docx_io = io.BytesIO()
-        doc.save(docx_io)
-        docx_io.seek(0)
+        # DOCX 문서 생성 (캐시된 결과가 있으면 재사용)
+        docx_io = io.BytesIO(docx_renderer.render(storyboard))
         
         # 파일명 생성
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -239,7 +520,7 @@ def download_docx():
             docx_io,
             as_attachment=True,
             download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+            mimetype=DOCX_MIMETYPE
         )
         
     except Exception as e:
@@ -247,28 +528,186 @@ def download_docx():
         return jsonify({'error': f'DOCX 파일 생성 중 오류가 발생했습니다: {str(e)}'}), 500
 
 
+@app.route('/api/export/bulk', methods=['POST'])
+def export_bulk():
+    """여러 스토리보드를 ZIP으로 일괄 내보내기 (JSON, 텍스트, DOCX)
+    
+    요청: {"ids": [저장 ID, ...]} 또는 {"storyboards": [스토리보드, ...]} (함께 사용 가능)
+    ZIP은 스토리보드 하나가 완성될 때마다 조각 단위로 전송됩니다.
+    """
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids') or []
+    storyboards = data.get('storyboards') or []
+    
+    if not isinstance(ids, list) or not all(isinstance(item, str) for item in ids):
+        return jsonify({'error': 'ids는 문자열 목록이어야 합니다.'}), 400
+    if not isinstance(storyboards, list):
+        return jsonify({'error': 'storyboards는 목록이어야 합니다.'}), 400
+    if not ids and not storyboards:
+        return jsonify({'error': '내보낼 스토리보드가 없습니다.'}), 400
+    if len(ids) + len(storyboards) > Config.EXPORT_MAX_ITEMS:
+        return jsonify({'error': f'한 번에 최대 {Config.EXPORT_MAX_ITEMS}개까지 내보낼 수 있습니다.'}), 400
+    
+    # 필드 형식 차이는 고쳐서 내보내고, 고칠 수 없는 항목만 거절합니다
+    for index, storyboard in enumerate(storyboards):
+        normalized = normalize_storyboard(storyboard).storyboard
+        errors = validate_storyboard(normalized) if normalized is not None else ['사용할 수 있는 페이지가 없습니다']
+        if errors:
+            return jsonify({'error': f'storyboards[{index}] 형식이 올바르지 않습니다: {errors[0]}'}), 400
+        storyboards[index] = normalized
+    
+    def items():
+        # 저장된 스토리보드는 ZIP에 쓰기 직전에 하나씩 읽습니다
+        for storyboard_id in ids:
+            yield storyboard_id, get_generator().store.get(storyboard_id)
+        for storyboard in storyboards:
+            yield content_hash(storyboard)[:12], storyboard
+    
+    # 일괄 내보내기는 다운로드 캐시를 밀어내지 않도록 캐시 없이 렌더링합니다
+    chunks = iter_export_zip(items(), docx_renderer.render_uncached, storyboard_to_text)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    return Response(
+        stream_with_context(chunks),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename=storyboards_{timestamp}.zip'}
+    )
+
+
+def _storyboard_download(storyboard_id):
+    """저장된 스토리보드 JSON을 첨부 파일로 응답합니다 (저장된 본문을 그대로 전송)."""
+    body = get_generator().store.get_raw(storyboard_id)
+    if body is None:
+        return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
+    
+    return send_file(
+        io.BytesIO(body.encode('utf-8')),
+        as_attachment=True,
+        download_name=filename_for(storyboard_id),
+        mimetype='application/json'
+    )
+
+
+@app.route('/api/storyboards')
+def list_storyboards():
+    """저장된 스토리보드 목록 API (최신순, 페이지 단위)
+    
+    쿼리: page(1부터), per_page, title(제목 앞부분 검색)
+    """
+    try:
+        page = max(1, int(request.args.get('page', 1)))
+        per_page = int(request.args.get('per_page', Config.STORAGE_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'page와 per_page는 숫자여야 합니다.'}), 400
+    per_page = max(1, min(per_page, Config.STORAGE_MAX_PAGE_SIZE))
+    
+    items, total = get_generator().store.list(page, per_page, request.args.get('title', '').strip())
+    
+    return jsonify({
+        'items': items,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page
+    })
+
+
+@app.route('/api/search')
+def search_storyboards():
+    """저장된 스토리보드 검색 API (관련도순, 페이지 단위)
+    
+    쿼리: q(검색어), page(1부터), per_page
+    제목·주제·해시태그·등장인물·대사에서 검색어의 글자 조각을 모두 포함하는 스토리보드를 찾습니다.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': '검색어(q)를 입력해주세요.'}), 400
+    if len(query) > Config.SEARCH_MAX_QUERY_LENGTH:
+        return jsonify({'error': f'검색어는 {Config.SEARCH_MAX_QUERY_LENGTH}자 이하로 입력해주세요.'}), 400
+    try:
+        page = max(1, int(request.args.get('page', 1)))
+        per_page = int(request.args.get('per_page', Config.STORAGE_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'page와 per_page는 숫자여야 합니다.'}), 400
+    per_page = max(1, min(per_page, Config.STORAGE_MAX_PAGE_SIZE))
+    
+    generator = get_generator()
+    if not generator.search_index:
+        return jsonify({'error': '검색이 비활성화되어 있습니다.'}), 503
+    
+    started = time.perf_counter()
+    items, total = generator.search(query, page, per_page)
+    
+    return jsonify({
+        'query': query,
+        'items': items,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page,
+        'took_ms': round((time.perf_counter() - started) * 1000, 2)
+    })
+
+
+@app.route('/api/storyboards/<storyboard_id>')
+def get_storyboard(storyboard_id):
+    """저장된 스토리보드 조회 API"""
+    storyboard = get_generator().store.get(storyboard_id)
+    if storyboard is None:
+        return jsonify({'error': '스토리보드를 찾을 수 없습니다.'}), 404
+    
+    return jsonify({'id': storyboard_id, 'storyboard': storyboard})
+
+
+@app.route('/api/storyboards/<storyboard_id>/download')
+def download_storyboard(storyboard_id):
+    """저장된 스토리보드를 ID로 다운로드"""
+    try:
+        return _storyboard_download(storyboard_id)
+    except Exception as e:
+        return jsonify({'error': f'다운로드 오류: {str(e)}'}), 500
+
+
 @app.route('/api/download/<filename>')
 def download_file(filename):
-    """생성된 파일 다운로드"""
+    """생성된 파일 다운로드 (storyboard_<id>.json 형식의 파일명만 허용)"""
+    storyboard_id = id_from_filename(filename)
+    if storyboard_id is None:
+        return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
+    
     try:
-        if os.path.exists(filename):
-            return send_file(filename, as_attachment=True)
-        else:
-            return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
+        return _storyboard_download(storyboard_id)
     except Exception as e:
         return jsonify({'error': f'다운로드 오류: {str(e)}'}), 500
 
 
+@app.route('/api/metrics')
+def metrics_endpoint():
+    """Prometheus 텍스트 형식의 지표 (단계별 처리 시간, 토큰 사용량, JSON 수정 경로, 업스트림 상태 코드)"""
+    return Response(metrics.render(), content_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
+
 @app.route('/api/health')
 def health_check():
     """서버 상태 확인"""
     try:
-        # GPT 클라이언트 상태 확인
-        gpt_status = generator.gpt_client is not None
+        # 생성기가 아직 만들어지지 않았으면 만들지 않고 상태만 보고합니다
+        generator = _generator
+        gpt_client = generator.gpt_client if generator else None
         
         return jsonify({
             'status': 'healthy',
-            'gpt_client': gpt_status,
+            'initialized': generator is not None,
+            'gpt_client': gpt_client is not None,
+            'transport': gpt_client.get_transport_stats() if gpt_client else None,
+            'token_budget': gpt_client.get_token_budget_stats() if gpt_client else None,
+            'cache': generator.get_cache_stats() if generator else None,
+            'inflight': generator.get_inflight_stats() if generator else None,
+            'storage': generator.store.backend if generator else None,
+            'search': generator.search_index.stats() if generator and generator.search_index else None,
+            'docx_cache': docx_renderer.stats(),
+            'jobs': job_manager.stats() if job_manager else None,
+            'admission': admission.stats() if admission else None,
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -0,0 +1,143 @@
+"""
+정적 자산 모듈
+static/ 의 파일을 시작 시 내용 해시로 지문(fingerprint)을 붙이고 gzip으로 미리 압축해 두었다가,
+해시가 포함된 URL은 immutable 캐시 헤더로, 원래 이름의 URL은 재검증 헤더로 제공합니다.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from flask import Flask, Response, abort, current_app, request, url_for
+
+
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.html', '.svg', '.json', '.txt', '.map')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, s-maxage=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+
+@dataclass
+class Asset:
+    """지문이 붙은 정적 파일 하나"""
+    name: str
+    hashed_name: str
+    digest: str
+    mimetype: str
+    data: bytes
+    gzip_data: Optional[bytes]
+    mtime: float
+
+
+def hashed_filename(name: str, digest: str) -> str:
+    """script.js → script.<해시>.js"""
+    root, ext = os.path.splitext(name)
+    return f"{root}.{digest}{ext}"
+
+
+class AssetManifest:
+    """정적 파일 목록 (원래 이름과 지문 이름 모두로 조회)"""
+
+    def __init__(self, static_dir: str):
+        self.static_dir = static_dir
+        self._assets: Dict[str, Asset] = {}
+        self._hashed: Dict[str, Asset] = {}
+        self._lock = threading.Lock()
+        self.build()
+
+    def _load(self, name: str, path: str) -> Asset:
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+        gzip_data = None
+        if name.endswith(COMPRESSIBLE_EXTENSIONS):
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(compressed) < len(data):
+                gzip_data = compressed
+
+        return Asset(name, hashed_filename(name, digest), digest, mimetype, data, gzip_data,
+                     os.path.getmtime(path))
+
+    def build(self):
+        """static 디렉터리 전체를 읽어 지문과 압축본을 만듭니다."""
+        assets = {}
+        for root, _, files in os.walk(self.static_dir):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.static_dir).replace(os.sep, '/')
+                assets[name] = self._load(name, path)
+
+        with self._lock:
+            self._assets = assets
+            self._hashed = {asset.hashed_name: asset for asset in assets.values()}
+
+    def _refresh(self, asset: Asset) -> Asset:
+        """개발 모드에서 파일이 바뀌었으면 다시 읽습니다."""
+        path = os.path.join(self.static_dir, asset.name)
+        try:
+            if os.path.getmtime(path) == asset.mtime:
+                return asset
+        except OSError:
+            return asset
+        updated = self._load(asset.name, path)
+        with self._lock:
+            self._assets[asset.name] = updated
+            self._hashed.pop(asset.hashed_name, None)
+            self._hashed[updated.hashed_name] = updated
+        return updated
+
+    def get(self, name: str, refresh: bool = False) -> Optional[Asset]:
+        """원래 이름으로 조회합니다. refresh이면 파일 변경 여부를 확인합니다 (개발 모드)."""
+        asset = self._assets.get(name)
+        if asset is not None and refresh:
+            asset = self._refresh(asset)
+        return asset
+
+    def get_hashed(self, hashed_name: str) -> Optional[Asset]:
+        return self._hashed.get(hashed_name)
+
+    def url(self, name: str) -> str:
+        """템플릿용: 지문이 붙은 URL을 반환합니다. 목록에 없는 파일은 원래 이름을 사용합니다."""
+        asset = self.get(name, refresh=current_app.debug)
+        return url_for('static', filename=asset.hashed_name if asset else name)
+
+
+def _asset_response(asset: Asset, cache_control: str) -> Response:
+    use_gzip = asset.gzip_data is not None and request.accept_encodings['gzip'] > 0
+    response = Response(asset.gzip_data if use_gzip else asset.data, mimetype=asset.mimetype)
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    if asset.gzip_data is not None:
+        response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = cache_control
+    response.set_etag(asset.digest + ('-gzip' if use_gzip else ''))
+    return response.make_conditional(request)
+
+
+def init_app(app: Flask, static_dir: str, url_path: str = '/static') -> AssetManifest:
+    """정적 파일 라우트('static' 엔드포인트)와 템플릿 함수 asset_url을 등록합니다.
+
+    Flask 기본 정적 라우트 대신 사용하므로 앱은 static_folder=None으로 생성해야 합니다.
+    """
+    manifest = AssetManifest(static_dir)
+
+    def serve_static(filename):
+        """정적 파일 서빙 (지문 URL은 영구 캐시, 원래 이름은 매번 재검증)"""
+        asset = manifest.get_hashed(filename)
+        if asset is not None:
+            return _asset_response(asset, IMMUTABLE_CACHE_CONTROL)
+        asset = manifest.get(filename, refresh=current_app.debug)
+        if asset is not None:
+            return _asset_response(asset, REVALIDATE_CACHE_CONTROL)
+        abort(404)
+
+    app.add_url_rule(f"{url_path}/<path:filename>", endpoint='static', view_func=serve_static)
+    app.jinja_env.globals['asset_url'] = manifest.url
+    app.extensions['assets'] = manifest
+    return manifest
@@ -0,0 +1,566 @@
+"""
+asyncio 기반 GPT 클라이언트 모듈
+추가 패키지 없이 asyncio 스트림으로 HTTP/1.1 keep-alive 연결을 관리하며,
+하나의 프로세스에서 많은 생성 요청을 동시에 진행할 수 있게 합니다.
+"""
+
+import asyncio
+import json
+import ssl
+import time
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import metrics
+from config import Config
+from gpt_client import (
+    Endpoint, EndpointPool, GPTClientBase, GPTConfig, RETRY_STATUS_CODES, backoff_delay, parse_retry_after
+)
+from rate_limit import TokenBucket
+from storyboard_schema import STORYBOARD_RESPONSE_FORMAT
+
+
+class AsyncHTTPError(Exception):
+    """비동기 HTTP 요청이 연결 수준에서 실패했을 때 발생합니다."""
+
+
+class AsyncHTTPTransport:
+    """asyncio 스트림 위의 최소 HTTP/1.1 클라이언트
+
+    - base_url 하나에 대해 최대 pool_size개의 연결을 유지하고 재사용합니다.
+    - Content-Length와 chunked 응답 본문을 지원합니다. 본문은 max_body_bytes까지만 받습니다.
+    - 요청 전송과 응답 읽기는 각각 read_timeout 안에 끝나야 합니다.
+    - 429/5xx 응답과 연결 오류는 동기 전송 계층과 같은 백오프 규칙으로 재시도합니다.
+    """
+
+    MAX_BODY_BYTES = 8 * 1024 * 1024
+    READ_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, base_url: str, pool_size: int = 10,
+                 connect_timeout: float = 10.0, read_timeout: float = 60.0,
+                 max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 20.0, max_body_bytes: int = MAX_BODY_BYTES):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'http'
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or (443 if self.scheme == 'https' else 80)
+        self.path_prefix = parts.path.rstrip('/')
+        self.host_header = parts.netloc
+
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_body_bytes = max_body_bytes
+
+        self._ssl_context = ssl.create_default_context() if self.scheme == 'https' else None
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stats = {
+            'requests': 0,
+            'retries': 0,
+            'connections_opened': 0,
+            'connections_reused': 0,
+        }
+
+    @classmethod
+    def from_config(cls, config: GPTConfig) -> 'AsyncHTTPTransport':
+        """GPTConfig 값으로 전송 계층을 생성합니다."""
+        return cls(
+            config.base_url,
+            pool_size=config.pool_size,
+            connect_timeout=config.connect_timeout,
+            read_timeout=config.read_timeout,
+            max_retries=config.max_retries,
+            backoff_base=config.backoff_base,
+            backoff_max=config.backoff_max,
+        )
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # 세마포어는 사용하는 이벤트 루프 안에서 만들어야 합니다
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        return self._slots
+
+    async def _open_connection(self):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self._ssl_context),
+            timeout=self.connect_timeout
+        )
+        self._stats['connections_opened'] += 1
+        return reader, writer
+
+    @staticmethod
+    def _close(writer: asyncio.StreamWriter):
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+    def _check_body_size(self, size: int):
+        if size > self.max_body_bytes:
+            raise ValueError(f"응답 본문이 너무 큽니다 ({size}바이트 > {self.max_body_bytes}바이트)")
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: Dict[str, str]) -> Tuple[bytes, bool]:
+        """응답 본문을 읽고 (본문, 연결 재사용 가능 여부)를 반환합니다.
+
+        본문이 max_body_bytes를 넘으면 ValueError를 발생시킵니다.
+        """
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            total = 0
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    # 트레일러 헤더를 빈 줄까지 읽어 버립니다
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                total += size
+                self._check_body_size(total)
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            return b''.join(chunks), True
+
+        if 'content-length' in headers:
+            length = int(headers['content-length'])
+            self._check_body_size(length)
+            return await reader.readexactly(length), True
+
+        # 길이 정보가 없으면 연결이 닫힐 때까지 읽습니다
+        chunks = []
+        total = 0
+        while True:
+            chunk = await reader.read(self.READ_CHUNK_SIZE)
+            if not chunk:
+                return b''.join(chunks), False
+            total += len(chunk)
+            self._check_body_size(total)
+            chunks.append(chunk)
+
+    async def _send_once(self, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """요청을 한 번 보냅니다. 유휴 연결이 끊겨 있었으면 새 연결로 한 번 더 시도합니다."""
+        target = f"{self.path_prefix}/{path.lstrip('/')}"
+        head = [f"POST {target} HTTP/1.1", f"Host: {self.host_header}",
+                f"Content-Length: {len(body)}", "Connection: keep-alive"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        request_bytes = ('\r\n'.join(head) + '\r\n\r\n').encode('utf-8') + body
+
+        async with self._get_slots():
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._open_connection()
+                keep = False
+                try:
+                    writer.write(request_bytes)
+                    await asyncio.wait_for(writer.drain(), timeout=self.read_timeout)
+
+                    status_line = await asyncio.wait_for(reader.readline(), timeout=self.read_timeout)
+                    if not status_line:
+                        raise ConnectionResetError("서버가 연결을 닫았습니다.")
+                    status = int(status_line.split()[1])
+
+                    response_headers: Dict[str, str] = {}
+                    while True:
+                        line = await asyncio.wait_for(reader.readline(), timeout=self.read_timeout)
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        response_headers[name.strip().lower()] = value.strip()
+
+                    response_body, keep = await asyncio.wait_for(
+                        self._read_body(reader, response_headers), timeout=self.read_timeout
+                    )
+                    if response_headers.get('connection', '').lower() == 'close':
+                        keep = False
+                    if reused:
+                        self._stats['connections_reused'] += 1
+                    return status, response_headers, response_body
+                except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError) as e:
+                    keep = False
+                    if reused:
+                        # 서버가 닫은 유휴 연결이었을 수 있으므로 새 연결로 다시 시도합니다
+                        continue
+                    raise AsyncHTTPError(str(e)) from e
+                except (OSError, ValueError, IndexError) as e:
+                    keep = False
+                    raise AsyncHTTPError(str(e)) from e
+                finally:
+                    # 취소되었거나 오류가 난 연결은 상태를 알 수 없으므로 닫습니다
+                    if keep and len(self._idle) < self.pool_size:
+                        self._idle.append((reader, writer))
+                    else:
+                        self._close(writer)
+
+    async def post_json(self, path: str, headers: Dict[str, str], payload: Dict) -> Tuple[int, Dict[str, str], bytes]:
+        """JSON 본문으로 POST 요청을 보내고, 재시도 가능한 실패는 백오프 후 다시 시도합니다."""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+        for attempt in range(self.max_retries + 1):
+            self._stats['requests'] += 1
+            is_last = attempt == self.max_retries
+            try:
+                status, response_headers, response_body = await self._send_once(path, headers, body)
+            except (AsyncHTTPError, asyncio.TimeoutError) as e:
+                metrics.record_upstream_status('error')
+                if is_last:
+                    raise AsyncHTTPError(str(e) or type(e).__name__) from e
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                print(f"연결 오류, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {e}")
+            else:
+                metrics.record_upstream_status(status)
+                if status not in RETRY_STATUS_CODES or is_last:
+                    return status, response_headers, response_body
+                retry_after = parse_retry_after(response_headers.get('retry-after'))
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+                print(f"API 오류 {status}, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+
+            self._stats['retries'] += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, int]:
+        """요청 수와 연결 재사용/신규 연결 수를 반환합니다."""
+        return dict(self._stats)
+
+    async def aclose(self):
+        """유휴 연결을 모두 닫습니다."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            self._close(writer)
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+
+class AsyncEndpointPool(EndpointPool):
+    """EndpointPool의 엔드포인트 선택·제외·중복 요청 규칙을 asyncio로 실행하는 전송 계층
+
+    엔드포인트마다 AsyncHTTPTransport를 두며, 중복 요청에서 늦은 쪽은 태스크를 취소하여 연결을 닫습니다.
+    """
+
+    @classmethod
+    def from_config(cls, config: GPTConfig) -> 'AsyncEndpointPool':
+        """GPTConfig의 endpoints 목록으로 엔드포인트별 비동기 전송 계층을 만듭니다 (개별 전송 계층은 재시도하지 않음)."""
+        endpoints = [
+            Endpoint(spec['base_url'], spec['api_key'], float(spec.get('weight', 1.0)), AsyncHTTPTransport(
+                spec['base_url'],
+                pool_size=config.pool_size,
+                connect_timeout=config.connect_timeout,
+                read_timeout=config.read_timeout,
+                max_retries=0,
+            ))
+            for spec in config.endpoints
+        ]
+        return cls(
+            endpoints,
+            max_retries=config.max_retries,
+            backoff_base=config.backoff_base,
+            backoff_max=config.backoff_max,
+            hedge_percentile=config.hedge_percentile,
+            hedge_min_samples=config.hedge_min_samples,
+            eject_seconds=config.eject_seconds,
+            max_workers=1,
+        )
+
+    async def _send_async(self, endpoint: Endpoint, path: str, headers: Dict[str, str],
+                          payload: Dict) -> Tuple[int, Dict[str, str], bytes]:
+        """엔드포인트 하나에 요청을 보내고 응답 시간과 상태를 기록합니다."""
+        headers = dict(headers, Authorization=f'Bearer {endpoint.api_key}')
+        with self._lock:
+            endpoint.outstanding += 1
+            endpoint.stats['requests'] += 1
+        started = time.perf_counter()
+        try:
+            status, response_headers, body = await endpoint.transport.post_json(path, headers, payload)
+        except AsyncHTTPError:
+            self._eject(endpoint)
+            raise
+        finally:
+            with self._lock:
+                endpoint.outstanding -= 1
+
+        if status in self.RETRY_STATUS_CODES:
+            self._eject(endpoint, parse_retry_after(response_headers.get('retry-after')))
+        else:
+            with self._lock:
+                endpoint.consecutive_failures = 0
+                if status == 200:
+                    self._latencies.append(time.perf_counter() - started)
+        return status, response_headers, body
+
+    async def _send_hedged_async(self, endpoint: Endpoint, path: str, headers: Dict[str, str], payload: Dict,
+                                 delay: float) -> Tuple[Endpoint, Tuple[int, Dict[str, str], bytes]]:
+        """delay 안에 응답이 없으면 다른 엔드포인트로 같은 요청을 보내고 먼저 성공한 응답을 반환합니다."""
+        primary = asyncio.ensure_future(self._send_async(endpoint, path, headers, payload))
+        tasks = {primary: endpoint}
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if not done:
+            backup = self._select(exclude=(endpoint,))
+            if backup is not None:
+                with self._lock:
+                    self._stats['hedged'] += 1
+                metrics.HEDGED_REQUESTS.inc(outcome='sent')
+                tasks[asyncio.ensure_future(self._send_async(backup, path, headers, payload))] = backup
+
+        pending = set(tasks)
+        last_error = None
+        last = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        result = task.result()
+                    except AsyncHTTPError as e:
+                        last_error = e
+                        continue
+                    last = tasks[task], result
+                    if result[0] in self.RETRY_STATUS_CODES:
+                        continue
+                    if tasks[task] is not endpoint:
+                        with self._lock:
+                            self._stats['hedge_wins'] += 1
+                        metrics.HEDGED_REQUESTS.inc(outcome='won')
+                    return last
+        finally:
+            # 늦은 쪽 요청을 취소하면 전송 계층이 그 연결을 닫습니다
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        if last is not None:
+            return last
+        raise last_error
+
+    async def post_json(self, path: str, headers: Dict[str, str], payload: Dict) -> Tuple[int, Dict[str, str], bytes]:
+        """선택된 엔드포인트로 POST 요청을 보냅니다. 재시도 규칙은 EndpointPool.post와 같습니다."""
+        tried: Tuple[Endpoint, ...] = ()
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                self._stats['requests'] += 1
+            is_last = attempt == self.max_retries
+            endpoint = self._select(exclude=tried) or self._select()
+            delay = self.hedge_delay()
+            try:
+                if delay is not None and self._healthy_count() > 1:
+                    endpoint, result = await self._send_hedged_async(endpoint, path, headers, payload, delay)
+                else:
+                    result = await self._send_async(endpoint, path, headers, payload)
+            except AsyncHTTPError as e:
+                if is_last:
+                    raise
+                print(f"업스트림 {endpoint.base_url} 연결 오류, 다른 엔드포인트로 재시도 "
+                      f"({attempt + 1}/{self.max_retries}): {e}")
+            else:
+                if result[0] not in self.RETRY_STATUS_CODES or is_last:
+                    return result
+                print(f"업스트림 {endpoint.base_url} API 오류 {result[0]}, 다른 엔드포인트로 재시도 "
+                      f"({attempt + 1}/{self.max_retries})")
+
+            tried += (endpoint,)
+            with self._lock:
+                self._stats['retries'] += 1
+            if self._healthy_count() == 0:
+                await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+
+    async def aclose(self):
+        """모든 엔드포인트의 유휴 연결을 닫습니다."""
+        self._executor.shutdown(wait=False)
+        for endpoint in self.endpoints:
+            await endpoint.transport.aclose()
+
+
+class AsyncGPTClient(GPTClientBase):
+    """asyncio 기반 GPT 클라이언트
+
+    GPTClient와 같은 GPTConfig, 프롬프트 구성, JSON 추출, 출력 토큰 예산과 이어쓰기 규칙을 사용하며,
+    여러 엔드포인트가 설정되면 AsyncEndpointPool로 요청을 나눠 보냅니다.
+    """
+
+    def __init__(self, config: Optional[GPTConfig] = None):
+        super().__init__(config)
+        if self.config.endpoints:
+            self.transport = AsyncEndpointPool.from_config(self.config)
+        else:
+            self.transport = AsyncHTTPTransport.from_config(self.config)
+
+    async def __aenter__(self) -> 'AsyncGPTClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _complete(self, prompt: str, max_tokens: Optional[int] = None, response_format: Optional[Dict] = None,
+                        partial: Optional[str] = None) -> Optional[Tuple[str, Optional[str], Optional[Dict]]]:
+        """GPT API에 요청을 보내고 (응답 텍스트, finish_reason, usage)를 반환합니다."""
+        started = time.perf_counter()
+        try:
+            status, _, body = await self.transport.post_json(
+                "chat/completions",
+                self._headers(),
+                self._build_payload(prompt, max_tokens=max_tokens, response_format=response_format, partial=partial)
+            )
+        except AsyncHTTPError as e:
+            print(f"네트워크 오류: {e}")
+            return None
+        finally:
+            metrics.observe_stage('upstream', time.perf_counter() - started)
+
+        if status != 200:
+            print(f"API 오류: {status} - {body.decode('utf-8', 'replace')}")
+            return None
+
+        try:
+            result = json.loads(body)
+            metrics.record_usage(result.get('usage'))
+            choice = result['choices'][0]
+            return choice['message']['content'], choice.get('finish_reason'), result.get('usage')
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            print(f"예상치 못한 응답 형식: {e}")
+            return None
+
+    async def _make_request(self, prompt: str, max_tokens: Optional[int] = None,
+                            response_format: Optional[Dict] = None) -> Optional[str]:
+        """GPT API에 요청을 보냅니다."""
+        completion = await self._complete(prompt, max_tokens=max_tokens, response_format=response_format)
+        return completion[0] if completion else None
+
+    async def _continue_truncated(self, prompt: str, text: str,
+                                  pages: Optional[int]) -> AsyncIterator[Tuple[str, Optional[str], Optional[Dict]]]:
+        """길이 제한으로 잘린 응답을 이어서 생성합니다. GPTClient._continue_truncated와 같습니다."""
+        for attempt in range(Config.MAX_CONTINUATIONS):
+            metrics.CONTINUATIONS.inc()
+            print(f"응답이 길이 제한으로 잘려 이어서 생성합니다 ({attempt + 1}/{Config.MAX_CONTINUATIONS})")
+            completion = await self._complete(
+                prompt,
+                max_tokens=self._budget_for(self._remaining_pages(text, pages)),
+                partial=text
+            )
+            if not completion:
+                return
+            continuation, finish_reason, usage = completion
+            suffix = self._continuation_suffix(text, continuation)
+            text += suffix
+            yield suffix, finish_reason, usage
+            if finish_reason != 'length':
+                return
+
+    async def _complete_with_continuation(self, prompt: str, pages: Optional[int],
+                                          response_format: Optional[Dict] = None) -> Optional[str]:
+        """페이지 수에 맞는 예산으로 요청하고, 잘린 응답은 이어쓰기로 완성한 텍스트를 반환합니다."""
+        completion = await self._complete(prompt, max_tokens=self._budget_for(pages), response_format=response_format)
+        if not completion:
+            return None
+        text, finish_reason, usage = completion
+        completion_tokens = (usage or {}).get('completion_tokens')
+        truncated = finish_reason == 'length'
+
+        if truncated:
+            metrics.TRUNCATED_RESPONSES.inc()
+            async for suffix, finish_reason, usage in self._continue_truncated(prompt, text, pages):
+                text += suffix
+                tokens = (usage or {}).get('completion_tokens')
+                if isinstance(completion_tokens, int) and isinstance(tokens, int):
+                    completion_tokens += tokens
+
+        self._observe_usage(pages, completion_tokens, truncated, finish_reason)
+        return text
+
+    async def generate_storyboard(self, prompt: str, pages: Optional[int] = None) -> Optional[Dict]:
+        """스토리보드를 생성합니다. 토큰 예산, 이어쓰기, 구조화 출력 처리는 GPTClient.generate_storyboard와 같습니다."""
+        if self.config.structured_output:
+            response = await self._complete_with_continuation(prompt, pages, response_format=STORYBOARD_RESPONSE_FORMAT)
+            if response:
+                storyboard = self._parse_structured_response(response)
+                if storyboard is not None:
+                    return storyboard
+                return self._parse_storyboard_response(response)
+            print("구조화 출력 요청이 실패하여 일반 요청으로 다시 시도합니다.")
+
+        response = await self._complete_with_continuation(prompt, pages)
+
+        if not response:
+            print("GPT API로부터 응답을 받지 못했습니다.")
+            return None
+
+        return self._parse_storyboard_response(response)
+
+    async def gather_storyboards(self, prompts: Sequence[str], concurrency: int = 8,
+                                 requests_per_minute: float = 0,
+                                 cancel_event: Optional[asyncio.Event] = None,
+                                 pages: Optional[Sequence[Optional[int]]] = None) -> List[Optional[Dict]]:
+        """여러 프롬프트를 최대 concurrency개씩 동시에 생성합니다.
+
+        pages를 주면 prompts와 같은 순서의 페이지 수로 출력 토큰 예산을 정합니다.
+        결과는 prompts와 같은 순서의 리스트이며, 실패하거나 취소된 항목은 None입니다.
+        cancel_event가 설정되면 대기 중인 항목은 시작하지 않고 진행 중인 요청도 취소합니다.
+        호출한 태스크가 취소되면 모든 하위 요청을 취소한 뒤 CancelledError를 다시 발생시킵니다.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        bucket = TokenBucket.per_minute(requests_per_minute, burst=max(1, concurrency)) if requests_per_minute else None
+        results: List[Optional[Dict]] = [None] * len(prompts)
+
+        async def worker(index: int, prompt: str):
+            async with semaphore:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                if bucket is not None:
+                    delay = bucket.reserve(1)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                results[index] = await self.generate_storyboard(prompt, pages=pages[index] if pages else None)
+
+        tasks = [asyncio.ensure_future(worker(index, prompt)) for index, prompt in enumerate(prompts)]
+        watcher = None
+        if cancel_event is not None:
+            async def watch():
+                await cancel_event.wait()
+                for task in tasks:
+                    task.cancel()
+            watcher = asyncio.ensure_future(watch())
+
+        try:
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception) and not isinstance(outcome, asyncio.CancelledError):
+                print(f"생성 오류 ({index}): {outcome}")
+        return results
+
+    def get_transport_stats(self) -> Dict[str, int]:
+        """전송 계층의 연결 재사용 통계를 반환합니다."""
+        return self.transport.stats()
+
+    async def aclose(self):
+        """연결 풀을 닫습니다."""
+        await self.transport.aclose()
+
+
+if __name__ == "__main__":
+    # 간단한 동시 생성 테스트
+    async def _demo():
+        async with AsyncGPTClient() as client:
+            started = time.perf_counter()
+            results = await client.gather_storyboards(
+                ["간단한 1페이지 인스타툰 스토리보드를 JSON으로 작성해주세요."] * 3,
+                concurrency=3
+            )
+            print(f"성공 {sum(1 for r in results if r)}/{len(results)}건, "
+                  f"{time.perf_counter() - started:.2f}초, {client.get_transport_stats()}")
+
+    try:
+        asyncio.run(_demo())
+    except ValueError as e:
+        print(f"설정 오류: {e}")
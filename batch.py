@@ -0,0 +1,176 @@
+"""
+배치 생성 모듈
+JSONL 입력 파일의 각 레코드로 스토리보드를 동시에 생성하고, 완료되는 대로 결과를 기록합니다.
+체크포인트 파일을 사용하여 중단된 실행을 이어서 진행할 수 있습니다.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from rate_limit import TokenBucket
+
+
+INPUT_FIELDS = ('characters', 'keywords', 'plot', 'pages')
+
+
+def read_records(input_path: str) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """JSONL 파일에서 (레코드 ID, 사용자 입력)을 읽습니다.
+
+    레코드에 id가 없으면 줄 번호를 ID로 사용합니다.
+    """
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            record_id = str(record.get('id', line_number))
+            user_input = {field: str(record.get(field, '') or '') for field in INPUT_FIELDS}
+            yield record_id, user_input
+
+
+def load_checkpoint(checkpoint_path: str) -> Set[str]:
+    """체크포인트 파일에서 완료된 레코드 ID 집합을 읽습니다."""
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """정렬되지 않은 값 목록의 백분위수를 계산합니다 (nearest-rank)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class BatchRunner:
+    """JSONL 레코드를 동시에 생성하는 배치 실행기
+
+    - concurrency: 동시에 진행할 생성 수
+    - rpm / tpm: 분당 요청 수 / 분당 토큰 수 제한 (0이면 제한 없음)
+      토큰 수는 프롬프트 길이와 max_tokens로 추정한 값을 요청 전에 예약합니다.
+    """
+
+    def __init__(self, generator, concurrency: int = 4, rpm: float = 0, tpm: float = 0,
+                 use_cache: bool = True):
+        self.generator = generator
+        self.concurrency = max(1, concurrency)
+        self.use_cache = use_cache
+        self.request_bucket = TokenBucket.per_minute(rpm, burst=max(1, concurrency)) if rpm else None
+        self.token_bucket = TokenBucket.per_minute(tpm) if tpm else None
+        self._write_lock = threading.Lock()
+
+    def _estimate_tokens(self, user_input: Dict[str, str]) -> int:
+        """요청에 사용될 토큰 수를 보수적으로 추정합니다 (한글 1자 ≈ 1토큰)."""
+        prompt_tokens = len(self.generator._build_prompt(user_input))
+        max_tokens = self.generator.gpt_client.config.max_tokens if self.generator.gpt_client else 0
+        return prompt_tokens + max_tokens
+
+    def _wait_for_capacity(self, user_input: Dict[str, str]):
+        if self.request_bucket:
+            self.request_bucket.acquire(1)
+        if self.token_bucket:
+            self.token_bucket.acquire(self._estimate_tokens(user_input))
+
+    def _generate(self, record_id: str, user_input: Dict[str, str]) -> Dict:
+        """레코드 하나를 생성하고 결과 레코드를 반환합니다."""
+        if not self.generator.validate_input(user_input['plot'], user_input['pages']):
+            return {'id': record_id, 'status': 'failed', 'error': '입력값이 올바르지 않습니다.', 'latency': 0.0}
+
+        self._wait_for_capacity(user_input)
+
+        started = time.perf_counter()
+        try:
+            storyboard = self.generator.generate_storyboard(user_input, use_cache=self.use_cache)
+            error = None if storyboard else '스토리보드 생성에 실패했습니다.'
+        except Exception as e:
+            storyboard, error = None, str(e)
+        latency = time.perf_counter() - started
+
+        result = {'id': record_id, 'status': 'succeeded' if storyboard else 'failed', 'latency': round(latency, 3)}
+        if storyboard:
+            result['storyboard'] = storyboard
+        else:
+            result['error'] = error
+        return result
+
+    def _record_result(self, result: Dict, output_file, checkpoint_file):
+        """결과를 출력 파일에 기록하고, 성공한 레코드는 체크포인트에 추가합니다."""
+        with self._write_lock:
+            output_file.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output_file.flush()
+            if result['status'] == 'succeeded':
+                checkpoint_file.write(result['id'] + '\n')
+                checkpoint_file.flush()
+
+    def run(self, input_path: str, output_path: str, checkpoint_path: Optional[str] = None) -> Dict:
+        """배치를 실행하고 요약 통계를 반환합니다."""
+        if checkpoint_path is None:
+            checkpoint_path = f"{output_path}.checkpoint"
+
+        completed = load_checkpoint(checkpoint_path)
+        records = list(read_records(input_path))
+        pending = [(record_id, user_input) for record_id, user_input in records if record_id not in completed]
+
+        print(f"배치 시작: 전체 {len(records)}건, 완료됨 {len(records) - len(pending)}건, "
+              f"대기 {len(pending)}건 (동시 실행 {self.concurrency})")
+
+        latencies: List[float] = []
+        succeeded = failed = 0
+        started = time.perf_counter()
+
+        with open(output_path, 'a', encoding='utf-8') as output_file, \
+                open(checkpoint_path, 'a', encoding='utf-8') as checkpoint_file, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self._generate, record_id, user_input)
+                       for record_id, user_input in pending]
+
+            try:
+                for done_count, future in enumerate(as_completed(futures), start=1):
+                    result = future.result()
+                    self._record_result(result, output_file, checkpoint_file)
+                    if result['status'] == 'succeeded':
+                        succeeded += 1
+                        latencies.append(result['latency'])
+                    else:
+                        failed += 1
+                    print(f"[{done_count}/{len(pending)}] {result['id']}: {result['status']}")
+            except KeyboardInterrupt:
+                print("\n배치가 중단되었습니다. 같은 명령으로 다시 실행하면 이어서 진행합니다.")
+                for future in futures:
+                    future.cancel()
+                raise
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            'total': len(records),
+            'skipped': len(records) - len(pending),
+            'succeeded': succeeded,
+            'failed': failed,
+            'elapsed_seconds': round(elapsed, 3),
+            'throughput_per_minute': round((succeeded + failed) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            'failure_rate': round(failed / len(pending), 4) if pending else 0.0,
+            'latency_p50': percentile(latencies, 50),
+            'latency_p95': percentile(latencies, 95),
+            'latency_max': max(latencies) if latencies else None,
+        }
+        return summary
+
+
+def print_summary(summary: Dict):
+    """배치 요약을 출력합니다."""
+    print("\n=== 배치 요약 ===")
+    print(f"전체: {summary['total']}건 (건너뜀 {summary['skipped']}건)")
+    print(f"성공: {summary['succeeded']}건 / 실패: {summary['failed']}건 (실패율 {summary['failure_rate']:.1%})")
+    print(f"소요 시간: {summary['elapsed_seconds']}초, 처리량: {summary['throughput_per_minute']}건/분")
+    if summary['latency_p50'] is not None:
+        print(f"지연 시간: p50 {summary['latency_p50']:.2f}초, p95 {summary['latency_p95']:.2f}초, "
+              f"최대 {summary['latency_max']:.2f}초")
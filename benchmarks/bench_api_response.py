@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+API 응답 크기·인코딩 시간 벤치마크
+/api/generate 응답(스토리보드 + text_content)을 기존 방식(ASCII 이스케이프, 비압축)과
+UTF-8 직렬화, gzip 압축, ?fields=storyboard 선택을 적용한 방식으로 비교합니다.
+
+사용법:
+    python benchmarks/bench_api_response.py [--repeat N]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# app 임포트 시 저장소가 작업 디렉터리에 생기지 않도록 임시 디렉터리를 사용합니다
+os.environ.setdefault('INSTATOON_STORAGE_BACKEND', 'json')
+os.environ.setdefault('INSTATOON_STORAGE_DIR', tempfile.mkdtemp())
+
+from app import storyboard_to_text
+from bench_json_extraction import make_storyboard
+
+
+def legacy_encode(storyboard):
+    """변경 전: 텍스트 변환 + ASCII 이스케이프 JSON"""
+    payload = {'success': True, 'storyboard': storyboard,
+               'text_content': storyboard_to_text(storyboard), 'filename': 'storyboard.json'}
+    return json.dumps(payload).encode('utf-8')
+
+
+def utf8_encode(storyboard):
+    payload = {'success': True, 'storyboard': storyboard,
+               'text_content': storyboard_to_text(storyboard), 'filename': 'storyboard.json'}
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def utf8_gzip_encode(storyboard):
+    return gzip.compress(utf8_encode(storyboard), compresslevel=6)
+
+
+def fields_gzip_encode(storyboard):
+    """?fields=storyboard: 텍스트 변환 생략"""
+    payload = {'success': True, 'storyboard': storyboard}
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return gzip.compress(body, compresslevel=6)
+
+
+VARIANTS = [
+    ('기존', legacy_encode),
+    ('UTF-8', utf8_encode),
+    ('UTF-8+gzip', utf8_gzip_encode),
+    ('fields+gzip', fields_gzip_encode),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    header = f"{'페이지':>6}" + "".join(f"{name + ' B':>16}{'µs':>9}" for name, _ in VARIANTS)
+    print(header)
+    for pages in (1, 4, 8, 10):
+        storyboard = make_storyboard(pages)
+        row = f"{pages:>6}"
+        for _, encode in VARIANTS:
+            size = len(encode(storyboard))
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                encode(storyboard)
+            elapsed_us = (time.perf_counter() - started) / args.repeat * 1e6
+            row += f"{size:>16}{elapsed_us:>9.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+DOCX 렌더링 벤치마크
+변경 전 create_docx_from_storyboard(매번 새 Document 생성)와 DocxRenderer를
+1~10페이지 스토리보드로 비교하여 렌더링 시간과 최대 메모리 사용량을 출력합니다.
+
+사용법:
+    python benchmarks/bench_docx_render.py [--repeat N]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+from docx_render import DocxRenderer
+from bench_json_extraction import make_storyboard
+
+
+def legacy_render(storyboard):
+    """변경 전 app.create_docx_from_storyboard + 저장"""
+    doc = Document()
+
+    title = doc.add_heading(storyboard['wholeTitle'], 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    doc.add_heading('📝 핵심 주제', level=1)
+    doc.add_paragraph(storyboard['storyTopic'])
+
+    doc.add_heading('🏷️ 해시태그', level=1)
+    doc.add_paragraph(" ".join(storyboard['hashtags']))
+
+    doc.add_heading('📖 스토리보드', level=1)
+
+    for page in storyboard['pages']:
+        doc.add_heading(f"페이지 {page['page']}", level=2)
+        doc.add_paragraph().add_run("👥 등장인물: ").bold = True
+        doc.add_paragraph(", ".join(page['character']))
+        doc.add_paragraph().add_run("🎬 배경: ").bold = True
+        doc.add_paragraph(page['background'])
+        doc.add_paragraph().add_run("💬 대사: ").bold = True
+        dialogue_para = doc.add_paragraph()
+        for char, dialogue in page['dialogue'].items():
+            dialogue_para.add_run(f"{char}: \"{dialogue}\"\n")
+        doc.add_paragraph().add_run("🎭 표정/포즈: ").bold = True
+        doc.add_paragraph(page['expressionPose'])
+        if page != storyboard['pages'][-1]:
+            doc.add_paragraph("-" * 50)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(render, storyboard, repeat):
+    """평균 렌더링 시간(ms)과 1회 렌더링의 최대 메모리(KiB)를 측정합니다."""
+    render(storyboard)  # 워밍업 (기본 문서·원형 로드)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render(storyboard)
+    elapsed_ms = (time.perf_counter() - started) / repeat * 1000
+
+    tracemalloc.start()
+    render(storyboard)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    renderer = DocxRenderer()
+
+    print(f"반복: {args.repeat}회\n")
+    print(f"{'페이지':>6}{'기존 ms':>10}{'신규 ms':>10}{'캐시 ms':>10}{'기존 KiB':>11}{'신규 KiB':>11}")
+
+    for pages in range(1, 11):
+        storyboard = make_storyboard(pages)
+        legacy_ms, legacy_kib = measure(legacy_render, storyboard, args.repeat)
+        new_ms, new_kib = measure(renderer.render_uncached, storyboard, args.repeat)
+        cached_ms, _ = measure(renderer.render, storyboard, args.repeat)
+        print(f"{pages:>6}{legacy_ms:>10.2f}{new_ms:>10.2f}{cached_ms:>10.3f}{legacy_kib:>11.0f}{new_kib:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
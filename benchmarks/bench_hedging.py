@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+다중 엔드포인트 벤치마크
+모의 OpenAI 서버(mock_openai.py) 여러 개를 띄우고 GPTClient를 EndpointPool로 연결하여
+중복 요청(hedging) 사용 여부에 따른 지연 시간 p50/p95/p99와 엔드포인트 제외 동작을 비교합니다.
+실제 API 키나 네트워크 없이 실행됩니다.
+
+사용법:
+    python benchmarks/bench_hedging.py [--requests 200] [--concurrency 4]
+                                       [--latencies lognormal:300:0.3,lognormal:300:1.0]
+                                       [--failing-endpoint] [--percentile 0.9]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BENCH_DIR)
+
+from batch import percentile
+from gpt_client import GPTClient, GPTConfig
+from mock_openai import LatencyModel, MockState, start_mock_server
+
+
+def run(endpoints, hedge_percentile: float, total: int, concurrency: int, pages: int):
+    """요청을 total번 보내고 (지연 시간 목록, 실패 수, 전송 계층 통계)를 반환합니다."""
+    config = GPTConfig(api_key='sk-mock', endpoints=endpoints, hedge_percentile=hedge_percentile,
+                       hedge_min_samples=20, eject_seconds=2.0)
+    client = GPTClient(config)
+    prompt = f"###분량\n{pages}장"
+
+    def one(_):
+        started = time.perf_counter()
+        storyboard = client.generate_storyboard(prompt, pages=pages)
+        return time.perf_counter() - started, storyboard is not None
+
+    # 요청마다 찍히는 진행 로그는 결과 표를 가리므로 버립니다
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(one, range(total)))
+    stats = client.get_transport_stats()
+    client.transport.close()
+
+    latencies = [elapsed for elapsed, ok in results if ok]
+    return latencies, sum(1 for _, ok in results if not ok), stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=4)
+    parser.add_argument('--latencies', default='lognormal:300:0.3,lognormal:300:1.0',
+                        help="엔드포인트별 지연 시간 분포 (쉼표 구분, mock_openai.py 형식)")
+    parser.add_argument('--failing-endpoint', action='store_true', help="항상 429를 보내는 엔드포인트를 추가")
+    parser.add_argument('--percentile', type=float, default=0.9, help="중복 요청을 보낼 응답 시간 백분위")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    servers = []
+    for index, spec in enumerate(args.latencies.split(',')):
+        servers.append(start_mock_server(MockState(LatencyModel.parse(spec.strip()), seed=args.seed + index)))
+    if args.failing_endpoint:
+        servers.append(start_mock_server(MockState(LatencyModel.parse('fixed:5'), error_rate=1.0,
+                                                   error_status=429, seed=args.seed)))
+    endpoints = [{'base_url': f"http://127.0.0.1:{server.server_port}/v1", 'api_key': 'sk-mock', 'weight': 1.0}
+                 for server in servers]
+
+    print(f"{'hedging':<10}{'성공':>6}{'실패':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'중복':>6}{'역전':>6}")
+    for label, hedge_percentile in (('off', 0.0), (f"p{args.percentile * 100:g}", args.percentile)):
+        latencies, failed, stats = run(endpoints, hedge_percentile, args.requests, args.concurrency, args.pages)
+        print(f"{label:<10}{len(latencies):>6}{failed:>6}"
+              f"{percentile(latencies, 50) * 1000:>10.1f}{percentile(latencies, 95) * 1000:>10.1f}"
+              f"{percentile(latencies, 99) * 1000:>10.1f}{stats['hedged']:>6}{stats['hedge_wins']:>6}")
+        for endpoint in stats['endpoints']:
+            print(f"    {endpoint['base_url']}: 요청 {endpoint['requests']}, 실패 {endpoint['failures']}, "
+                  f"제외 {endpoint['ejections']}")
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
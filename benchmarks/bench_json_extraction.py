@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+JSON 추출·수정 마이크로 벤치마크
+기존 정규식 기반 추출 체인과 단일 패스 extract_json을 같은 응답 코퍼스로 비교합니다.
+
+사용법:
+    python benchmarks/bench_json_extraction.py [--corpus DIR] [--repeat N]
+
+--corpus 디렉터리의 *.txt 파일(실제 GPT 원본 응답)과 합성 응답을 함께 사용합니다.
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from json_repair import extract_json
+
+
+def legacy_parse(response):
+    """변경 전 GPTClient의 추출 → 정리 → 파싱 → 후행 쉼표 수정 체인"""
+    json_str = None
+    match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL | re.IGNORECASE)
+    if match:
+        json_str = match.group(1).strip()
+    if json_str is None:
+        match = re.search(r'```\s*(.*?)\s*```', response, re.DOTALL)
+        if match:
+            potential_json = match.group(1).strip()
+            if potential_json.startswith('{') and potential_json.endswith('}'):
+                json_str = potential_json
+    if json_str is None:
+        first_brace = response.find('{')
+        last_brace = response.rfind('}')
+        if first_brace != -1 and last_brace != -1 and first_brace < last_brace:
+            json_str = response[first_brace:last_brace + 1]
+    if json_str is None:
+        return None
+
+    json_str = json_str.strip()
+    json_str = re.sub(r'^[`\s]*', '', json_str)
+    json_str = re.sub(r'[`\s]*$', '', json_str)
+    json_str = re.sub(r'^json\s*', '', json_str, flags=re.IGNORECASE)
+
+    try:
+        return json.loads(json_str)
+    except json.JSONDecodeError:
+        fixed_json = re.sub(r',\s*}', '}', json_str)
+        fixed_json = re.sub(r',\s*]', ']', fixed_json)
+        try:
+            return json.loads(fixed_json)
+        except json.JSONDecodeError:
+            return None
+
+
+def single_pass_parse(response):
+    """단일 패스 추출·수정 (파싱 결과 포함)"""
+    return extract_json(response).value
+
+
+def make_storyboard(pages):
+    return {
+        "wholeTitle": "비 오는 날의 작은 기적",
+        "storyTopic": "사소한 친절이 하루를 바꿀 수 있다는 메시지를 전합니다.",
+        "hashtags": ["#인스타툰", "#일상툰", "#친절", "#비오는날", "#힐링"],
+        "pages": [
+            {
+                "page": number,
+                "character": ["지민", "수아"],
+                "background": f"버스 정류장, 장대비가 쏟아지는 저녁 ({number}컷)",
+                "dialogue": {
+                    "지민": "우산 같이 쓸래요? 저도 이 방향으로 가요.",
+                    "수아": "정말요? 고마워요, 오늘 너무 힘들었거든요."
+                },
+                "expressionPose": "지민은 수줍게 웃으며 우산을 내밀고, 수아는 놀란 표정으로 바라본다."
+            }
+            for number in range(1, pages + 1)
+        ]
+    }
+
+
+def synthetic_corpus(rng):
+    """정상·비정상 응답을 섞은 합성 코퍼스를 생성합니다."""
+    corpus = []
+    for pages in range(1, 11):
+        body = json.dumps(make_storyboard(pages), ensure_ascii=False, indent=2)
+        corpus.append(('fenced', f"```json\n{body}\n```"))
+        corpus.append(('bare', body))
+        corpus.append(('prose', f"요청하신 스토리보드입니다.\n\n```\n{body}\n```\n\n필요하면 수정해 드릴게요!"))
+        corpus.append(('trailing_comma', body.replace('"\n    }', '",\n    }').replace(']\n}', '],\n}')))
+        corpus.append(('smart_quotes', body.replace('"wholeTitle"', '“wholeTitle”')))
+        corpus.append(('truncated', body[:int(len(body) * rng.uniform(0.6, 0.95))]))
+    return corpus
+
+
+def load_corpus(directory):
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.txt'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            corpus.append(('real', f.read()))
+    return corpus
+
+
+def bench(parse, corpus, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _, response in corpus:
+            parse(response)
+    elapsed = time.perf_counter() - started
+    return elapsed / (repeat * len(corpus)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help="실제 GPT 응답(*.txt)이 들어 있는 디렉터리")
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(random.Random(args.seed))
+    if args.corpus:
+        corpus.extend(load_corpus(args.corpus))
+
+    print(f"코퍼스: {len(corpus)}건, 반복: {args.repeat}회\n")
+    print(f"{'종류':<16}{'건수':>6}{'기존 성공':>10}{'신규 성공':>10}{'기존 µs':>12}{'신규 µs':>12}")
+
+    kinds = sorted({kind for kind, _ in corpus})
+    for kind in kinds + ['전체']:
+        subset = corpus if kind == '전체' else [item for item in corpus if item[0] == kind]
+        legacy_ok = sum(1 for _, response in subset if legacy_parse(response) is not None)
+        single_ok = sum(1 for _, response in subset if single_pass_parse(response) is not None)
+        legacy_us = bench(legacy_parse, subset, args.repeat)
+        single_us = bench(single_pass_parse, subset, args.repeat)
+        print(f"{kind:<16}{len(subset):>6}{legacy_ok:>10}{single_ok:>10}{legacy_us:>12.1f}{single_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
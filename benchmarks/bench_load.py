@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+부하 테스트 벤치마크
+모의 OpenAI 서버(mock_openai.py)를 띄우고 Flask 앱을 실제 HTTP 서버로 실행한 뒤,
+/api/generate 와 /api/download-docx 를 동시 요청 수를 늘려 가며 호출하여
+처리량(RPS)과 지연 시간 p50/p95/p99를 측정합니다.
+
+사용법:
+    python benchmarks/bench_load.py [--levels 1,2,4,8,16] [--requests 40]
+                                    [--latency lognormal:800:0.5] [--malformed-rate 0.2]
+                                    [--json results.json]
+
+--json 파일에는 커밋 해시와 설정, 단계별 결과가 저장되어 커밋 간 비교에 사용할 수 있습니다.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH_DIR, '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+import requests
+
+from batch import percentile
+from bench_json_extraction import make_storyboard
+from mock_openai import add_mock_arguments, start_mock_server, state_from_args
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def start_app_server(env):
+    """앱을 werkzeug 멀티스레드 서버로 실행하고 base URL을 반환합니다."""
+    os.environ.update(env)
+    # 요청마다 찍히는 접근 로그는 측정을 방해하므로 끕니다
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    from werkzeug.serving import make_server
+    from config import Config
+    # 모든 요청이 같은 클라이언트 주소에서 오므로 클라이언트별 속도 제한은 끕니다 (동시 실행 상한은 유지)
+    Config.CLIENT_REQUESTS_PER_MINUTE = 0
+    from app import app
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='bench-app', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def generate_payload(index: int, pages: int):
+    # 매 요청을 새로 생성하도록 입력을 바꾸고 fresh를 지정합니다 (캐시 히트 제외)
+    return {
+        'characters': '지민, 수아',
+        'keywords': '비, 우산, 친절',
+        'plot': f'비 오는 날 버스 정류장에서 우산을 나눠 쓰며 친해지는 이야기 #{index}',
+        'pages': str(pages),
+        'fresh': True,
+    }
+
+
+def docx_payload(index: int, pages: int, reuse: bool):
+    storyboard = make_storyboard(pages)
+    if not reuse:
+        # DOCX 캐시를 피하도록 제목을 바꿉니다
+        storyboard['wholeTitle'] = f"{storyboard['wholeTitle']} #{index}"
+    return {'storyboard': storyboard}
+
+
+def run_level(base_url: str, endpoint: str, concurrency: int, total: int, pages: int, docx_cache: bool):
+    """같은 동시 요청 수로 total건을 보내고 결과를 집계합니다."""
+    local = threading.local()
+
+    def session():
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        return local.session
+
+    def one(index: int):
+        if endpoint == 'generate':
+            url, payload = f"{base_url}/api/generate?fields=storyboard", generate_payload(index, pages)
+        else:
+            url, payload = f"{base_url}/api/download-docx", docx_payload(index, pages, docx_cache)
+        started = time.perf_counter()
+        try:
+            response = session().post(url, json=payload, timeout=300)
+            ok = response.status_code == 200
+            status = response.status_code
+        except requests.RequestException:
+            ok, status = False, 'error'
+        return time.perf_counter() - started, ok, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, ok, _ in results if ok]
+    statuses = {}
+    for _, _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    def ms(value):
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': total,
+        'succeeded': len(latencies),
+        'failed': total - len(latencies),
+        'statuses': statuses,
+        'elapsed_seconds': round(elapsed, 3),
+        'rps': round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        'p50_ms': ms(percentile(latencies, 50)),
+        'p95_ms': ms(percentile(latencies, 95)),
+        'p99_ms': ms(percentile(latencies, 99)),
+        'max_ms': ms(max(latencies) if latencies else None),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', default='1,2,4,8,16', help="동시 요청 수 목록 (쉼표 구분)")
+    parser.add_argument('--requests', type=int, default=40, help="단계별 요청 수")
+    parser.add_argument('--endpoints', default='generate,docx', help="generate, docx 중 측정할 항목")
+    parser.add_argument('--pages', type=int, default=6, help="스토리보드 페이지 수")
+    parser.add_argument('--docx-cache', action='store_true', help="같은 스토리보드로 DOCX 캐시 히트를 허용")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    mock_state = state_from_args(args)
+    mock = start_mock_server(mock_state)
+    env = {
+        'OPENAI_API_KEY': 'sk-mock',
+        'OPENAI_BASE_URL': f"http://127.0.0.1:{mock.server_port}/v1",
+        'INSTATOON_STORAGE_BACKEND': 'json',
+        'INSTATOON_STORAGE_DIR': tempfile.mkdtemp(prefix='instatoon-bench-'),
+        'INSTATOON_CACHE_DIR': tempfile.mkdtemp(prefix='instatoon-bench-cache-'),
+    }
+    server, base_url = start_app_server(env)
+
+    levels = [int(level) for level in args.levels.split(',') if level.strip()]
+    endpoints = [endpoint.strip() for endpoint in args.endpoints.split(',') if endpoint.strip()]
+
+    results = []
+    print(f"{'엔드포인트':<10}{'동시':>6}{'성공':>6}{'실패':>6}{'RPS':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint in endpoints:
+        for concurrency in levels:
+            result = run_level(base_url, endpoint, concurrency, args.requests, args.pages, args.docx_cache)
+            results.append(result)
+            print(f"{endpoint:<10}{concurrency:>6}{result['succeeded']:>6}{result['failed']:>6}"
+                  f"{result['rps']:>9.2f}{result['p50_ms'] or 0:>10.1f}{result['p95_ms'] or 0:>10.1f}"
+                  f"{result['p99_ms'] or 0:>10.1f}")
+
+    with mock_state.lock:
+        mock_counts = dict(mock_state.counts)
+    print(f"\n모의 서버: {mock_counts}")
+
+    if args.json:
+        report = {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'config': {
+                'latency': args.latency,
+                'error_rate': args.error_rate,
+                'error_status': args.error_status,
+                'malformed_rate': args.malformed_rate,
+                'truncation_rate': args.truncation_rate,
+                'pages': args.pages,
+                'requests_per_level': args.requests,
+                'docx_cache': args.docx_cache,
+            },
+            'mock': mock_counts,
+            'results': results,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+    server.shutdown()
+    mock.shutdown()
+    for key in ('INSTATOON_STORAGE_DIR', 'INSTATOON_CACHE_DIR'):
+        shutil.rmtree(env[key], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
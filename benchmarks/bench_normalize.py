@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+스토리보드 정규화 벤치마크
+JSON 추출 뒤 스키마 검증만 하던 기존 경로와 정규화(normalize_storyboard) 후 검증하는 경로를
+같은 응답 코퍼스로 비교하여, 다시 생성하지 않아도 되는 응답 비율과 처리 시간을 출력합니다.
+
+사용법:
+    python benchmarks/bench_normalize.py [--corpus DIR] [--repeat N]
+
+--corpus 디렉터리의 *.txt 파일(실제 GPT 원본 응답)과 흔한 형식 차이를 넣은 합성 응답을 함께 사용합니다.
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_json_extraction import load_corpus, make_storyboard
+from json_repair import extract_json
+from storyboard_model import normalize_storyboard
+from storyboard_schema import validate_storyboard
+
+
+def _page_string(storyboard, rng):
+    for page in storyboard['pages']:
+        page['page'] = str(page['page'])
+
+
+def _character_string(storyboard, rng):
+    for page in storyboard['pages']:
+        page['character'] = ', '.join(page['character'])
+
+
+def _dialogue_list(storyboard, rng):
+    for page in storyboard['pages']:
+        page['dialogue'] = [f"{name}: {line}" for name, line in page['dialogue'].items()]
+
+
+def _shuffled_pages(storyboard, rng):
+    rng.shuffle(storyboard['pages'])
+
+
+def _missing_page(storyboard, rng):
+    del storyboard['pages'][rng.randrange(len(storyboard['pages']))]
+
+
+def _empty_page(storyboard, rng):
+    storyboard['pages'].append({'page': len(storyboard['pages']) + 1})
+
+
+DRIFTS = {
+    'page_string': _page_string,
+    'character_string': _character_string,
+    'dialogue_list': _dialogue_list,
+    'shuffled_pages': _shuffled_pages,
+    'missing_page': _missing_page,
+    'empty_page': _empty_page,
+}
+
+
+def synthetic_corpus(rng):
+    """정상 응답과 형식 차이(드리프트)를 하나씩 넣은 응답을 생성합니다."""
+    corpus = []
+    for pages in range(2, 11):
+        clean = make_storyboard(pages)
+        corpus.append(('clean', json.dumps(clean, ensure_ascii=False)))
+        for kind, drift in DRIFTS.items():
+            storyboard = copy.deepcopy(clean)
+            drift(storyboard, rng)
+            corpus.append((kind, json.dumps(storyboard, ensure_ascii=False)))
+    return corpus
+
+
+def legacy_accepts(value):
+    return isinstance(value, dict) and not validate_storyboard(value)
+
+
+def normalized_accepts(value):
+    storyboard = normalize_storyboard(value).storyboard
+    return storyboard is not None and not validate_storyboard(storyboard)
+
+
+def bench(accepts, values, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for value in values:
+            accepts(value)
+    return (time.perf_counter() - started) / (repeat * len(values)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help="실제 GPT 응답(*.txt)이 들어 있는 디렉터리")
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(random.Random(args.seed))
+    if args.corpus:
+        corpus.extend(load_corpus(args.corpus))
+    # JSON 추출은 두 경로가 같으므로 미리 한 번만 합니다
+    parsed = [(kind, extract_json(response).value) for kind, response in corpus]
+
+    print(f"코퍼스: {len(corpus)}건, 반복: {args.repeat}회\n")
+    print(f"{'종류':<18}{'건수':>6}{'기존 통과':>10}{'정규화 통과':>12}{'기존 µs':>10}{'정규화 µs':>12}")
+
+    kinds = list(dict.fromkeys(kind for kind, _ in parsed))
+    totals = {}
+    for kind in kinds + ['전체']:
+        values = [value for item_kind, value in parsed if kind in ('전체', item_kind)]
+        legacy_ok = sum(1 for value in values if legacy_accepts(value))
+        normalized_ok = sum(1 for value in values if normalized_accepts(value))
+        legacy_us = bench(legacy_accepts, values, args.repeat)
+        normalized_us = bench(normalized_accepts, values, args.repeat)
+        print(f"{kind:<18}{len(values):>6}{legacy_ok:>10}{normalized_ok:>12}{legacy_us:>10.1f}{normalized_us:>12.1f}")
+        totals = {'count': len(values), 'legacy': legacy_ok, 'normalized': normalized_ok}
+
+    avoided = totals['normalized'] - totals['legacy']
+    print(f"\n재생성 필요: 기존 {totals['count'] - totals['legacy']}건 → 정규화 후 "
+          f"{totals['count'] - totals['normalized']}건 (회피 {avoided}건, {avoided / totals['count']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+스토리보드 검색 벤치마크
+합성 스토리보드 N개를 SearchIndex에 색인한 뒤, 드문 검색어·흔한 검색어·여러 단어 검색어의
+응답 시간(p50/p95)을 모든 스토리보드 본문을 훑는 단순 검색과 비교합니다.
+
+사용법:
+    python benchmarks/bench_search.py [--docs 20000] [--queries 200] [--seed 7]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from batch import percentile
+from search_index import SearchIndex, tokenize
+
+PLACES = ['출근길', '지하철', '카페', '편의점', '회의실', '캠핑장', '도서관', '헬스장', '바닷가', '놀이공원']
+THINGS = ['고양이', '강아지', '우산', '샐러드', '커피', '택배', '자전거', '노트북', '떡볶이', '화분']
+FEELINGS = ['설렘', '지각', '야근', '다이어트', '월요병', '힐링', '이별', '첫사랑', '이사', '자취']
+NAMES = ['민지', '지훈', '수아', '도윤', '하린', '서준', '유나', '시우']
+
+
+def make_storyboard(rng: random.Random, number: int):
+    place, thing, feeling = rng.choice(PLACES), rng.choice(THINGS), rng.choice(FEELINGS)
+    names = rng.sample(NAMES, 2)
+    return {
+        'wholeTitle': f"{place}의 {thing} {number}",
+        'storyTopic': f"{feeling}에 관한 {place} 이야기",
+        'hashtags': [f"#{feeling}", f"#{thing}", '#인스타툰'],
+        'pages': [{
+            'page': page,
+            'character': names,
+            'background': place,
+            'dialogue': {
+                names[0]: f"{rng.choice(THINGS)} 때문에 오늘도 {rng.choice(FEELINGS)}이야",
+                names[1]: f"{rng.choice(PLACES)}에 가면 괜찮아질 거야",
+            },
+            'expressionPose': '웃는 얼굴',
+        } for page in range(1, rng.randint(3, 8))]
+    }
+
+
+def scan_search(corpus, query):
+    """비교용 단순 검색: 모든 스토리보드의 n-gram 집합을 다시 만들어 검색어 n-gram을 모두 포함하는지 확인합니다."""
+    terms = set(tokenize(query))
+    matched = 0
+    for storyboard in corpus:
+        text = ' '.join([storyboard['wholeTitle'], storyboard['storyTopic'], *storyboard['hashtags']] +
+                        [line for page in storyboard['pages'] for line in page['dialogue'].values()])
+        if terms <= set(tokenize(text)):
+            matched += 1
+    return matched
+
+
+def timed(function, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        function(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return percentile(latencies, 50), percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=20000, help="색인할 스토리보드 수")
+    parser.add_argument('--queries', type=int, default=200, help="검색어 종류별 검색 횟수")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_storyboard(rng, number) for number in range(args.docs)]
+    directory = tempfile.mkdtemp(prefix='instatoon-search-')
+    try:
+        index = SearchIndex(os.path.join(directory, 'search_index.db'))
+        started = time.perf_counter()
+        for number, storyboard in enumerate(corpus):
+            index.add(f"doc{number}", storyboard, created_at=1_700_000_000 + number)
+        elapsed = time.perf_counter() - started
+        size_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 1e6
+        print(f"색인: {args.docs}개, {elapsed:.1f}초 (저장 1건당 {elapsed / args.docs * 1000:.2f}ms), {size_mb:.1f}MB")
+
+        kinds = {
+            '드문 검색어': [f"{rng.choice(THINGS)} {rng.randrange(args.docs)}" for _ in range(args.queries)],
+            '흔한 검색어': [rng.choice(THINGS) for _ in range(args.queries)],
+            '여러 단어': [f"{rng.choice(PLACES)} {rng.choice(FEELINGS)} {rng.choice(NAMES)}"
+                      for _ in range(args.queries)],
+        }
+        print(f"\n{'검색어':<10}{'색인 p50':>10}{'색인 p95':>10}{'단순 p50':>10}{'단순 p95':>10}  (ms)")
+        for kind, queries in kinds.items():
+            indexed = timed(lambda query: index.search(query, 1, 20), queries)
+            # 단순 검색은 느리므로 일부 검색어만 측정합니다
+            scanned = timed(lambda query: scan_search(corpus, query), queries[:5])
+            print(f"{kind:<10}{indexed[0]:>10.2f}{indexed[1]:>10.2f}{scanned[0]:>10.1f}{scanned[1]:>10.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
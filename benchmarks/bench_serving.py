@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+서버 모드 비교 벤치마크
+모의 OpenAI 서버를 띄우고 같은 앱을 Flask 개발 서버(app.run)와 운영 서버(python run.py serve)로
+각각 실행하여 /api/generate 의 처리량(RPS)과 p50/p95/p99를 비교합니다.
+운영 서버는 마지막에 요청 처리 중 SIGTERM을 보내 진행 중인 요청이 끝까지 응답되는지 확인합니다.
+
+사용법:
+    python benchmarks/bench_serving.py [--levels 8,32] [--requests 200]
+                                       [--workers 4] [--threads 16] [--latency fixed:200]
+"""
+
+import argparse
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+import requests
+
+from bench_load import generate_payload, run_level
+from mock_openai import add_mock_arguments, start_mock_server, state_from_args
+
+DEV_SERVER = "from app import app; import sys; app.run(debug=False, host='127.0.0.1', port=int(sys.argv[1]))"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, env, port: int) -> subprocess.Popen:
+    """dev 또는 prod 서버를 하위 프로세스로 실행하고 /api/health가 응답할 때까지 기다립니다."""
+    if mode == 'dev':
+        command = [sys.executable, '-c', DEV_SERVER, str(port)]
+    else:
+        command = [sys.executable, 'run.py', 'serve']
+    process = subprocess.Popen(command, cwd=ROOT, env=dict(env, PORT=str(port)),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/api/health", timeout=1)
+            return process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{mode} 서버가 시작되지 않았습니다.")
+
+
+def check_drain(process: subprocess.Popen, base_url: str, pages: int) -> str:
+    """생성 요청을 보낸 직후 SIGTERM을 보내고, 그 요청이 정상 응답을 받는지 확인합니다."""
+    result = {}
+
+    def call():
+        try:
+            response = requests.post(f"{base_url}/api/generate?fields=storyboard",
+                                     json=generate_payload(-1, pages), timeout=60)
+            result['status'] = response.status_code
+        except requests.RequestException as e:
+            result['status'] = f"error: {e}"
+
+    thread = threading.Thread(target=call)
+    thread.start()
+    time.sleep(0.05)
+    process.send_signal(signal.SIGTERM)
+    thread.join()
+    process.wait(timeout=60)
+    return f"진행 중 요청 {result.get('status')}, 종료 코드 {process.returncode}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', default='8,32', help="동시 요청 수 목록 (쉼표 구분)")
+    parser.add_argument('--requests', type=int, default=200, help="단계별 요청 수")
+    parser.add_argument('--pages', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=4, help="운영 서버 워커 프로세스 수")
+    parser.add_argument('--threads', type=int, default=16, help="워커당 스레드 수")
+    add_mock_arguments(parser)
+    parser.set_defaults(latency='fixed:200')
+    args = parser.parse_args()
+
+    mock = start_mock_server(state_from_args(args))
+    storage_dir = tempfile.mkdtemp(prefix='instatoon-bench-')
+    cache_dir = tempfile.mkdtemp(prefix='instatoon-bench-cache-')
+    env = dict(
+        os.environ,
+        OPENAI_API_KEY='sk-mock',
+        OPENAI_BASE_URL=f"http://127.0.0.1:{mock.server_port}/v1",
+        INSTATOON_STORAGE_BACKEND='json',
+        INSTATOON_STORAGE_DIR=storage_dir,
+        INSTATOON_CACHE_DIR=cache_dir,
+        INSTATOON_HOST='127.0.0.1',
+        INSTATOON_WORKERS=str(args.workers),
+        INSTATOON_THREADS=str(args.threads),
+        # 처리량 비교를 위해 수락 제어(클라이언트별 속도 제한)는 끕니다
+        INSTATOON_ADMISSION='0',
+    )
+    levels = [int(level) for level in args.levels.split(',') if level.strip()]
+
+    print(f"{'서버':<6}{'동시':>6}{'성공':>6}{'실패':>6}{'RPS':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    try:
+        for mode in ('dev', 'prod'):
+            port = free_port()
+            process = start_server(mode, env, port)
+            base_url = f"http://127.0.0.1:{port}"
+            for concurrency in levels:
+                result = run_level(base_url, 'generate', concurrency, args.requests, args.pages, False)
+                print(f"{mode:<6}{concurrency:>6}{result['succeeded']:>6}{result['failed']:>6}"
+                      f"{result['rps']:>9.2f}{result['p50_ms'] or 0:>10.1f}{result['p95_ms'] or 0:>10.1f}"
+                      f"{result['p99_ms'] or 0:>10.1f}")
+            if mode == 'prod':
+                print(f"\nSIGTERM 처리: {check_drain(process, base_url, args.pages)}")
+            else:
+                process.terminate()
+                process.wait(timeout=30)
+    finally:
+        mock.shutdown()
+        shutil.rmtree(storage_dir, ignore_errors=True)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
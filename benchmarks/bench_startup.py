@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+시작 시간 벤치마크
+진입점(index.py, app.py, main.py, run.py)마다 새 프로세스에서 임포트 시간과
+첫 응답까지의 시간을 측정합니다. 웹 진입점은 '/'와 '/api/health' 첫 요청,
+CLI 진입점은 InstaToonGenerator 생성까지를 첫 응답으로 봅니다.
+
+사용법:
+    python benchmarks/bench_startup.py [--runs N] [--eager]
+
+--eager를 주면 INSTATOON_LAZY_INIT=0(임포트 시 생성기 생성)으로 측정하여 지연 초기화와 비교할 수 있습니다.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# 하위 프로세스에서 실행되는 측정 코드
+PROBE = r'''
+import json, sys, time
+started = time.perf_counter()
+module = __import__(sys.argv[1])
+imported = time.perf_counter()
+result = {'import_ms': (imported - started) * 1000}
+if hasattr(module, 'app'):
+    client = module.app.test_client()
+    for path in ('/', '/api/health'):
+        request_started = time.perf_counter()
+        client.get(path)
+        result[path] = (time.perf_counter() - request_started) * 1000
+else:
+    from main import InstaToonGenerator
+    InstaToonGenerator()
+result['first_response_ms'] = (time.perf_counter() - started) * 1000
+print('RESULT ' + json.dumps(result))
+'''
+
+ENTRY_POINTS = ('index', 'app', 'main', 'run')
+
+
+def probe(entry_point, env):
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, entry_point],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    line = next(line for line in output.splitlines() if line.startswith('RESULT '))
+    return json.loads(line[len('RESULT '):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--eager', action='store_true', help="지연 초기화를 끄고 측정")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('OPENAI_API_KEY', 'sk-benchmark')
+    env['INSTATOON_STORAGE_BACKEND'] = 'json'
+    env['INSTATOON_STORAGE_DIR'] = tempfile.mkdtemp()
+    env['INSTATOON_CACHE_DIR'] = tempfile.mkdtemp()
+    env['INSTATOON_LAZY_INIT'] = '0' if args.eager else '1'
+
+    print(f"모드: {'즉시 초기화' if args.eager else '지연 초기화'}, 반복: {args.runs}회 (중앙값, ms)\n")
+    print(f"{'진입점':<10}{'임포트':>10}{'GET /':>10}{'health':>10}{'첫 응답':>10}")
+    for entry_point in ENTRY_POINTS:
+        results = [probe(entry_point, env) for _ in range(args.runs)]
+
+        def median(key):
+            values = [result[key] for result in results if key in result]
+            return f"{statistics.median(values):.1f}" if values else '-'
+
+        print(f"{entry_point + '.py':<10}{median('import_ms'):>10}{median('/'):>10}"
+              f"{median('/api/health'):>10}{median('first_response_ms'):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+모의 OpenAI 서버
+/v1/chat/completions 를 흉내 내어 실제 토큰을 쓰지 않고 부하 테스트를 할 수 있게 합니다.
+지연 시간 분포, 오류 비율, 스트리밍(SSE), 정상/손상된 스토리보드 응답을 설정할 수 있습니다.
+길이 제한으로 잘린 응답(finish_reason "length")과 이어쓰기 요청, 단일 페이지 재생성 프롬프트,
+n개 후보 요청(후보마다 다른 내용)도 실제 API처럼 응답합니다.
+
+사용법:
+    python benchmarks/mock_openai.py [--port 8089] [--latency lognormal:800:0.5]
+                                     [--error-rate 0.02] [--malformed-rate 0.2]
+                                     [--truncation-rate 0.1]
+
+앱은 OPENAI_BASE_URL=http://127.0.0.1:8089/v1 로 이 서버를 가리키면 됩니다.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_json_extraction import make_storyboard
+
+
+@dataclass
+class LatencyModel:
+    """응답 지연 시간 분포 (밀리초)
+
+    - fixed:<ms>
+    - uniform:<최소ms>:<최대ms>
+    - lognormal:<중앙값ms>:<sigma>
+    """
+    kind: str = 'fixed'
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> 'LatencyModel':
+        parts = spec.split(':')
+        kind = parts[0]
+        values = [float(value) for value in parts[1:]]
+        if kind == 'fixed' and len(values) == 1:
+            return cls(kind, values[0])
+        if kind == 'uniform' and len(values) == 2:
+            return cls(kind, values[0], values[1])
+        if kind == 'lognormal' and len(values) in (1, 2):
+            return cls(kind, values[0], values[1] if len(values) == 2 else 0.5)
+        raise ValueError(f"지연 시간 형식이 올바르지 않습니다: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        """지연 시간(초)을 하나 뽑습니다."""
+        if self.kind == 'uniform':
+            ms = rng.uniform(self.a, self.b)
+        elif self.kind == 'lognormal':
+            ms = rng.lognormvariate(math.log(max(self.a, 1e-3)), self.b)
+        else:
+            ms = self.a
+        return max(0.0, ms) / 1000
+
+
+# 추출/수정 경로를 거치게 하는 손상 형태 (모두 수정 가능)
+def _damage(body: str, kind: str) -> str:
+    if kind == 'trailing_comma':
+        return body.replace('"\n    }', '",\n    }').replace(']\n}', '],\n}')
+    if kind == 'smart_quotes':
+        return body.replace('"wholeTitle"', '“wholeTitle”').replace('"storyTopic"', '“storyTopic”')
+    if kind == 'prose':
+        return f"요청하신 스토리보드입니다.\n\n```\n{body}\n```\n\n필요하면 수정해 드릴게요!"
+    return f"```json\n{body}\n```"
+
+
+MALFORMED_KINDS = ('trailing_comma', 'smart_quotes', 'prose')
+
+
+# n개 후보 요청에서 후보마다 적용하는 변형 (순위 모듈의 점수 항목이 서로 다르게 나오도록)
+def _drop_last_page(storyboard: Dict):
+    if len(storyboard['pages']) > 1:
+        storyboard['pages'].pop()
+
+
+def _long_dialogue(storyboard: Dict):
+    for page in storyboard['pages']:
+        page['dialogue'] = {name: ' '.join([line] * 4) for name, line in page['dialogue'].items()}
+
+
+def _blank_poses(storyboard: Dict):
+    for page in storyboard['pages'][::2]:
+        page['expressionPose'] = ''
+
+
+def _retitled(storyboard: Dict):
+    storyboard['wholeTitle'] = '어느 평범한 하루'
+    storyboard['hashtags'] = ['#인스타툰', '#일상툰']
+
+
+CANDIDATE_VARIANTS = {
+    'as_is': None,
+    'short': _drop_last_page,
+    'long_dialogue': _long_dialogue,
+    'blank_poses': _blank_poses,
+    'retitled': _retitled,
+}
+
+# 프롬프트 템플릿의 '###분량\n4장' 부분
+_PAGES_PATTERN = re.compile(r'###분량\s*(\d+)')
+# 단일 페이지 재생성 프롬프트의 '###다시 작성할 페이지 (3)' 부분
+_PAGE_PROMPT_PATTERN = re.compile(r'###다시 작성할 페이지 \((\d+)\)')
+
+
+class MockState:
+    """서버 설정과 요청 통계"""
+
+    # 이어쓰기 요청에 돌려줄 나머지 텍스트를 보관하는 잘린 응답 수
+    MAX_PENDING_CONTINUATIONS = 1024
+
+    def __init__(self, latency: LatencyModel, error_rate: float = 0.0, error_status: int = 500,
+                 malformed_rate: float = 0.0, truncation_rate: float = 0.0, stream_chunk_chars: int = 40,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.malformed_rate = malformed_rate
+        self.truncation_rate = truncation_rate
+        self.stream_chunk_chars = stream_chunk_chars
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts: Dict[str, int] = {'requests': 0, 'errors': 0, 'malformed': 0, 'streams': 0,
+                                       'truncated': 0, 'continuations': 0, 'page_requests': 0}
+        self._bodies: Dict[int, str] = {}
+        # 잘린 응답 텍스트 → 이어쓰기 요청에 돌려줄 나머지
+        self._remainders: Dict[str, str] = {}
+
+    def count(self, key: str):
+        with self.lock:
+            self.counts[key] += 1
+
+    def draw(self):
+        """(지연 시간, 오류 여부, 손상 종류)를 뽑습니다."""
+        with self.lock:
+            delay = self.latency.sample(self.rng)
+            error = self.rng.random() < self.error_rate
+            malformed = None
+            if self.rng.random() < self.malformed_rate:
+                malformed = self.rng.choice(MALFORMED_KINDS)
+        return delay, error, malformed
+
+    def storyboard_body(self, pages: int) -> str:
+        body = self._bodies.get(pages)
+        if body is None:
+            body = self._bodies[pages] = json.dumps(make_storyboard(pages), ensure_ascii=False, indent=2)
+        return body
+
+    def candidate_bodies(self, pages: int, count: int) -> List[str]:
+        """후보 count개의 본문을 반환합니다. 후보마다 다른 변형을 무작위 순서로 적용합니다."""
+        if count == 1:
+            return [self.storyboard_body(pages)]
+        with self.lock:
+            kinds = self.rng.sample(list(CANDIDATE_VARIANTS), min(count, len(CANDIDATE_VARIANTS)))
+        bodies = []
+        for index in range(count):
+            storyboard = make_storyboard(pages)
+            variant = CANDIDATE_VARIANTS[kinds[index % len(kinds)]]
+            if variant is not None:
+                variant(storyboard)
+            if index >= len(kinds):
+                storyboard['wholeTitle'] += f" ({index + 1})"
+            bodies.append(json.dumps(storyboard, ensure_ascii=False, indent=2))
+        return bodies
+
+    def page_body(self, page_number: int) -> str:
+        page = make_storyboard(1)['pages'][0]
+        page['page'] = page_number
+        page['background'] = f"비가 그친 골목길 ({page_number}컷, 다시 작성)"
+        return json.dumps(page, ensure_ascii=False, indent=2)
+
+    def truncate(self, content: str) -> Optional[str]:
+        """truncation_rate 확률로 content를 중간에서 자르고, 나머지는 이어쓰기 요청을 위해 보관합니다."""
+        with self.lock:
+            if not content or self.rng.random() >= self.truncation_rate:
+                return None
+            cut = int(len(content) * self.rng.uniform(0.3, 0.8))
+            partial = content[:cut]
+            if len(self._remainders) >= self.MAX_PENDING_CONTINUATIONS:
+                self._remainders.pop(next(iter(self._remainders)))
+            self._remainders[partial] = content[cut:]
+            self.counts['truncated'] += 1
+        return partial
+
+    def remainder(self, partial: str) -> Optional[str]:
+        """잘린 응답 텍스트 partial의 나머지를 반환합니다 (모르는 텍스트면 None)."""
+        with self.lock:
+            return self._remainders.pop(partial, None)
+
+
+def _continued_text(messages: List[Dict]) -> Optional[str]:
+    """이어쓰기 요청(잘린 응답을 assistant 메시지로 보낸 요청)이면 그 잘린 텍스트를 반환합니다."""
+    if len(messages) >= 2 and messages[-2].get('role') == 'assistant':
+        return messages[-2].get('content') or ''
+    return None
+
+
+def _requested_pages(prompt: str) -> int:
+    match = _PAGES_PATTERN.search(prompt)
+    if match:
+        value = int(match.group(1))
+        if 1 <= value <= 10:
+            return value
+    return 4
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state: MockState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # 연결 예열(GET /models)과 상태 확인용
+        if self.path.rstrip('/').endswith('/models'):
+            self._send_json(200, {'object': 'list', 'data': [{'id': 'gpt-4.1', 'object': 'model'}]})
+        elif self.path.rstrip('/').endswith('/stats'):
+            with self.state.lock:
+                self._send_json(200, dict(self.state.counts))
+        else:
+            self._send_json(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        request = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'not found'}})
+            return
+
+        state = self.state
+        state.count('requests')
+        delay, error, malformed = state.draw()
+        time.sleep(delay)
+
+        if error:
+            state.count('errors')
+            headers = {'Retry-After': '0'} if state.error_status == 429 else None
+            self._send_json(state.error_status, {'error': {'message': 'mock error'}}, headers)
+            return
+
+        messages = request.get('messages') or [{}]
+        partial = _continued_text(messages)
+        if partial is not None:
+            state.count('continuations')
+            # 나머지는 다시 자르지 않습니다 (이어쓰기 한 번으로 완성)
+            self._respond(request, [state.remainder(partial) or ''], '', truncatable=False)
+            return
+
+        prompt = messages[-1].get('content', '')
+        page_match = _PAGE_PROMPT_PATTERN.search(prompt)
+        if page_match:
+            state.count('page_requests')
+            bodies = [state.page_body(int(page_match.group(1)))]
+        else:
+            bodies = state.candidate_bodies(_requested_pages(prompt), max(1, int(request.get('n') or 1)))
+        if request.get('response_format'):
+            malformed = None  # 구조화 출력은 항상 올바른 JSON
+        elif malformed:
+            state.count('malformed')
+        if not request.get('response_format'):
+            bodies = [_damage(body, malformed or 'fenced') for body in bodies]
+        self._respond(request, bodies, prompt)
+
+    def _respond(self, request: Dict, contents: List[str], prompt: str, truncatable: bool = True):
+        """choice마다 content를 응답합니다. 잘린 choice는 finish_reason이 "length"입니다."""
+        choices = []
+        for content in contents:
+            partial = self.state.truncate(content) if truncatable else None
+            choices.append((content if partial is None else partial, 'stop' if partial is None else 'length'))
+        usage = {'prompt_tokens': len(prompt), 'completion_tokens': sum(len(text) for text, _ in choices)}
+        usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
+
+        if request.get('stream'):
+            self.state.count('streams')
+            content, finish_reason = choices[0]
+            self._stream(content, finish_reason, usage, request.get('stream_options', {}).get('include_usage'))
+            return
+
+        self._send_json(200, {
+            'id': 'chatcmpl-mock',
+            'object': 'chat.completion',
+            'model': request.get('model', 'gpt-4.1'),
+            'choices': [{'index': index, 'message': {'role': 'assistant', 'content': content},
+                         'finish_reason': finish_reason} for index, (content, finish_reason) in enumerate(choices)],
+            'usage': usage,
+        })
+
+    def _stream(self, content: str, finish_reason: str, usage: Dict, include_usage: bool):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def write_event(payload):
+            data = f"data: {payload}\n\n".encode('utf-8')
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+        size = self.state.stream_chunk_chars
+        for start in range(0, len(content), size):
+            write_event(json.dumps({'choices': [{'index': 0, 'delta': {'content': content[start:start + size]}}]},
+                                   ensure_ascii=False))
+        write_event(json.dumps({'choices': [{'index': 0, 'delta': {}, 'finish_reason': finish_reason}]}))
+        if include_usage:
+            write_event(json.dumps({'choices': [], 'usage': usage}))
+        write_event('[DONE]')
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def start_mock_server(state: MockState, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """모의 서버를 백그라운드 스레드에서 시작합니다. base_url은 http://host:port/v1 입니다."""
+    handler = type('BoundMockHandler', (MockHandler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='mock-openai', daemon=True).start()
+    return server
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--latency', default='lognormal:800:0.5',
+                        help="지연 시간 분포: fixed:<ms> | uniform:<min>:<max> | lognormal:<median>:<sigma>")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument('--error-status', type=int, default=500, help="오류 응답 상태 코드 (예: 429, 500)")
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help="손상된 JSON 응답 비율 (0~1)")
+    parser.add_argument('--truncation-rate', type=float, default=0.0,
+                        help="길이 제한으로 잘린 응답(finish_reason \"length\") 비율 (0~1)")
+    parser.add_argument('--seed', type=int, default=None)
+
+
+def state_from_args(args) -> MockState:
+    return MockState(LatencyModel.parse(args.latency), error_rate=args.error_rate,
+                     error_status=args.error_status, malformed_rate=args.malformed_rate,
+                     truncation_rate=args.truncation_rate, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_mock_server(state_from_args(args), args.host, args.port)
+    print(f"모의 OpenAI 서버: http://{args.host}:{server.server_port}/v1 (Ctrl+C로 종료)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+일괄 내보내기 모듈
+여러 스토리보드의 JSON, 텍스트, DOCX를 하나의 ZIP으로 만들어 항목이 완성되는 대로 조각 단위로 내보냅니다.
+"""
+
+import json
+import tempfile
+import zipfile
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+# ZIP 출력은 이 크기를 넘으면 메모리 대신 임시 파일에 보관됩니다
+SPOOL_MAX_BYTES = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+class _SpooledSink:
+    """ZipFile이 쓰는 출력 스트림 (탐색 불가능한 스트림으로 취급됩니다)
+
+    쓰인 바이트는 SpooledTemporaryFile에 모였다가 drain()으로 비워집니다.
+    """
+
+    def __init__(self, max_size: int = SPOOL_MAX_BYTES):
+        self._buffer = tempfile.SpooledTemporaryFile(max_size=max_size)
+        self._size = 0
+
+    def write(self, data) -> int:
+        self._buffer.write(data)
+        self._size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """지금까지 쓰인 바이트를 chunk_size 단위로 내보내고 버퍼를 비웁니다."""
+        if not self._size:
+            return
+        self._buffer.seek(0)
+        while True:
+            chunk = self._buffer.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._size = 0
+
+    def close(self):
+        self._buffer.close()
+
+
+def iter_export_zip(items: Iterable[Tuple[str, Optional[Dict]]],
+                    render_docx: Callable[[Dict], bytes],
+                    to_text: Callable[[Dict], str],
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """(이름, 스토리보드) 목록으로 ZIP 바이트 조각을 생성합니다.
+
+    각 스토리보드는 '<번호>_<이름>/' 폴더에 storyboard.json, storyboard.txt, storyboard.docx로 들어가며,
+    폴더 하나가 완성될 때마다 해당 바이트를 내보냅니다. 스토리보드가 None이거나(찾을 수 없음)
+    변환할 수 없으면 건너뛰고 마지막에 export_errors.txt로 기록합니다.
+    """
+    sink = _SpooledSink()
+    errors = []
+    try:
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for index, (name, storyboard) in enumerate(items, start=1):
+                if storyboard is None:
+                    errors.append(f"{name}: 스토리보드를 찾을 수 없습니다.")
+                    continue
+                try:
+                    docx_bytes = render_docx(storyboard)
+                    text = to_text(storyboard)
+                except (KeyError, TypeError, AttributeError, ValueError) as e:
+                    errors.append(f"{name}: 변환 실패 ({e})")
+                    continue
+
+                folder = f"{index:03d}_{name}"
+                archive.writestr(f"{folder}/storyboard.json",
+                                 json.dumps(storyboard, ensure_ascii=False, indent=2))
+                archive.writestr(f"{folder}/storyboard.txt", text)
+                # DOCX는 이미 압축된 형식이므로 다시 압축하지 않습니다
+                archive.writestr(f"{folder}/storyboard.docx", docx_bytes,
+                                 compress_type=zipfile.ZIP_STORED)
+                yield from sink.drain(chunk_size)
+
+            if errors:
+                archive.writestr("export_errors.txt", "\n".join(errors) + "\n")
+
+        # 중앙 디렉터리(ZIP 끝부분)
+        yield from sink.drain(chunk_size)
+    finally:
+        sink.close()
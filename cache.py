@@ -0,0 +1,157 @@
+"""
+생성 결과 캐시 모듈
+동일한 입력·프롬프트·모델 설정으로 생성된 스토리보드를 메모리(LRU)와 디스크에 보관합니다.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def normalize_text(value) -> str:
+    """캐시 키 계산을 위해 공백을 정리한 문자열을 반환합니다."""
+    if value is None:
+        return ''
+    return re.sub(r'\s+', ' ', str(value)).strip()
+
+
+def make_cache_key(user_input: Dict[str, str], prompt_template: str,
+                   model: str, temperature: float, max_tokens: int) -> str:
+    """입력과 생성 설정으로부터 콘텐츠 주소(SHA-256) 키를 만듭니다."""
+    payload = {
+        'input': {key: normalize_text(value) for key, value in sorted(user_input.items())},
+        'template': prompt_template,
+        'model': model,
+        'temperature': temperature,
+        'max_tokens': max_tokens,
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    """메모리 LRU + 디스크 2단계 스토리보드 캐시
+
+    메모리 계층은 항목 수(max_entries)와 TTL로 제거되며,
+    디스크 계층은 재시작 후에도 유지되고 조회 시 메모리로 다시 올라옵니다.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 86400,
+                 cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'stores': 0,
+        }
+
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError as e:
+                print(f"캐시 디렉터리 생성 실패, 디스크 캐시를 사용하지 않습니다: {e}")
+                self.cache_dir = None
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _put_memory(self, key: str, value: Dict, stored_at: float):
+        """메모리 계층에 저장합니다. 호출 시 lock을 잡고 있어야 합니다."""
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _read_disk(self, key: str) -> Optional[tuple]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"디스크 캐시 읽기 오류: {e}")
+            return None
+
+        stored_at = record.get('stored_at', 0)
+        if self._is_expired(stored_at):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            with self._lock:
+                self._stats['expirations'] += 1
+            return None
+        return stored_at, record.get('value')
+
+    def _write_disk(self, key: str, value: Dict, stored_at: float):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'stored_at': stored_at, 'value': value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"디스크 캐시 쓰기 오류: {e}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시된 스토리보드를 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self._is_expired(stored_at):
+                    self._entries.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+                self._stats['expirations'] += 1
+
+        record = self._read_disk(key)
+        with self._lock:
+            if record is None or record[1] is None:
+                self._stats['misses'] += 1
+                return None
+            stored_at, value = record
+            self._put_memory(key, value, stored_at)
+            self._stats['disk_hits'] += 1
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Dict):
+        """스토리보드를 메모리와 디스크에 저장합니다."""
+        stored_at = time.time()
+        with self._lock:
+            self._put_memory(key, copy.deepcopy(value), stored_at)
+            self._stats['stores'] += 1
+        self._write_disk(key, value, stored_at)
+
+    def stats(self) -> Dict[str, int]:
+        """히트/미스/제거 카운터와 현재 크기를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['hits'] = stats['memory_hits'] + stats['disk_hits']
+            stats['size'] = len(self._entries)
+            stats['max_entries'] = self.max_entries
+            stats['disk_enabled'] = self.cache_dir is not None
+            return stats
@@ -4,7 +4,31 @@
 """
 
 import os
-from typing import Optional
+from typing import List, Optional
+
+
+ENV_FILES = ['.env.local', '.env']
+
+
+def load_env_file(env_files: List[str] = None) -> Optional[str]:
+    """첫 번째로 찾은 환경변수 파일을 os.environ에 로드하고 그 경로를 반환합니다."""
+    for env_file in env_files or ENV_FILES:
+        if os.path.exists(env_file):
+            print(f"환경변수 파일 로드: {env_file}")
+            with open(env_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if '=' in line and not line.startswith('#'):
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value.strip('"\'')
+            return env_file  # 첫 번째로 찾은 파일만 로드
+    
+    print("환경변수 파일을 찾을 수 없습니다. (.env.local 또는 .env)")
+    return None
+
+
+# 아래 클래스 속성이 os.getenv로 설정을 읽기 전에 환경변수 파일을 로드합니다
+# (파일 하나를 읽는 비용뿐이며, .env에 둔 INSTATOON_* 설정도 적용됩니다)
+load_env_file()
 
 
 class Config:
@@ -14,6 +38,14 @@ class Config:
     GPT_MODEL = "gpt-4.1"
     GPT_MAX_TOKENS = 4000
     GPT_TEMPERATURE = 0.7
+    PAGE_REGEN_MAX_TOKENS = 700  # 단일 페이지 재생성 출력 예산
+    
+    # 출력 토큰 예산 (페이지 수 × 측정된 페이지당 토큰 수, 관측값으로 조정)
+    ADAPTIVE_TOKEN_BUDGET = os.getenv('INSTATOON_ADAPTIVE_TOKENS', '1').lower() in ('1', 'true', 'yes')
+    TOKEN_BUDGET_PER_PAGE = 300  # 관측 전 페이지당 토큰 수 초기값
+    TOKEN_BUDGET_MIN = 600
+    TOKEN_BUDGET_MAX = 6000
+    MAX_CONTINUATIONS = 2  # finish_reason == "length"일 때 이어쓰기 최대 횟수
     
     # 파일 설정
     DEFAULT_OUTPUT_FILENAME = "storyboard.json"
@@ -23,9 +55,84 @@ class Config:
     MAX_PAGES = 10
     RECOMMENDED_PAGES = (4, 8)
     
+    # 생성 결과 캐시 설정
+    CACHE_ENABLED = True
+    CACHE_MAX_ENTRIES = 256
+    CACHE_TTL_SECONDS = 24 * 60 * 60
+    CACHE_DIR = os.getenv('INSTATOON_CACHE_DIR', '.cache/storyboards')
+    
+    # 동일 요청 병합 (진행 중인 같은 입력의 생성 결과를 공유)
+    COALESCE_ENABLED = True
+    COALESCE_TIMEOUT_SECONDS = 5 * 60  # 병합된 요청의 최대 대기 시간
+    
+    # 생성 요청 수락 제어 (/api/generate, /api/generate/stream, /api/regenerate-page)
+    ADMISSION_ENABLED = os.getenv('INSTATOON_ADMISSION', '1').lower() in ('1', 'true', 'yes')
+    ADMISSION_MAX_IN_FLIGHT = 8  # 동시에 실행하는 생성 요청 수
+    ADMISSION_MAX_WAITING = 16  # 자리가 날 때까지 기다릴 수 있는 요청 수
+    ADMISSION_WAIT_SECONDS = 2.0  # 대기열에서 기다리는 최대 시간 (넘으면 429)
+    ADMISSION_RETRY_AFTER_SECONDS = 2  # 혼잡으로 거절할 때의 Retry-After
+    CLIENT_REQUESTS_PER_MINUTE = 10  # 클라이언트별 분당 생성 요청 수 (0이면 제한 없음)
+    CLIENT_BURST = 5  # 클라이언트별 순간 허용량
+    ADMISSION_MAX_CLIENTS = 10000  # 속도 제한 상태를 유지할 클라이언트 수
+    # 프록시 뒤에서 실행할 때 X-Forwarded-For의 첫 주소를 클라이언트로 사용
+    TRUST_FORWARDED_FOR = os.getenv('INSTATOON_TRUST_FORWARDED_FOR', '').lower() in ('1', 'true', 'yes')
+    
+    # 스토리보드 저장소 설정 (sqlite 또는 json)
+    STORAGE_BACKEND = os.getenv('INSTATOON_STORAGE_BACKEND', 'sqlite')
+    STORAGE_SQLITE_PATH = os.getenv('INSTATOON_STORAGE_DB', 'data/storyboards.db')
+    STORAGE_JSON_DIR = os.getenv('INSTATOON_STORAGE_DIR', '.')
+    STORAGE_PAGE_SIZE = 20
+    STORAGE_MAX_PAGE_SIZE = 100
+    
+    # 스토리보드 검색 색인 (저장할 때마다 갱신)
+    SEARCH_ENABLED = os.getenv('INSTATOON_SEARCH', '1').lower() not in ('0', 'false', 'no')
+    SEARCH_INDEX_PATH = os.getenv('INSTATOON_SEARCH_DB', 'data/search_index.db')
+    SEARCH_MAX_QUERY_LENGTH = 100
+    
+    # DOCX 렌더링 캐시 (렌더링된 문서 수)
+    DOCX_CACHE_MAX_ENTRIES = 64
+    
+    # 일괄 내보내기 최대 항목 수
+    EXPORT_MAX_ITEMS = 500
+    
+    # API 응답 gzip 압축 최소 크기 (바이트)
+    API_GZIP_MIN_BYTES = 1024
+    
+    # 비동기 작업 설정 (작업은 프로세스 메모리에 보관되므로 켜져 있으면 운영 서버가 워커 프로세스 1개로 실행됩니다)
+    JOBS_ENABLED = os.getenv('INSTATOON_JOBS', '1').lower() in ('1', 'true', 'yes')
+    JOB_WORKERS = 4
+    JOB_MAX_QUEUE = 100
+    JOB_RESULT_TTL_SECONDS = 60 * 60
+    JOB_DEFAULT_DEADLINE_SECONDS = 5 * 60
+    
+    # 배치 생성 설정
+    BATCH_CONCURRENCY = 4
+    BATCH_REQUESTS_PER_MINUTE = 60
+    BATCH_TOKENS_PER_MINUTE = 0
+    
+    # 시작 설정
+    # LAZY_INIT: 생성기와 GPT 클라이언트를 첫 사용 시 생성 (끄면 앱 임포트 시 생성)
+    # WARMUP_ON_START: 앱 시작 시 백그라운드에서 생성기를 만들고 API 연결을 미리 열어 둠
+    LAZY_INIT = os.getenv('INSTATOON_LAZY_INIT', '1').lower() in ('1', 'true', 'yes')
+    WARMUP_ON_START = os.getenv('INSTATOON_WARMUP', '').lower() in ('1', 'true', 'yes')
+    
+    # 운영 서버 설정 (python run.py serve)
+    SERVER_HOST = os.getenv('INSTATOON_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.getenv('PORT', '5000'))
+    # 워커 프로세스 수. 비동기 작업이나 수락 제어가 켜져 있으면 1개로 줄이고 스레드를 그만큼 늘립니다
+    SERVER_WORKERS = int(os.getenv('INSTATOON_WORKERS', '2'))
+    SERVER_THREADS = int(os.getenv('INSTATOON_THREADS', '16'))  # 워커당 요청 처리 스레드 수
+    SERVER_KEEPALIVE_SECONDS = 5  # keep-alive 연결에서 다음 요청을 기다리는 시간
+    SERVER_GRACEFUL_TIMEOUT = 120  # SIGTERM 후 진행 중인 생성이 끝나기를 기다리는 최대 시간
+    
     # 이미지 설정
     IMAGE_SIZE = 1080  # 1080x1080 px
     SAFE_ZONE_MARGIN = 120  # px
+    DIALOGUE_FONT_PX = 40  # 대사 글자 크기 (세이프 존 대사 길이 점수 기준)
+    DIALOGUE_MAX_LINES = 3  # 한 페이지 대사 최대 줄 수
+    
+    # 한 번의 요청으로 생성할 수 있는 최대 후보 수 (n)
+    MAX_CANDIDATES = 4
     
     @classmethod
     def get_openai_api_key(cls) -> Optional[str]:
@@ -34,22 +141,5 @@ class Config:
     
     @classmethod
     def load_from_env(cls, env_files: list = None):
-        """환경변수 파일에서 설정을 로드합니다."""
-        if env_files is None:
-            env_files = ['.env.local', '.env']
-        
-        for env_file in env_files:
-            if os.path.exists(env_file):
-                print(f"환경변수 파일 로드: {env_file}")
-                with open(env_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if '=' in line and not line.startswith('#'):
-                            key, value = line.strip().split('=', 1)
-                            os.environ[key] = value.strip('"\'')
-                return  # 첫 번째로 찾은 파일만 로드
-        
-        print("환경변수 파일을 찾을 수 없습니다. (.env.local 또는 .env)")
-
-
-# 환경변수 로드
-Config.load_from_env()
\ No newline at end of file
+        """환경변수 파일에서 설정을 다시 로드합니다 (클래스 속성은 임포트 시 값을 유지합니다)."""
+        load_env_file(env_files)
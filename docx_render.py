@@ -0,0 +1,158 @@
+"""
+DOCX 렌더링 모듈
+미리 스타일을 적용해 둔 기본 문서와 문단 원형을 한 번만 만들고,
+스토리보드마다 원형을 복사해 채운 DOCX 바이트를 내용 해시 기준으로 캐시합니다.
+"""
+
+import copy
+import io
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import metrics
+from storage import content_hash
+from storyboard_model import load_storyboard
+
+
+DOCX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+SEPARATOR = "-" * 50
+
+
+class _Skeleton:
+    """빈 기본 문서(바이트)와 스타일이 적용된 문단 원형"""
+
+    def __init__(self):
+        # python-docx는 임포트 비용이 커서 첫 DOCX 렌더링 때 불러옵니다
+        from docx import Document
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+        doc = Document()
+
+        # 스타일 조회(이름으로 전체 스타일 검색)는 원형을 만들 때 한 번만 수행합니다
+        title = doc.add_heading('', 0)
+        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        self.prototypes = {
+            'title': title._p,
+            'heading1': doc.add_heading('', level=1)._p,
+            'heading2': doc.add_heading('', level=2)._p,
+            'body': doc.add_paragraph()._p,
+        }
+        for element in self.prototypes.values():
+            element.getparent().remove(element)
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        self.document_bytes = buffer.getvalue()
+
+
+class DocxRenderer:
+    """스토리보드 → DOCX 바이트 변환기 (LRU 캐시 포함)
+
+    같은 내용의 스토리보드를 다시 내려받으면 렌더링 없이 캐시된 바이트를 반환합니다.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._skeleton: Optional[_Skeleton] = None
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _get_skeleton(self) -> _Skeleton:
+        if self._skeleton is None:
+            with self._lock:
+                if self._skeleton is None:
+                    self._skeleton = _Skeleton()
+        return self._skeleton
+
+    def render(self, storyboard: Dict) -> bytes:
+        """스토리보드를 DOCX 바이트로 변환합니다."""
+        key = content_hash(storyboard)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return cached
+            self._stats['misses'] += 1
+
+        data = self.render_uncached(storyboard)
+
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return data
+
+    @metrics.timed('docx')
+    def render_uncached(self, storyboard: Dict) -> bytes:
+        """캐시를 거치지 않고 스토리보드를 DOCX 바이트로 변환합니다."""
+        from docx import Document
+        from docx.text.paragraph import Paragraph
+
+        skeleton = self._get_skeleton()
+        doc = Document(io.BytesIO(skeleton.document_bytes))
+        body = doc.element.body
+        sect_pr = body.sectPr
+        prototypes = skeleton.prototypes
+
+        def add(kind: str) -> 'Paragraph':
+            element = copy.deepcopy(prototypes[kind])
+            sect_pr.addprevious(element)
+            return Paragraph(element, doc._body)
+
+        def add_text(kind: str, text: str):
+            add(kind).add_run(text)
+
+        def add_label(text: str):
+            add('body').add_run(text).bold = True
+
+        board = load_storyboard(storyboard)
+        add_text('title', board.title)
+
+        add_text('heading1', '📝 핵심 주제')
+        add_text('body', board.topic)
+
+        add_text('heading1', '🏷️ 해시태그')
+        add_text('body', " ".join(board.hashtags))
+
+        add_text('heading1', '📖 스토리보드')
+
+        pages = board.pages
+        for index, page in enumerate(pages):
+            add_text('heading2', f"페이지 {page.number}")
+
+            add_label("👥 등장인물: ")
+            add_text('body', ", ".join(page.characters))
+
+            add_label("🎬 배경: ")
+            add_text('body', page.background)
+
+            add_label("💬 대사: ")
+            dialogue_para = add('body')
+            for char, dialogue in page.dialogue.items():
+                dialogue_para.add_run(f"{char}: \"{dialogue}\"\n")
+
+            add_label("🎭 표정/포즈: ")
+            add_text('body', page.expression_pose)
+
+            # 페이지 구분선 (마지막 페이지가 아닌 경우)
+            if index < len(pages) - 1:
+                add_text('body', SEPARATOR)
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+    def stats(self) -> Dict[str, int]:
+        """히트/미스/제거 카운터와 현재 크기를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+            stats['bytes'] = sum(len(data) for data in self._entries.values())
+            stats['max_entries'] = self.max_entries
+            return stats
@@ -5,10 +5,25 @@ OpenAI API를 사용하여 GPT-4.1 모델과 통신합니다.
 
 import os
 import json
-import re
-from typing import Dict, Optional
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 import requests
-from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass, field
+import metrics
+from config import Config
+from json_stream import StoryboardStreamParser
+from json_repair import ExtractionResult, extract_json
+from storyboard_schema import (
+    PAGE_RESPONSE_FORMAT, STORYBOARD_RESPONSE_FORMAT, validate_page, validate_storyboard
+)
+from storyboard_model import normalize_page, normalize_storyboard
+from token_budget import TokenBudget
 
 
 @dataclass
@@ -19,56 +34,741 @@ class GPTConfig:
     base_url: str = "https://api.openai.com/v1"
     max_tokens: int = 4000
     temperature: float = 0.7
+    # JSON 스키마 기반 구조화 출력(response_format) 사용 여부
+    structured_output: bool = False
+    # 전송 계층 설정
+    pool_size: int = 10
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 20.0
+    # 업스트림 엔드포인트 목록 ({'base_url', 'api_key', 'weight'}). 비어 있으면 base_url 하나만 사용
+    endpoints: List[Dict] = field(default_factory=list)
+    # 최근 응답 시간의 이 백분위를 넘기면 다른 엔드포인트로 중복 요청 (0이면 사용 안 함)
+    hedge_percentile: float = 0.95
+    hedge_min_samples: int = 20
+    # 오류/속도 제한 응답을 보낸 엔드포인트를 제외하는 기본 시간 (연속 실패 시 두 배씩 증가)
+    eject_seconds: float = 30.0
 
 
-class GPTClient:
-    """GPT-4.1 모델과 통신하는 클라이언트"""
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 값(초 또는 HTTP 날짜)을 초 단위로 해석합니다."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_endpoints(spec: str, default_api_key: Optional[str] = None) -> List[Dict]:
+    """'base_url|api_key|weight' 항목을 쉼표로 구분한 문자열을 엔드포인트 목록으로 해석합니다.
+
+    api_key를 생략하면 default_api_key를, weight를 생략하면 1을 사용합니다.
+    """
+    endpoints = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        parts = [part.strip() for part in item.split('|')]
+        api_key = parts[1] if len(parts) > 1 and parts[1] else default_api_key
+        if not api_key:
+            raise ValueError(f"엔드포인트 API 키가 없습니다: {parts[0]}")
+        try:
+            weight = float(parts[2]) if len(parts) > 2 and parts[2] else 1.0
+        except ValueError:
+            raise ValueError(f"엔드포인트 가중치가 올바르지 않습니다: {item}")
+        if weight <= 0:
+            raise ValueError(f"엔드포인트 가중치는 0보다 커야 합니다: {item}")
+        endpoints.append({'base_url': parts[0], 'api_key': api_key, 'weight': weight})
+    return endpoints
+
+
+def backoff_delay(attempt: int, base: float, maximum: float,
+                  retry_after: Optional[float] = None) -> float:
+    """재시도 전 대기 시간을 계산합니다 (full jitter, Retry-After 우선)."""
+    if retry_after is not None:
+        return min(retry_after, maximum)
+    ceiling = min(maximum, base * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+class PooledTransport:
+    """base_url 단위로 keep-alive 연결을 재사용하는 HTTP 전송 계층
+
+    429/5xx 응답과 연결 오류는 지터가 적용된 지수 백오프로 재시도하며,
+    서버가 Retry-After 헤더를 보내면 그 값을 우선합니다.
+    """
+
+    RETRY_STATUS_CODES = RETRY_STATUS_CODES
+
+    def __init__(self, base_url: str, pool_size: int = 10,
+                 connect_timeout: float = 10.0, read_timeout: float = 60.0,
+                 max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 20.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                                   max_retries=0, pool_block=False)
+        self.session.mount(self.base_url, self.adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+
+    @classmethod
+    def from_config(cls, config: 'GPTConfig') -> 'PooledTransport':
+        """GPTConfig 값으로 전송 계층을 생성합니다."""
+        return cls(
+            config.base_url,
+            pool_size=config.pool_size,
+            connect_timeout=config.connect_timeout,
+            read_timeout=config.read_timeout,
+            max_retries=config.max_retries,
+            backoff_base=config.backoff_base,
+            backoff_max=config.backoff_max,
+        )
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        return backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        """POST 요청을 보내고, 재시도 가능한 실패는 백오프 후 다시 시도합니다.
+
+        마지막 시도까지 실패하면 마지막 응답을 반환하거나 마지막 예외를 다시 발생시킵니다.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                self._requests += 1
+            is_last = attempt == self.max_retries
+            try:
+                response = self.session.post(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                metrics.record_upstream_status('error')
+                if is_last:
+                    raise
+                delay = self._backoff_delay(attempt)
+                print(f"연결 오류, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {e}")
+            else:
+                metrics.record_upstream_status(response.status_code)
+                if response.status_code not in self.RETRY_STATUS_CODES or is_last:
+                    return response
+                delay = self._backoff_delay(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                print(f"API 오류 {response.status_code}, {delay:.2f}초 후 재시도 "
+                      f"({attempt + 1}/{self.max_retries})")
+                response.close()
+
+            with self._lock:
+                self._retries += 1
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, int]:
+        """요청 수와 연결 재사용/신규 연결 수를 반환합니다."""
+        opened = 0
+        pooled_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            pooled_requests += pool.num_requests
+
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'retries': self._retries,
+                'connections_opened': opened,
+                'connections_reused': max(0, pooled_requests - opened),
+            }
+
+    def warmup(self, path: str, headers: Optional[Dict[str, str]] = None) -> bool:
+        """가벼운 GET 요청으로 연결(TCP/TLS)을 미리 열어 풀에 남겨 둡니다. 재시도하지 않습니다."""
+        try:
+            response = self.session.get(f"{self.base_url}{path}", headers=headers, timeout=self.timeout)
+            response.close()
+            return True
+        except requests.exceptions.RequestException as e:
+            print(f"연결 예열 실패: {e}")
+            return False
+
+    def close(self):
+        """세션과 연결 풀을 닫습니다."""
+        self.session.close()
+
+
+class Endpoint:
+    """업스트림 엔드포인트 하나의 전송 계층, 진행 중인 요청 수와 제외 상태"""
+
+    def __init__(self, base_url: str, api_key: str, weight: float, transport: PooledTransport):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.weight = weight
+        self.transport = transport
+        self.outstanding = 0
+        self.ejected_until = 0.0
+        self.consecutive_failures = 0
+        self.stats = {'requests': 0, 'failures': 0, 'ejections': 0}
+
+
+class EndpointPool:
+    """여러 업스트림 엔드포인트(주소/API 키)에 요청을 나눠 보내는 전송 계층
+
+    - 가중치로 나눈 진행 중인 요청 수가 가장 적은 엔드포인트를 고릅니다.
+    - 비스트리밍 요청이 최근 응답 시간의 hedge_percentile 백분위를 넘기면 다른 엔드포인트로
+      같은 요청을 한 번 더 보내고, 먼저 도착한 응답을 사용합니다. 늦은 쪽은 응답 헤더가
+      도착하는 즉시 본문을 읽지 않고 연결을 닫습니다.
+    - 연결 오류나 429/5xx를 보낸 엔드포인트는 eject_seconds 동안(Retry-After가 있으면 그 시간)
+      선택에서 제외하고 다른 엔드포인트로 바로 다시 시도합니다.
+
+    PooledTransport와 같은 post/stats/warmup/close 인터페이스를 제공하며,
+    Authorization 헤더는 선택된 엔드포인트의 API 키로 바꿔 보냅니다.
+    """
+
+    RETRY_STATUS_CODES = RETRY_STATUS_CODES
+    LATENCY_WINDOW = 200
+    MAX_EJECT_SECONDS = 300.0
+
+    def __init__(self, endpoints: List[Endpoint], max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 20.0, hedge_percentile: float = 0.95, hedge_min_samples: int = 20,
+                 eject_seconds: float = 30.0, max_workers: int = 32):
+        if not endpoints:
+            raise ValueError("엔드포인트가 하나 이상 필요합니다.")
+        self.endpoints = endpoints
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.eject_seconds = eject_seconds
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._stats = {'requests': 0, 'retries': 0, 'hedged': 0, 'hedge_wins': 0}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upstream')
+
+    @classmethod
+    def from_config(cls, config: 'GPTConfig') -> 'EndpointPool':
+        """GPTConfig의 endpoints 목록으로 엔드포인트별 전송 계층을 만듭니다.
+
+        재시도는 풀에서 엔드포인트를 바꿔 가며 하므로 개별 전송 계층은 재시도하지 않습니다.
+        """
+        endpoints = [
+            Endpoint(spec['base_url'], spec['api_key'], float(spec.get('weight', 1.0)), PooledTransport(
+                spec['base_url'],
+                pool_size=config.pool_size,
+                connect_timeout=config.connect_timeout,
+                read_timeout=config.read_timeout,
+                max_retries=0,
+            ))
+            for spec in config.endpoints
+        ]
+        return cls(
+            endpoints,
+            max_retries=config.max_retries,
+            backoff_base=config.backoff_base,
+            backoff_max=config.backoff_max,
+            hedge_percentile=config.hedge_percentile,
+            hedge_min_samples=config.hedge_min_samples,
+            eject_seconds=config.eject_seconds,
+            # 엔드포인트마다 원 요청과 중복 요청이 동시에 연결을 쓸 수 있습니다
+            max_workers=2 * config.pool_size * len(endpoints),
+        )
+
+    def _select(self, exclude: Tuple[Endpoint, ...] = ()) -> Optional[Endpoint]:
+        """제외되지 않은 엔드포인트 중 (진행 중인 요청 + 1) / 가중치가 가장 작은 것을 고릅니다.
+
+        모두 제외된 상태면 제외가 가장 먼저 끝나는 엔드포인트를 고르고,
+        exclude를 빼면 남는 엔드포인트가 없으면 None을 반환합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+            if not candidates:
+                return None
+            healthy = [endpoint for endpoint in candidates if endpoint.ejected_until <= now]
+            if not healthy:
+                return min(candidates, key=lambda endpoint: endpoint.ejected_until)
+            return min(healthy, key=lambda endpoint: ((endpoint.outstanding + 1) / endpoint.weight,
+                                                      random.random()))
+
+    def _healthy_count(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for endpoint in self.endpoints if endpoint.ejected_until <= now)
+
+    def _eject(self, endpoint: Endpoint, retry_after: Optional[float] = None):
+        with self._lock:
+            endpoint.consecutive_failures += 1
+            endpoint.stats['failures'] += 1
+            endpoint.stats['ejections'] += 1
+            duration = retry_after
+            if not duration:
+                duration = self.eject_seconds * (2 ** min(endpoint.consecutive_failures - 1, 4))
+            duration = min(duration, self.MAX_EJECT_SECONDS)
+            endpoint.ejected_until = max(endpoint.ejected_until, time.monotonic() + duration)
+        metrics.ENDPOINT_EJECTIONS.inc(endpoint=endpoint.base_url)
+        print(f"업스트림 {endpoint.base_url}을(를) {duration:.1f}초 동안 제외합니다.")
+
+    def hedge_delay(self) -> Optional[float]:
+        """중복 요청을 보내기 전 기다릴 시간(최근 응답 시간의 백분위)을 반환합니다.
+
+        사용하지 않거나 측정값이 부족하면 None을 반환합니다.
+        """
+        if not self.hedge_percentile or len(self.endpoints) < 2:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            samples = sorted(self._latencies)
+        index = min(len(samples) - 1, int(self.hedge_percentile * len(samples)))
+        return samples[index]
+
+    def _send(self, endpoint: Endpoint, url_path: str, kwargs: Dict,
+              cancelled: Optional[threading.Event] = None) -> requests.Response:
+        """엔드포인트 하나에 요청을 보내고 응답 시간과 상태를 기록합니다.
+
+        cancelled가 이미 설정된 뒤 응답이 도착하면 본문을 읽지 않고 닫습니다.
+        """
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers['Authorization'] = f'Bearer {endpoint.api_key}'
+        with self._lock:
+            endpoint.outstanding += 1
+            endpoint.stats['requests'] += 1
+        started = time.perf_counter()
+        try:
+            response = endpoint.transport.post(url_path, headers=headers, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self._eject(endpoint)
+            raise
+        finally:
+            with self._lock:
+                endpoint.outstanding -= 1
+
+        if response.status_code in self.RETRY_STATUS_CODES:
+            self._eject(endpoint, parse_retry_after(response.headers.get('Retry-After')))
+        else:
+            with self._lock:
+                endpoint.consecutive_failures = 0
+                if response.status_code == 200:
+                    self._latencies.append(time.perf_counter() - started)
+        if cancelled is not None and cancelled.is_set():
+            response.close()
+        return response
+
+    def _send_hedged(self, endpoint: Endpoint, url_path: str, kwargs: Dict,
+                     delay: float) -> Tuple[Endpoint, requests.Response]:
+        """delay 안에 응답이 없으면 다른 엔드포인트로 같은 요청을 보내고 먼저 성공한 응답을 반환합니다."""
+        # 늦게 도착한 쪽의 본문을 읽지 않고 닫을 수 있도록 스트림으로 받습니다
+        kwargs = dict(kwargs, stream=True)
+        cancelled = threading.Event()
+        futures = {self._executor.submit(self._send, endpoint, url_path, dict(kwargs), cancelled): endpoint}
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            backup = self._select(exclude=(endpoint,))
+            if backup is not None:
+                with self._lock:
+                    self._stats['hedged'] += 1
+                metrics.HEDGED_REQUESTS.inc(outcome='sent')
+                futures[self._executor.submit(self._send, backup, url_path, dict(kwargs), cancelled)] = backup
+
+        pending = set(futures)
+        last_error = None
+        last_endpoint, last_response = endpoint, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.exceptions.RequestException as e:
+                    last_error = e
+                    continue
+                if response.status_code in self.RETRY_STATUS_CODES and pending:
+                    response.close()
+                    continue
+                if last_response is not None:
+                    last_response.close()
+                last_endpoint, last_response = futures[future], response
+                if response.status_code not in self.RETRY_STATUS_CODES:
+                    cancelled.set()
+                    for other in pending:
+                        other.cancel()
+                    if futures[future] is not endpoint:
+                        with self._lock:
+                            self._stats['hedge_wins'] += 1
+                        metrics.HEDGED_REQUESTS.inc(outcome='won')
+                    # 본문을 지금 읽어 두어 호출한 쪽에서는 일반 응답처럼 사용할 수 있게 합니다
+                    response.content
+                    return futures[future], response
+        if last_response is not None:
+            last_response.content
+            return last_endpoint, last_response
+        raise last_error
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        """선택된 엔드포인트로 POST 요청을 보냅니다.
+
+        실패하면 다른 엔드포인트로 다시 시도하며, 건강한 엔드포인트가 없을 때만 백오프합니다.
+        마지막 시도까지 실패하면 마지막 응답을 반환하거나 마지막 예외를 다시 발생시킵니다.
+        """
+        stream = kwargs.get('stream', False)
+        tried: Tuple[Endpoint, ...] = ()
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                self._stats['requests'] += 1
+            is_last = attempt == self.max_retries
+            endpoint = self._select(exclude=tried) or self._select()
+            delay = None if stream else self.hedge_delay()
+            try:
+                if delay is not None and self._healthy_count() > 1:
+                    endpoint, response = self._send_hedged(endpoint, path, kwargs, delay)
+                else:
+                    response = self._send(endpoint, path, dict(kwargs))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if is_last:
+                    raise
+                print(f"업스트림 {endpoint.base_url} 연결 오류, 다른 엔드포인트로 재시도 "
+                      f"({attempt + 1}/{self.max_retries}): {e}")
+            else:
+                if response.status_code not in self.RETRY_STATUS_CODES or is_last:
+                    return response
+                print(f"업스트림 {endpoint.base_url} API 오류 {response.status_code}, 다른 엔드포인트로 재시도 "
+                      f"({attempt + 1}/{self.max_retries})")
+                response.close()
+
+            tried += (endpoint,)
+            with self._lock:
+                self._stats['retries'] += 1
+            if self._healthy_count() == 0:
+                time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+
+    def stats(self) -> Dict:
+        """풀 전체 요청/재시도/중복 요청 수와 엔드포인트별 상태를 반환합니다 (API 키는 포함하지 않음)."""
+        now = time.monotonic()
+        delay = self.hedge_delay()
+        with self._lock:
+            stats = dict(self._stats)
+            stats['hedge_delay_ms'] = round(delay * 1000, 1) if delay is not None else None
+            stats['endpoints'] = [
+                dict(endpoint.stats,
+                     base_url=endpoint.base_url,
+                     weight=endpoint.weight,
+                     outstanding=endpoint.outstanding,
+                     ejected_for=round(max(0.0, endpoint.ejected_until - now), 1))
+                for endpoint in self.endpoints
+            ]
+        return stats
+
+    def warmup(self, path: str, headers: Optional[Dict[str, str]] = None) -> bool:
+        """모든 엔드포인트의 연결을 미리 열어 둡니다. 하나라도 성공하면 True를 반환합니다."""
+        results = []
+        for endpoint in self.endpoints:
+            endpoint_headers = dict(headers or {})
+            endpoint_headers['Authorization'] = f'Bearer {endpoint.api_key}'
+            results.append(endpoint.transport.warmup(path, headers=endpoint_headers))
+        return any(results)
+
+    def close(self):
+        """모든 엔드포인트의 연결 풀과 요청 스레드를 닫습니다."""
+        self._executor.shutdown(wait=False)
+        for endpoint in self.endpoints:
+            endpoint.transport.close()
+
+
+class GPTClientBase:
+    """동기/비동기 GPT 클라이언트가 공유하는 설정, 출력 토큰 예산, 프롬프트 구성, JSON 추출 로직"""
+    
+    REQUIRED_FIELDS = ('wholeTitle', 'storyTopic', 'hashtags', 'pages')
+    PAGE_FIELDS = ('character', 'background', 'dialogue', 'expressionPose')
+    SYSTEM_PROMPT = '당신은 인스타툰 스토리보드 전문가입니다. 주어진 요구사항에 따라 정확한 JSON 형식의 스토리보드를 생성해주세요. 응답은 반드시 유효한 JSON 형식으로만 제공해주세요.'
+    CONTINUE_PROMPT = '응답이 길이 제한으로 끊겼습니다. 끊긴 지점의 바로 다음 문자부터 이어서 나머지 JSON만 출력하십시오. 이미 작성한 부분을 반복하거나 코드 블록 표시를 추가하지 마십시오.'
+    # 이어쓰기 응답 앞부분이 이전 응답 끝과 겹칠 때 제거할 최소 길이 (짧은 우연한 일치는 무시)
+    MIN_CONTINUATION_OVERLAP = 8
     
     def __init__(self, config: Optional[GPTConfig] = None):
         if config:
             self.config = config
         else:
-            # 환경변수에서 API 키 로드
+            # 환경변수에서 API 키 로드 (.env 파일은 config 임포트 시 로드됩니다)
             api_key = os.getenv('OPENAI_API_KEY')
-            if not api_key:
+            # 여러 엔드포인트: OPENAI_ENDPOINTS="주소|키|가중치,주소|키|가중치" (키 생략 시 OPENAI_API_KEY)
+            endpoints = parse_endpoints(os.getenv('OPENAI_ENDPOINTS', ''), api_key)
+            if not api_key and not endpoints:
                 raise ValueError("OPENAI_API_KEY 환경변수를 설정해주세요.")
             
-            self.config = GPTConfig(api_key=api_key)
+            structured = os.getenv('GPT_STRUCTURED_OUTPUT', '').lower() in ('1', 'true', 'yes')
+            self.config = GPTConfig(api_key=api_key, structured_output=structured, endpoints=endpoints)
+            hedge_percentile = os.getenv('OPENAI_HEDGE_PERCENTILE')
+            if hedge_percentile:
+                self.config.hedge_percentile = float(hedge_percentile)
+            if endpoints:
+                # 단일 주소/키도 첫 엔드포인트로 맞춰, 엔드포인트의 키가 기본 주소로 전송되지 않게 합니다
+                self.config.base_url = endpoints[0]['base_url']
+                self.config.api_key = endpoints[0]['api_key']
+            else:
+                # 프록시나 로컬 모의 서버를 사용할 때 API 주소를 바꿀 수 있습니다
+                base_url = os.getenv('OPENAI_BASE_URL')
+                if base_url:
+                    self.config.base_url = base_url
+        
+        self.token_budget = None
+        if Config.ADAPTIVE_TOKEN_BUDGET:
+            self.token_budget = TokenBudget(
+                per_page_tokens=Config.TOKEN_BUDGET_PER_PAGE,
+                min_tokens=Config.TOKEN_BUDGET_MIN,
+                max_tokens=Config.TOKEN_BUDGET_MAX
+            )
     
-    def _make_request(self, prompt: str) -> Optional[str]:
-        """GPT API에 요청을 보냅니다."""
-        headers = {
+    def _budget_for(self, pages: Optional[int]) -> Optional[int]:
+        """페이지 수에 맞는 max_tokens를 반환합니다. 알 수 없으면 None(설정값 사용)을 반환합니다."""
+        return self.token_budget.budget(pages) if self.token_budget else None
+    
+    def _observe_usage(self, pages: Optional[int], completion_tokens: Optional[int],
+                       truncated: bool, finish_reason: Optional[str]):
+        """최종 응답의 토큰 사용량으로 예산 추정치를 갱신합니다."""
+        if not self.token_budget:
+            return
+        if truncated:
+            self.token_budget.observe(pages, None, truncated=True)
+        if finish_reason == 'stop':
+            self.token_budget.observe(pages, completion_tokens)
+    
+    def get_token_budget_stats(self) -> Optional[Dict]:
+        """출력 토큰 예산 추정치를 반환합니다. 적응형 예산을 사용하지 않으면 None을 반환합니다."""
+        return self.token_budget.stats() if self.token_budget else None
+    
+    def _headers(self) -> Dict[str, str]:
+        """API 요청 헤더를 생성합니다."""
+        return {
             'Authorization': f'Bearer {self.config.api_key}',
             'Content-Type': 'application/json'
         }
+    
+    def _build_payload(self, prompt: str, stream: bool = False, max_tokens: Optional[int] = None,
+                       response_format: Optional[Dict] = None, partial: Optional[str] = None,
+                       n: int = 1) -> Dict:
+        """chat/completions 요청 본문을 생성합니다. max_tokens를 주면 설정값 대신 사용합니다.
         
+        partial을 주면 잘린 이전 응답을 assistant 메시지로 넣고 이어서 작성하도록 요청합니다.
+        n이 1보다 크면 한 번의 요청으로 n개의 응답(choices)을 받습니다.
+        """
         data = {
             'model': self.config.model,
             'messages': [
                 {
                     'role': 'system',
-                    'content': '당신은 인스타툰 스토리보드 전문가입니다. 주어진 요구사항에 따라 정확한 JSON 형식의 스토리보드를 생성해주세요. 응답은 반드시 유효한 JSON 형식으로만 제공해주세요.'
+                    'content': self.SYSTEM_PROMPT
                 },
                 {
                     'role': 'user',
                     'content': prompt
                 }
             ],
-            'max_tokens': self.config.max_tokens,
+            'max_tokens': max_tokens or self.config.max_tokens,
             'temperature': self.config.temperature
         }
+        if partial:
+            data['messages'] += [
+                {'role': 'assistant', 'content': partial},
+                {'role': 'user', 'content': self.CONTINUE_PROMPT}
+            ]
+        if n > 1:
+            data['n'] = n
+        if stream:
+            data['stream'] = True
+            data['stream_options'] = {'include_usage': True}
+        if response_format:
+            data['response_format'] = response_format
+        return data
+    
+    @classmethod
+    def _continuation_suffix(cls, partial: str, continuation: str) -> str:
+        """이어쓰기 응답에서 이전 응답 뒤에 붙일 부분을 반환합니다.
+        
+        모델이 코드 블록 표시를 다시 열거나 끊긴 지점 앞부분을 반복한 경우 그 부분을 제거합니다.
+        """
+        text = continuation
+        stripped = text.lstrip()
+        if stripped.startswith('```'):
+            newline = stripped.find('\n')
+            text = stripped[newline + 1:] if newline != -1 else ''
+        
+        longest = min(len(partial), len(text), 400)
+        for size in range(longest, cls.MIN_CONTINUATION_OVERLAP - 1, -1):
+            if partial.endswith(text[:size]):
+                return text[size:]
+        return text
+    
+    @staticmethod
+    def _remaining_pages(partial: str, pages: Optional[int]) -> Optional[int]:
+        """잘린 응답에서 아직 완성되지 않은 페이지 수를 추정합니다 (마지막 필드 개수 기준)."""
+        if not pages:
+            return None
+        return max(1, pages - partial.count('"expressionPose"'))
+    
+    def _extract_json_from_response(self, response: str) -> ExtractionResult:
+        """응답에서 JSON을 추출하고, 필요한 경우 같은 패스에서 형식 오류를 수정합니다."""
+        with metrics.timed('json_extract'):
+            extraction = extract_json(response)
+        metrics.record_extraction(extraction)
+        return extraction
+    
+    def _parse_storyboard_response(self, response: str) -> Optional[Dict]:
+        """GPT 응답 텍스트에서 스토리보드 JSON을 추출하고 검증합니다."""
+        # JSON 추출 및 수정 (한 번의 스캔)
+        extraction = self._extract_json_from_response(response)
+        json_str = extraction.json_str
+        
+        if not json_str:
+            print("응답에서 JSON을 찾을 수 없습니다.")
+            print(f"원본 응답 (처음 500자): {response[:500]}...")
+            return None
+        
+        if extraction.repairs:
+            print(f"JSON 형식 수정 적용: {', '.join(extraction.repairs)}")
+        
+        # 추출 과정에서 이미 파싱된 값을 사용합니다
+        storyboard = extraction.value
+        if not isinstance(storyboard, dict):
+            print("JSON 파싱 오류: 수정 후에도 유효한 JSON 객체가 아닙니다.")
+            print(f"파싱 시도한 JSON (처음 1000자):")
+            print(json_str[:1000])
+            print("..." if len(json_str) > 1000 else "")
+            return None
+        
+        print("JSON 파싱 성공!")
+        
+        return self._normalize_storyboard(storyboard)
+    
+    def _normalize_storyboard(self, storyboard) -> Optional[Dict]:
+        """필드 형식 차이(문자열 페이지 번호, "이름: 대사" 목록 등)를 다시 생성하지 않고 고친 뒤 스키마로 검증합니다."""
+        normalization = normalize_storyboard(storyboard)
+        metrics.record_normalization(normalization)
+        
+        if normalization.storyboard is None:
+            print("스토리보드 형식이 올바르지 않습니다: 사용할 수 있는 페이지가 없습니다.")
+            return None
+        if normalization.repairs:
+            print(f"스토리보드 형식 수정 적용: {', '.join(normalization.repairs)}")
+        if normalization.dropped:
+            print(f"복구할 수 없는 페이지를 제외했습니다: {[index + 1 for index in normalization.dropped]}")
+        
+        # 필수 필드 및 페이지별 필드 형식 검증
+        errors = validate_storyboard(normalization.storyboard)
+        
+        if errors:
+            print(f"스토리보드 형식이 올바르지 않습니다: {errors[:5]}")
+            return None
         
+        return normalization.storyboard
+    
+    def _parse_structured_response(self, response: str) -> Optional[Dict]:
+        """구조화 출력(response_format) 응답을 추출·수정 없이 바로 파싱하고 정규화·검증합니다."""
         try:
-            response = requests.post(
-                f"{self.config.base_url}/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=60
-            )
+            value = json.loads(response)
+        except json.JSONDecodeError as e:
+            print(f"구조화 출력 파싱 실패, 추출/수정 경로로 전환합니다: {e}")
+            return None
+        
+        return self._normalize_storyboard(value)
+    
+    def _parse_page_response(self, response: str) -> Optional[Dict]:
+        """GPT 응답 텍스트에서 단일 페이지 JSON 객체를 추출하고 검증합니다."""
+        extraction = self._extract_json_from_response(response)
+        page = extraction.value
+        
+        if extraction.repairs:
+            print(f"JSON 형식 수정 적용: {', '.join(extraction.repairs)}")
+        
+        # {"page": {...}} 처럼 한 번 감싸서 응답한 경우
+        if isinstance(page, dict) and isinstance(page.get('page'), dict):
+            page = page['page']
+        
+        if not isinstance(page, dict):
+            print("응답에서 페이지 JSON을 찾을 수 없습니다.")
+            return None
+        
+        # 필드 형식 차이는 고치고, 내용이 없는 페이지만 거절합니다
+        page, repairs = normalize_page(page)
+        if page is None:
+            print("페이지 내용(배경, 대사, 표정/포즈)이 비어 있어 사용할 수 없습니다.")
+            return None
+        if repairs:
+            print(f"페이지 형식 수정 적용: {', '.join(repairs)}")
+        
+        # page 번호는 호출한 쪽에서 다시 지정하므로 검증에서 제외합니다
+        errors = [error for error in validate_page(page) if not error.startswith('$.page')]
+        if errors:
+            print(f"페이지 형식이 올바르지 않습니다: {errors[:5]}")
+            return None
+        
+        return page
+
+
+class GPTClient(GPTClientBase):
+    """GPT-4.1 모델과 통신하는 클라이언트"""
+    
+    def __init__(self, config: Optional[GPTConfig] = None):
+        super().__init__(config)
+        if self.config.endpoints:
+            self.transport = EndpointPool.from_config(self.config)
+        else:
+            self.transport = PooledTransport.from_config(self.config)
+    
+    def _make_request(self, prompt: str, max_tokens: Optional[int] = None,
+                      response_format: Optional[Dict] = None) -> Optional[str]:
+        """GPT API에 요청을 보냅니다."""
+        completion = self._complete(prompt, max_tokens=max_tokens, response_format=response_format)
+        return completion[0] if completion else None
+    
+    def _complete(self, prompt: str, max_tokens: Optional[int] = None, response_format: Optional[Dict] = None,
+                  partial: Optional[str] = None) -> Optional[Tuple[str, Optional[str], Optional[Dict]]]:
+        """GPT API에 요청을 보내고 (응답 텍스트, finish_reason, usage)를 반환합니다."""
+        result = self._request_completion(self._build_payload(
+            prompt, max_tokens=max_tokens, response_format=response_format, partial=partial
+        ))
+        if not result:
+            return None
+        try:
+            choice = result['choices'][0]
+            return choice['message']['content'], choice.get('finish_reason'), result.get('usage')
+        except (KeyError, IndexError, TypeError) as e:
+            print(f"예상치 못한 응답 형식: {e}")
+            return None
+    
+    def _request_completion(self, data: Dict) -> Optional[Dict]:
+        """chat/completions 요청을 보내고 응답 JSON을 반환합니다. 실패하면 None을 반환합니다."""
+        headers = self._headers()
+        
+        try:
+            with metrics.timed('upstream'):
+                response = self.transport.post(
+                    "chat/completions",
+                    headers=headers,
+                    json=data
+                )
             
             if response.status_code == 200:
                 result = response.json()
-                return result['choices'][0]['message']['content']
+                metrics.record_usage(result.get('usage'))
+                return result
             else:
                 print(f"API 오류: {response.status_code} - {response.text}")
                 return None
@@ -80,118 +780,267 @@ class GPTClient:
             print(f"예상치 못한 오류: {e}")
             return None
     
-    def _extract_json_from_response(self, response: str) -> Optional[str]:
-        """응답에서 JSON을 추출합니다."""
-        if not response:
+    def _continue_truncated(self, prompt: str, text: str,
+                            pages: Optional[int]) -> Iterator[Tuple[str, Optional[str], Optional[Dict]]]:
+        """길이 제한으로 잘린 응답을 이어서 생성하고, (붙일 조각, finish_reason, usage)를 순서대로 반환합니다.
+        
+        처음부터 다시 생성하지 않고 잘린 텍스트를 assistant 메시지로 보내 나머지만 받습니다.
+        """
+        for attempt in range(Config.MAX_CONTINUATIONS):
+            metrics.CONTINUATIONS.inc()
+            print(f"응답이 길이 제한으로 잘려 이어서 생성합니다 ({attempt + 1}/{Config.MAX_CONTINUATIONS})")
+            completion = self._complete(
+                prompt,
+                max_tokens=self._budget_for(self._remaining_pages(text, pages)),
+                partial=text
+            )
+            if not completion:
+                return
+            continuation, finish_reason, usage = completion
+            suffix = self._continuation_suffix(text, continuation)
+            text += suffix
+            yield suffix, finish_reason, usage
+            if finish_reason != 'length':
+                return
+    
+    def _complete_with_continuation(self, prompt: str, pages: Optional[int],
+                                    response_format: Optional[Dict] = None) -> Optional[str]:
+        """페이지 수에 맞는 예산으로 요청하고, 잘린 응답은 이어쓰기로 완성한 텍스트를 반환합니다."""
+        completion = self._complete(prompt, max_tokens=self._budget_for(pages), response_format=response_format)
+        if not completion:
             return None
+        text, finish_reason, usage = completion
+        completion_tokens = (usage or {}).get('completion_tokens')
+        truncated = finish_reason == 'length'
+        
+        if truncated:
+            metrics.TRUNCATED_RESPONSES.inc()
+            for suffix, finish_reason, usage in self._continue_truncated(prompt, text, pages):
+                text += suffix
+                tokens = (usage or {}).get('completion_tokens')
+                if isinstance(completion_tokens, int) and isinstance(tokens, int):
+                    completion_tokens += tokens
+        
+        self._observe_usage(pages, completion_tokens, truncated, finish_reason)
+        return text
+    
+    def generate_storyboard(self, prompt: str, pages: Optional[int] = None) -> Optional[Dict]:
+        """스토리보드를 생성합니다.
         
-        # 방법 1: ```json 코드 블록에서 추출
-        json_block_pattern = r'```json\s*(.*?)\s*```'
-        match = re.search(json_block_pattern, response, re.DOTALL | re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+        pages를 주면 페이지 수에 맞춘 출력 토큰 예산을 사용하고, 응답이 잘리면 이어서 생성합니다.
+        구조화 출력 모드에서는 스키마로 바로 검증하고, 실패한 경우에만 같은 응답을
+        추출/수정 경로로 처리합니다. 모드 자체가 거부되면 일반 요청으로 다시 시도합니다.
+        """
+        print(f"GPT-{self.config.model} 모델로 스토리보드 생성 중...")
         
-        # 방법 2: ``` 코드 블록에서 추출 (json 키워드 없이)
-        code_block_pattern = r'```\s*(.*?)\s*```'
-        match = re.search(code_block_pattern, response, re.DOTALL)
-        if match:
-            potential_json = match.group(1).strip()
-            if potential_json.startswith('{') and potential_json.endswith('}'):
-                return potential_json
+        if self.config.structured_output:
+            response = self._complete_with_continuation(prompt, pages, response_format=STORYBOARD_RESPONSE_FORMAT)
+            if response:
+                storyboard = self._parse_structured_response(response)
+                if storyboard is not None:
+                    print("구조화 출력 검증 성공!")
+                    return storyboard
+                return self._parse_storyboard_response(response)
+            print("구조화 출력 요청이 실패하여 일반 요청으로 다시 시도합니다.")
         
-        # 방법 3: 첫 번째와 마지막 중괄호 사이의 내용 추출
-        first_brace = response.find('{')
-        last_brace = response.rfind('}')
+        response = self._complete_with_continuation(prompt, pages)
         
-        if first_brace != -1 and last_brace != -1 and first_brace < last_brace:
-            return response[first_brace:last_brace + 1]
+        if not response:
+            print("GPT API로부터 응답을 받지 못했습니다.")
+            return None
         
-        # 방법 4: 전체 응답이 JSON인지 확인
-        response_stripped = response.strip()
-        if response_stripped.startswith('{') and response_stripped.endswith('}'):
-            return response_stripped
+        print(f"GPT 응답 길이: {len(response)} 문자")
         
-        return None
+        return self._parse_storyboard_response(response)
     
-    def _clean_json_string(self, json_str: str) -> str:
-        """JSON 문자열을 정리합니다."""
-        if not json_str:
-            return json_str
+    def _parse_candidate(self, response: str) -> Optional[Dict]:
+        """후보 응답 하나를 generate_storyboard와 같은 경로(구조화 출력 → 추출/수정)로 파싱합니다."""
+        if self.config.structured_output:
+            storyboard = self._parse_structured_response(response)
+            if storyboard is not None:
+                return storyboard
+        return self._parse_storyboard_response(response)
+    
+    def generate_candidates(self, prompt: str, n: int, pages: Optional[int] = None) -> List[Dict]:
+        """한 번의 요청(n개 choices)으로 스토리보드 후보를 만들고, 검증을 통과한 후보를 응답 순서대로 반환합니다.
+        
+        길이 제한으로 잘린 후보는 건너뛰며, 모든 후보가 잘렸으면 첫 후보만 이어쓰기로 완성합니다.
+        """
+        print(f"GPT-{self.config.model} 모델로 스토리보드 후보 {n}개 생성 중...")
+        
+        response_format = STORYBOARD_RESPONSE_FORMAT if self.config.structured_output else None
+        result = self._request_completion(self._build_payload(
+            prompt, max_tokens=self._budget_for(pages), response_format=response_format, n=n
+        ))
+        if not result:
+            print("GPT API로부터 응답을 받지 못했습니다.")
+            return []
         
-        # 불필요한 공백 및 제어 문자 제거
-        json_str = json_str.strip()
+        choices = result.get('choices') or []
+        candidates = []
+        truncated = []
+        for choice in choices:
+            text = (choice.get('message') or {}).get('content') or ''
+            if choice.get('finish_reason') == 'length':
+                metrics.TRUNCATED_RESPONSES.inc()
+                truncated.append(text)
+                continue
+            storyboard = self._parse_candidate(text)
+            if storyboard is not None:
+                candidates.append(storyboard)
         
-        # 시작과 끝의 백틱이나 기타 마크다운 문자 제거
-        json_str = re.sub(r'^[`\s]*', '', json_str)
-        json_str = re.sub(r'[`\s]*$', '', json_str)
+        # 출력 토큰 수는 모든 후보의 합계이므로 후보 하나당 평균으로 예산을 갱신합니다
+        if self.token_budget and choices:
+            if truncated:
+                self.token_budget.observe(pages, None, truncated=True)
+            else:
+                tokens = (result.get('usage') or {}).get('completion_tokens')
+                if isinstance(tokens, int):
+                    self.token_budget.observe(pages, tokens // len(choices))
         
-        # json 키워드 제거 (시작 부분에 있는 경우)
-        json_str = re.sub(r'^json\s*', '', json_str, flags=re.IGNORECASE)
+        if not candidates and truncated:
+            text = truncated[0]
+            for suffix, _, _ in self._continue_truncated(prompt, text, pages):
+                text += suffix
+            storyboard = self._parse_candidate(text)
+            if storyboard is not None:
+                candidates.append(storyboard)
         
-        return json_str
+        print(f"유효한 후보 {len(candidates)}/{len(choices)}개")
+        return candidates
     
-    def generate_storyboard(self, prompt: str) -> Optional[Dict]:
-        """스토리보드를 생성합니다."""
-        print(f"GPT-{self.config.model} 모델로 스토리보드 생성 중...")
+    def generate_page(self, prompt: str, max_tokens: Optional[int] = None) -> Optional[Dict]:
+        """스토리보드의 페이지 하나를 생성합니다. max_tokens로 한 페이지 분량의 출력 예산을 지정합니다."""
+        print(f"GPT-{self.config.model} 모델로 페이지 재생성 중...")
         
-        response = self._make_request(prompt)
+        response_format = PAGE_RESPONSE_FORMAT if self.config.structured_output else None
+        response = self._make_request(prompt, max_tokens=max_tokens, response_format=response_format)
         
         if not response:
             print("GPT API로부터 응답을 받지 못했습니다.")
             return None
         
-        print(f"GPT 응답 길이: {len(response)} 문자")
+        return self._parse_page_response(response)
+    
+    def _stream_request(self, prompt: str, max_tokens: Optional[int] = None,
+                        outcome: Optional[Dict] = None) -> Iterator[str]:
+        """stream=True로 요청을 보내고 응답 토큰(content delta)을 순서대로 반환합니다.
         
-        # JSON 추출 시도
-        json_str = self._extract_json_from_response(response)
+        outcome을 주면 마지막 finish_reason과 usage를 기록합니다.
+        """
+        response = self.transport.post(
+            "chat/completions",
+            headers=self._headers(),
+            json=self._build_payload(
+                prompt,
+                stream=True,
+                max_tokens=max_tokens,
+                response_format=STORYBOARD_RESPONSE_FORMAT if self.config.structured_output else None
+            ),
+            stream=True
+        )
         
-        if not json_str:
-            print("응답에서 JSON을 찾을 수 없습니다.")
-            print(f"원본 응답 (처음 500자): {response[:500]}...")
-            return None
+        try:
+            if response.status_code != 200:
+                raise RuntimeError(f"API 오류: {response.status_code} - {response.text}")
+            
+            # SSE 본문은 charset이 없을 수 있으므로 바이트 단위로 읽어 UTF-8로 디코딩합니다
+            for raw_line in response.iter_lines():
+                if not raw_line:
+                    continue
+                line = raw_line.decode('utf-8')
+                if not line.startswith('data:'):
+                    continue
+                payload = line[5:].strip()
+                if payload == '[DONE]':
+                    break
+                
+                chunk = json.loads(payload)
+                # include_usage를 요청했으므로 마지막 청크에 usage가 옵니다
+                metrics.record_usage(chunk.get('usage'))
+                if outcome is not None and chunk.get('usage'):
+                    outcome['usage'] = chunk['usage']
+                choices = chunk.get('choices') or []
+                if not choices:
+                    continue
+                if outcome is not None and choices[0].get('finish_reason'):
+                    outcome['finish_reason'] = choices[0]['finish_reason']
+                delta = choices[0].get('delta', {}).get('content')
+                if delta:
+                    yield delta
+        finally:
+            response.close()
+    
+    def stream_storyboard(self, prompt: str, pages: Optional[int] = None) -> Iterator[Tuple[str, object]]:
+        """스토리보드를 스트리밍으로 생성합니다.
+        
+        필드나 페이지가 완성될 때마다 ``(이벤트명, 값)`` 을 반환합니다.
+        이벤트명은 wholeTitle, storyTopic, hashtags, page 이며, page의 값은 정규화된 페이지입니다.
+        마지막에 ``('done', 스토리보드)`` 또는 ``('error', 메시지)`` 를 반환합니다.
+        응답이 길이 제한으로 잘리면 이어쓰기 결과를 같은 파서에 이어서 넣습니다.
+        """
+        print(f"GPT-{self.config.model} 모델로 스토리보드 스트리밍 생성 중...")
+        
+        parser = StoryboardStreamParser()
+        outcome = {}
+        streamed_pages = 0
         
-        # JSON 문자열 정리
-        json_str = self._clean_json_string(json_str)
+        def normalized(events):
+            # 페이지는 도착하는 대로 화면에 그려지므로 문자열 등장인물·목록 형태의 대사 등을 여기서 고치고,
+            # 번호는 도착 순서대로 매깁니다. 복구할 수 없는 페이지는 보내지 않습니다.
+            nonlocal streamed_pages
+            for event, value in events:
+                if event == 'page':
+                    value, _ = normalize_page(value)
+                    if value is None:
+                        continue
+                    streamed_pages += 1
+                    value['page'] = streamed_pages
+                yield event, value
         
-        # JSON 파싱 시도
         try:
-            storyboard = json.loads(json_str)
-            print("JSON 파싱 성공!")
-            
-            # 필수 필드 검증
-            required_fields = ['wholeTitle', 'storyTopic', 'hashtags', 'pages']
-            missing_fields = [field for field in required_fields if field not in storyboard]
-            
-            if missing_fields:
-                print(f"필수 필드가 누락되었습니다: {missing_fields}")
-                return None
-            
-            return storyboard
-            
-        except json.JSONDecodeError as e:
-            print(f"JSON 파싱 오류: {e}")
-            print(f"파싱 시도한 JSON (처음 1000자):")
-            print(json_str[:1000])
-            print("..." if len(json_str) > 1000 else "")
+            for delta in self._stream_request(prompt, max_tokens=self._budget_for(pages), outcome=outcome):
+                for event in normalized(parser.feed(delta)):
+                    yield event
             
-            # 일반적인 JSON 오류 수정 시도
-            try:
-                # 후행 쉼표 제거
-                fixed_json = re.sub(r',\s*}', '}', json_str)
-                fixed_json = re.sub(r',\s*]', ']', fixed_json)
-                
-                # 이스케이프되지 않은 따옴표 수정 시도
-                storyboard = json.loads(fixed_json)
-                print("JSON 수정 후 파싱 성공!")
-                return storyboard
-                
-            except json.JSONDecodeError as e2:
-                print(f"JSON 수정 후에도 파싱 실패: {e2}")
-                return None
+            finish_reason = outcome.get('finish_reason')
+            completion_tokens = (outcome.get('usage') or {}).get('completion_tokens')
+            truncated = finish_reason == 'length'
+            if truncated:
+                metrics.TRUNCATED_RESPONSES.inc()
+                for suffix, finish_reason, usage in self._continue_truncated(prompt, parser.text, pages):
+                    tokens = (usage or {}).get('completion_tokens')
+                    if isinstance(completion_tokens, int) and isinstance(tokens, int):
+                        completion_tokens += tokens
+                    for event in normalized(parser.feed(suffix)):
+                        yield event
+            self._observe_usage(pages, completion_tokens, truncated, finish_reason)
+        except (requests.exceptions.RequestException, RuntimeError, ValueError) as e:
+            print(f"스트리밍 오류: {e}")
+            yield 'error', str(e)
+            return
         
-        except Exception as e:
-            print(f"예상치 못한 오류 발생: {e}")
-            return None
+        print(f"GPT 응답 길이: {len(parser.text)} 문자")
+        
+        # 점진적 파싱 결과가 불완전하면 전체 텍스트로 기존 추출/수정 경로를 거칩니다
+        storyboard = parser.document if parser.finished and not parser.errors else None
+        if storyboard is not None:
+            storyboard = self._normalize_storyboard(storyboard)
+        if storyboard is None:
+            storyboard = self._parse_storyboard_response(parser.text)
+        
+        if storyboard is None:
+            yield 'error', '스트리밍 응답에서 스토리보드를 파싱하지 못했습니다.'
+        else:
+            yield 'done', storyboard
+    
+    def get_transport_stats(self) -> Dict:
+        """전송 계층의 연결 재사용 통계(여러 엔드포인트를 쓰면 엔드포인트별 상태 포함)를 반환합니다."""
+        return self.transport.stats()
+    
+    def warmup(self) -> bool:
+        """모델 목록 조회로 API 연결을 미리 열어 둡니다 (토큰을 사용하지 않음)."""
+        return self.transport.warmup('/models', headers=self._headers())
     
     def test_connection(self) -> bool:
         """API 연결을 테스트합니다."""
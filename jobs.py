@@ -0,0 +1,192 @@
+"""
+비동기 작업(Job) 관리 모듈
+스토리보드 생성을 HTTP 요청과 분리하여 제한된 워커 풀에서 우선순위 순으로 실행합니다.
+"""
+
+import itertools
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+
+# 작업 우선순위 (숫자가 작을수록 먼저 실행)
+PRIORITIES = {
+    'interactive': 0,
+    'bulk': 1,
+}
+
+# 작업 상태
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_FAILED = 'failed'
+STATUS_EXPIRED = 'expired'
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없을 때 발생합니다."""
+
+
+@dataclass
+class Job:
+    """생성 작업 한 건의 상태"""
+    id: str
+    payload: Dict[str, Any]
+    priority: str = 'interactive'
+    status: str = STATUS_QUEUED
+    created_at: float = field(default_factory=time.time)
+    deadline: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (STATUS_SUCCEEDED, STATUS_FAILED, STATUS_EXPIRED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 딕셔너리로 변환합니다."""
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'priority': self.priority,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.status == STATUS_SUCCEEDED:
+            data['result'] = self.result
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+class JobManager:
+    """우선순위 대기열과 고정 크기 워커 풀로 작업을 실행합니다.
+
+    - 대기열 길이는 max_queue로 제한되며, 초과 시 QueueFullError가 발생합니다.
+    - 마감 시간(deadline)이 지난 대기 작업은 실행하지 않고 expired로 처리합니다.
+    - 완료된 작업은 result_ttl초 동안 조회할 수 있습니다.
+    """
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], Any], workers: int = 4,
+                 max_queue: int = 100, result_ttl: float = 3600,
+                 default_deadline: Optional[float] = None):
+        self.handler = handler
+        self.workers = workers
+        self.max_queue = max_queue
+        self.result_ttl = result_ttl
+        self.default_deadline = default_deadline
+
+        self._queue: 'queue.PriorityQueue' = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._queued = 0
+        self._running = 0
+
+    def _ensure_workers(self):
+        """첫 작업이 들어올 때 워커 스레드를 시작합니다. 호출 시 lock을 잡고 있어야 합니다."""
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _purge_expired_results(self):
+        """보관 기간이 지난 완료 작업을 삭제합니다. 호출 시 lock을 잡고 있어야 합니다."""
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.is_finished and job.finished_at and now - job.finished_at > self.result_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, payload: Dict[str, Any], priority: str = 'interactive',
+               deadline_seconds: Optional[float] = None) -> Job:
+        """작업을 대기열에 넣고 Job을 반환합니다."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"알 수 없는 우선순위입니다: {priority}")
+
+        if deadline_seconds is None:
+            deadline_seconds = self.default_deadline
+
+        now = time.time()
+        job = Job(
+            id=uuid.uuid4().hex,
+            payload=payload,
+            priority=priority,
+            created_at=now,
+            deadline=now + deadline_seconds if deadline_seconds else None,
+        )
+
+        with self._lock:
+            self._purge_expired_results()
+            if self._queued >= self.max_queue:
+                raise QueueFullError("작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+            self._jobs[job.id] = job
+            self._queued += 1
+            self._ensure_workers()
+            self._queue.put((PRIORITIES[priority], next(self._sequence), job.id))
+
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업을 조회합니다. 없거나 보관 기간이 지났으면 None을 반환합니다."""
+        with self._lock:
+            self._purge_expired_results()
+            return self._jobs.get(job_id)
+
+    def _worker_loop(self):
+        while True:
+            _, _, job_id = self._queue.get()
+            try:
+                self._run_job(job_id)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job_id: str):
+        with self._lock:
+            self._queued -= 1
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            now = time.time()
+            if job.deadline is not None and now > job.deadline:
+                job.status = STATUS_EXPIRED
+                job.error = "대기 시간이 마감 시간을 초과하여 작업이 취소되었습니다."
+                job.finished_at = now
+                return
+            job.status = STATUS_RUNNING
+            job.started_at = now
+            self._running += 1
+
+        try:
+            result = self.handler(job.payload)
+            status, error = STATUS_SUCCEEDED, None
+        except Exception as e:
+            print(f"작업 실행 오류 ({job_id}): {e}")
+            result, status, error = None, STATUS_FAILED, str(e)
+
+        with self._lock:
+            job.result = result
+            job.status = status
+            job.error = error
+            job.finished_at = time.time()
+            self._running -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """대기/실행 중 작업 수와 설정값을 반환합니다."""
+        with self._lock:
+            return {
+                'queued': self._queued,
+                'running': self._running,
+                'retained': len(self._jobs),
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+            }
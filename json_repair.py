@@ -0,0 +1,273 @@
+"""
+JSON 추출·수정 모듈
+GPT 응답 텍스트를 한 번만 훑으면서 첫 번째 최상위 JSON 객체를 찾고,
+흔한 형식 오류(후행 쉼표, 스마트 따옴표, 잘린 괄호 등)를 같은 패스에서 수정합니다.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+
+# 문자열 밖에서 의미 있는 토큰: 구조 문자, 따옴표(스마트 따옴표 포함), 스칼라 값(숫자, true 등)
+_TOKEN = re.compile(r'[{}\[\],:"“”]|[^\s{}\[\],:"“”]+')
+# 수정이 필요 없는 일반 문자열 전체 (C 정규식 엔진으로 한 번에 건너뜀)
+_PLAIN_STRING = re.compile(r'"(?:[^"\\\x00-\x1f]|\\.)*"', re.DOTALL)
+# 문자열 안에서 처리해야 하는 문자
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+_SMART_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f“”]')
+# 닫는 따옴표 뒤에 올 수 있는 문자
+_AFTER_STRING = re.compile(r'\s*(.?)', re.DOTALL)
+
+_DECODER = json.JSONDecoder()
+_SMART_QUOTES = '“”'
+_CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+_PYTHON_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+
+# 프레임 상태
+_KEY, _COLON, _VALUE, _COMMA = 'key', 'colon', 'value', 'comma'
+
+
+@dataclass
+class ExtractionResult:
+    """JSON 추출 결과
+
+    value는 파싱된 객체이며, 수정 후에도 유효한 JSON이 아니면 None입니다.
+    """
+    json_str: Optional[str]
+    repairs: List[str] = field(default_factory=list)
+    value: Any = None
+
+    @property
+    def repaired(self) -> bool:
+        return bool(self.repairs)
+
+
+def _finish(json_str: Optional[str], repairs: List[str]) -> ExtractionResult:
+    if json_str is None:
+        return ExtractionResult(None, repairs)
+    try:
+        value = json.loads(json_str)
+    except json.JSONDecodeError:
+        value = None
+    return ExtractionResult(json_str, repairs, value)
+
+
+def extract_json(text: str) -> ExtractionResult:
+    """텍스트에서 첫 번째 최상위 JSON 객체를 추출하고 필요한 수정을 적용합니다.
+
+    코드 블록(```json), 앞뒤 설명 문장은 건너뛰며, 문자열과 이스케이프를 인식합니다.
+    올바른 JSON이면 C 구현 디코더(raw_decode)가 객체의 끝을 찾으면서 바로 파싱하고,
+    실패한 경우에만 수정 스캐너가 한 번 훑어 고친 뒤 파싱합니다.
+    적용한 수정은 repairs에 이름으로 기록됩니다:
+    trailing_comma, extra_comma, missing_comma, missing_value, smart_quotes,
+    unescaped_quote, control_char, python_literal, mismatched_bracket, truncated
+    """
+    if not text:
+        return ExtractionResult(None)
+
+    # 코드 블록이 있으면 그 안의 객체를 우선합니다 (설명 문장 속 중괄호 회피)
+    fence = text.find('```')
+    start = text.find('{', fence) if fence != -1 else -1
+    if start == -1:
+        start = text.find('{')
+    if start == -1:
+        return ExtractionResult(None)
+
+    try:
+        value, end = _DECODER.raw_decode(text, start)
+        return ExtractionResult(text[start:end], [], value)
+    except ValueError:
+        pass
+
+    return _repair(text, start)
+
+
+def _repair(text: str, start: int) -> ExtractionResult:
+    """start 위치의 '{'부터 한 번 훑으며 형식 오류를 수정합니다."""
+    repairs: List[str] = []
+    pieces: List[str] = []
+    stack: List[List[str]] = []  # [괄호 종류, 상태]
+    brackets = ''                # 스택의 괄호 종류만 모은 문자열 (안전 지점 기록용)
+    last_comma = -1              # 마지막 구조 쉼표의 pieces 인덱스 (후행 쉼표 제거용)
+    safe_point = None            # (pieces 길이, 괄호 스택) - 잘린 응답을 되돌릴 위치
+    length = len(text)
+    pos = start
+    end = None
+
+    def note(name: str):
+        if name not in repairs:
+            repairs.append(name)
+
+    def value_done():
+        nonlocal safe_point
+        if stack:
+            stack[-1][1] = _COMMA
+        safe_point = (len(pieces), brackets)
+
+    def before_value() -> bool:
+        """값(또는 키)이 올 자리인지 확인하고, 쉼표가 빠졌으면 보충합니다."""
+        nonlocal last_comma
+        frame = stack[-1]
+        if frame[1] == _COMMA:
+            note('missing_comma')
+            last_comma = len(pieces)
+            pieces.append(',')
+            frame[1] = _KEY if frame[0] == '{' else _VALUE
+        return frame[1] in (_KEY, _VALUE)
+
+    while pos < length:
+        match = _TOKEN.search(text, pos)
+        if match is None:
+            pos = length
+            break
+
+        # 토큰 사이의 공백은 출력에 필요 없으므로 버립니다
+        token = match.group()
+        pos = match.end()
+
+        if token == '{' or token == '[':
+            if stack:
+                before_value()
+            stack.append([token, _KEY if token == '{' else _VALUE])
+            brackets += token
+            pieces.append(token)
+            last_comma = -1
+            safe_point = (len(pieces), brackets)
+            continue
+
+        if not stack:
+            continue
+
+        frame = stack[-1]
+
+        if token == '}' or token == ']':
+            if last_comma != -1 and frame[1] in (_KEY, _VALUE) and pieces[last_comma] == ',':
+                pieces[last_comma] = ''
+                note('trailing_comma')
+            if frame[0] == '{' and frame[1] == _VALUE:
+                note('missing_value')
+                pieces.append('null')
+            closer = '}' if frame[0] == '{' else ']'
+            if token != closer:
+                note('mismatched_bracket')
+            pieces.append(closer)
+            stack.pop()
+            brackets = brackets[:-1]
+            last_comma = -1
+            if not stack:
+                end = pos
+                break
+            value_done()
+
+        elif token == ',':
+            if frame[1] == _COMMA:
+                frame[1] = _KEY if frame[0] == '{' else _VALUE
+                last_comma = len(pieces)
+                pieces.append(',')
+            else:
+                note('extra_comma')
+
+        elif token == ':':
+            if frame[1] == _COLON:
+                frame[1] = _VALUE
+                pieces.append(':')
+
+        elif token == '"' or token in _SMART_QUOTES:
+            before_value()
+            is_key = frame[0] == '{' and frame[1] == _KEY
+            expected = ':' if is_key else ',}]'
+            smart = token != '"'
+
+            if not smart:
+                plain = _PLAIN_STRING.match(text, match.start())
+                if plain is not None:
+                    following = _AFTER_STRING.match(text, plain.end()).group(1)
+                    if following and following in expected:
+                        pieces.append(plain.group())
+                        pos = plain.end()
+                        if is_key:
+                            frame[1] = _COLON
+                        else:
+                            value_done()
+                        last_comma = -1
+                        continue
+            if smart:
+                note('smart_quotes')
+            pattern = _SMART_STRING_SPECIAL if smart else _STRING_SPECIAL
+            pieces.append('"')
+
+            closed = False
+            while True:
+                special = pattern.search(text, pos)
+                if special is None:
+                    pieces.append(text[pos:])
+                    pos = length
+                    break
+                pieces.append(text[pos:special.start()])
+                char = special.group()
+                pos = special.end()
+
+                if char == '\\':
+                    if pos >= length:
+                        break
+                    pieces.append(text[pos - 1:pos + 1])
+                    pos += 1
+                elif char == '"' or char in _SMART_QUOTES:
+                    after = _AFTER_STRING.match(text, pos)
+                    following = after.group(1)
+                    # 줄바꿈 뒤에 다음 키가 시작되면 쉼표가 빠진 것으로 보고 문자열을 닫습니다
+                    if not following or following in expected or (
+                            following in '"“' and '\n' in text[pos:after.start(1)]):
+                        if char != '"':
+                            note('smart_quotes')
+                        pieces.append('"')
+                        closed = True
+                        break
+                    # 문자열 안에 이스케이프되지 않은 따옴표 (예: 대사 속 인용)
+                    note('unescaped_quote')
+                    pieces.append('\\"' if char == '"' else char)
+                else:
+                    note('control_char')
+                    pieces.append(_CONTROL_ESCAPES.get(char, f'\\u{ord(char):04x}'))
+
+            if not closed:
+                # 문자열 도중에 응답이 끝났습니다
+                if not is_key:
+                    pieces.append('"')
+                    value_done()
+                break
+
+            if is_key:
+                frame[1] = _COLON
+            else:
+                value_done()
+            last_comma = -1
+
+        else:
+            # 숫자, true/false/null 등의 스칼라 값
+            if pos >= length:
+                break  # 잘렸을 수 있는 마지막 토큰은 버립니다
+            if not before_value():
+                continue
+            if token in _PYTHON_LITERALS:
+                note('python_literal')
+                token = _PYTHON_LITERALS[token]
+            pieces.append(token)
+            value_done()
+            last_comma = -1
+
+    if end is None:
+        # 최상위 객체가 닫히지 않았으면 마지막 안전 지점까지 되돌리고 괄호를 닫습니다
+        note('truncated')
+        if safe_point is None:
+            return ExtractionResult(None, repairs)
+        cut, brackets = safe_point
+        del pieces[cut:]
+        pieces.extend('}' if bracket == '{' else ']' for bracket in reversed(brackets))
+        return _finish(''.join(pieces), repairs)
+
+    if not repairs:
+        return _finish(text[start:end], repairs)
+    return _finish(''.join(pieces), repairs)
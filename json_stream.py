@@ -0,0 +1,148 @@
+"""
+스트리밍 JSON 파서 모듈
+GPT 토큰 스트림을 받아 스토리보드의 각 필드와 페이지가 완성되는 즉시 이벤트로 내보냅니다.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StoryboardStreamParser:
+    """토큰 단위로 들어오는 스토리보드 JSON을 점진적으로 파싱합니다.
+
+    최상위 객체의 필드(wholeTitle, storyTopic, hashtags 등)는 값이 완성될 때,
+    ``pages`` 배열의 각 원소는 해당 객체가 닫히는 순간 이벤트로 반환합니다.
+    문자열과 이스케이프를 인식하므로 대사 안의 중괄호나 따옴표에 영향을 받지 않습니다.
+    """
+
+    ITEM_KEYS = ('pages',)
+
+    def __init__(self):
+        self._text = ''
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self.document: Dict[str, Any] = {}
+        self.items: Dict[str, List[Any]] = {key: [] for key in self.ITEM_KEYS}
+        self.errors: List[str] = []
+
+    @property
+    def finished(self) -> bool:
+        """최상위 객체가 닫혔는지 여부"""
+        return self._finished
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트"""
+        return self._text
+
+    def _load(self, fragment: str, label: str) -> Tuple[bool, Any]:
+        try:
+            return True, json.loads(fragment)
+        except json.JSONDecodeError as e:
+            self.errors.append(f"{label}: {e}")
+            return False, None
+
+    def _finish_value(self, end: int, events: List[Tuple[str, Any]]):
+        """최상위 필드 값이 끝났을 때 호출됩니다."""
+        key = self._key
+        fragment = self._text[self._value_start:end].strip()
+        self._value_start = None
+        self._key = None
+        if key is None or not fragment:
+            return
+
+        ok, value = self._load(fragment, key)
+        if not ok and key in self.items:
+            # 배열 전체 파싱에 실패해도 개별적으로 완성된 원소는 살려둡니다
+            value, ok = list(self.items[key]), True
+        if ok:
+            self.document[key] = value
+            if key not in self.items:
+                events.append((key, value))
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """텍스트 조각을 추가하고 새로 완성된 이벤트 목록을 반환합니다.
+
+        이벤트는 ``(필드명, 값)`` 형태이며, 페이지는 ``('page', 페이지 객체)`` 로 반환됩니다.
+        """
+        events: List[Tuple[str, Any]] = []
+        if self._finished or not chunk:
+            return events
+
+        self._text += chunk
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+
+            if not self._started:
+                if c == '{':
+                    self._started = True
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        ok, key = self._load(text[self._key_start:i + 1], 'key')
+                        self._key = key if ok else None
+                        self._key_start = None
+                        self._expect_key = False
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._expect_key:
+                        self._key_start = i
+                    elif self._value_start is None:
+                        self._value_start = i
+            elif c in '{[':
+                if self._depth == 1 and self._value_start is None:
+                    self._value_start = i
+                elif (self._depth == 2 and c == '{' and self._key in self.items
+                      and text[self._value_start] == '['):
+                    self._item_start = i
+                self._depth += 1
+            elif c in '}]':
+                self._depth -= 1
+                if self._depth == 2 and self._item_start is not None:
+                    ok, item = self._load(text[self._item_start:i + 1], f"{self._key}[]")
+                    self._item_start = None
+                    if ok:
+                        self.items[self._key].append(item)
+                        events.append(('page' if self._key == 'pages' else self._key, item))
+                elif self._depth == 1 and self._value_start is not None:
+                    self._finish_value(i + 1, events)
+                elif self._depth == 0:
+                    if self._value_start is not None:
+                        self._finish_value(i, events)
+                    self._finished = True
+                    self._pos = i + 1
+                    return events
+            elif self._depth == 1:
+                if c == ',':
+                    if self._value_start is not None:
+                        self._finish_value(i, events)
+                    self._expect_key = True
+                elif c != ':' and not c.isspace() and self._value_start is None and not self._expect_key:
+                    # 숫자, true/false/null 같은 스칼라 값의 시작
+                    self._value_start = i
+
+        self._pos = len(text)
+        return events
@@ -4,12 +4,20 @@
 GPT-4.1 모델을 사용하여 사용자 입력을 기반으로 인스타툰 스토리보드를 JSON 형태로 생성합니다.
 """
 
+import argparse
 import json
 import sys
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import requests
 from gpt_client import GPTClient, GPTConfig
 from config import Config
+from cache import GenerationCache, make_cache_key
+from batch import BatchRunner, print_summary
+from storage import create_store
+from search_index import SearchIndex
+from singleflight import SingleFlight, SingleFlightTimeout
+from ranking import rank_candidates
+import metrics
 
 
 class InstaToonGenerator:
@@ -17,7 +25,16 @@ class InstaToonGenerator:
         self.model = "gpt-4.1"
         self.prompt_template = self._load_prompt_template()
         self.gpt_client = None
+        self.cache = None
+        self.store = None
+        self.search_index = None
+        self.inflight = None
         self._initialize_gpt_client()
+        self._initialize_cache()
+        self._initialize_store()
+        self._initialize_search_index()
+        if Config.COALESCE_ENABLED:
+            self.inflight = SingleFlight(timeout=Config.COALESCE_TIMEOUT_SECONDS)
     
     def _initialize_gpt_client(self):
         """GPT 클라이언트를 초기화합니다."""
@@ -29,6 +46,52 @@ class InstaToonGenerator:
             print("API 키 설정이 필요합니다.")
             self.gpt_client = None
     
+    def _initialize_cache(self):
+        """생성 결과 캐시를 초기화합니다."""
+        if Config.CACHE_ENABLED:
+            self.cache = GenerationCache(
+                max_entries=Config.CACHE_MAX_ENTRIES,
+                ttl_seconds=Config.CACHE_TTL_SECONDS,
+                cache_dir=Config.CACHE_DIR
+            )
+    
+    def _initialize_store(self):
+        """스토리보드 저장소를 초기화합니다."""
+        self.store = create_store(
+            Config.STORAGE_BACKEND,
+            sqlite_path=Config.STORAGE_SQLITE_PATH,
+            json_dir=Config.STORAGE_JSON_DIR
+        )
+    
+    def _initialize_search_index(self):
+        """스토리보드 검색 색인을 초기화합니다."""
+        if Config.SEARCH_ENABLED:
+            self.search_index = SearchIndex(Config.SEARCH_INDEX_PATH)
+    
+    def close_connections(self):
+        """현재 스레드의 저장소·검색 색인 연결을 닫습니다.
+        
+        운영 서버가 fork 전에 생성기를 만든 뒤 호출하여, 워커들이 부모의 SQLite 연결을 물려받지 않게 합니다.
+        """
+        self.store.close()
+        if self.search_index:
+            self.search_index.close()
+    
+    def _cache_key(self, user_input: Dict[str, str]) -> str:
+        """사용자 입력과 현재 모델 설정으로 캐시 키를 계산합니다."""
+        gpt_config = self.gpt_client.config
+        return make_cache_key(
+            user_input,
+            self.prompt_template,
+            gpt_config.model,
+            gpt_config.temperature,
+            gpt_config.max_tokens
+        )
+    
+    def get_cache_stats(self) -> Optional[Dict]:
+        """캐시 통계를 반환합니다. 캐시가 비활성화되어 있으면 None을 반환합니다."""
+        return self.cache.stats() if self.cache else None
+    
     def _load_prompt_template(self) -> str:
         """프롬프트 템플릿을 로드합니다."""
         return """###지시사항
@@ -115,23 +178,218 @@ json
             "pages": pages
         }
 
-    def generate_storyboard(self, user_input: Dict[str, str]) -> Optional[Dict]:
-        """GPT 모델을 사용하여 스토리보드를 생성합니다."""
+    @metrics.timed('generate')
+    def generate_storyboard(self, user_input: Dict[str, str], use_cache: bool = True,
+                            candidates: int = 1) -> Optional[Dict]:
+        """GPT 모델을 사용하여 스토리보드를 생성합니다.
+        
+        use_cache가 False이면 캐시를 조회하지 않고 새 변형을 생성합니다(결과는 캐시에 저장됩니다).
+        같은 입력의 생성이 이미 진행 중이면 새로 호출하지 않고 그 결과를 함께 받습니다.
+        새 변형 요청은 새 변형 요청끼리만 병합합니다.
+        candidates가 1보다 크면 한 번의 요청으로 여러 후보를 만들어 점수가 가장 높은 후보를 반환합니다
+        (나머지 후보까지 필요하면 generate_candidates를 사용합니다).
+        """
+        if not self.gpt_client:
+            print("GPT 클라이언트가 초기화되지 않았습니다. API 키를 확인해주세요.")
+            return None
+        
+        if candidates > 1:
+            ranked = self.generate_candidates(user_input, candidates)
+            return ranked[0]['storyboard'] if ranked else None
+        
+        cache_key = self._cache_key(user_input) if self.cache or self.inflight else None
+        if self.cache and use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print("캐시된 스토리보드를 반환합니다.")
+                return cached
+        
+        prompt = self._build_prompt(user_input)
+        
+        def generate() -> Optional[Dict]:
+            storyboard = self.gpt_client.generate_storyboard(prompt, pages=self._page_count(user_input))
+            if storyboard and self.cache:
+                self.cache.set(cache_key, storyboard)
+            return storyboard
+        
+        if not self.inflight:
+            return generate()
+        # 캐시를 채우는 일반 생성 결과를 새 변형 요청에 돌려주지 않도록 병합 키를 구분합니다
+        flight_key = cache_key if use_cache else f"{cache_key}:fresh"
+        try:
+            return self.inflight.do(flight_key, generate)
+        except SingleFlightTimeout as e:
+            print(f"오류: {e}")
+            return None
+    
+    def generate_candidates(self, user_input: Dict[str, str], n: int) -> List[Dict]:
+        """한 번의 API 요청으로 n개의 후보를 만들고 로컬 점수 순으로 정렬하여 반환합니다.
+        
+        각 항목은 ``{'storyboard', 'score', 'scores'}`` 이며, 가장 높은 후보는 캐시에도 저장합니다.
+        여러 후보를 원하는 요청이므로 캐시 조회와 요청 병합은 하지 않습니다.
+        """
+        if not self.gpt_client:
+            print("GPT 클라이언트가 초기화되지 않았습니다. API 키를 확인해주세요.")
+            return []
+        
+        n = max(1, min(n, Config.MAX_CANDIDATES))
+        storyboards = self.gpt_client.generate_candidates(
+            self._build_prompt(user_input), n, pages=self._page_count(user_input)
+        )
+        ranked = rank_candidates(storyboards, user_input)
+        if ranked and self.cache:
+            self.cache.set(self._cache_key(user_input), ranked[0]['storyboard'])
+        return ranked
+    
+    def get_inflight_stats(self) -> Optional[Dict]:
+        """요청 병합 통계를 반환합니다. 병합이 비활성화되어 있으면 None을 반환합니다."""
+        return self.inflight.stats() if self.inflight else None
+
+    def stream_storyboard(self, user_input: Dict[str, str], use_cache: bool = True) -> Iterator[Tuple[str, object]]:
+        """스토리보드를 스트리밍으로 생성하며, 완성된 필드와 페이지를 순서대로 반환합니다."""
+        if not self.gpt_client:
+            yield 'error', "GPT 클라이언트가 초기화되지 않았습니다. API 키를 확인해주세요."
+            return
+        
+        cache_key = self._cache_key(user_input) if self.cache else None
+        if cache_key and use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print("캐시된 스토리보드를 스트리밍합니다.")
+                for field in ('wholeTitle', 'storyTopic', 'hashtags'):
+                    yield field, cached.get(field)
+                for page in cached.get('pages', []):
+                    yield 'page', page
+                yield 'done', cached
+                return
+        
+        for event, value in self.gpt_client.stream_storyboard(self._build_prompt(user_input),
+                                                             pages=self._page_count(user_input)):
+            if event == 'done' and cache_key:
+                self.cache.set(cache_key, value)
+            yield event, value
+
+    def _build_page_prompt(self, storyboard: Dict, page_number: int, instructions: str = "") -> str:
+        """단일 페이지 재생성용 프롬프트를 만듭니다.
+        
+        템플릿의 지시사항·작성지침과 앞뒤 페이지만 포함하여 입력 토큰을 줄입니다.
+        """
+        guidelines = self.prompt_template.split("###출력형식", 1)[0].strip()
+        pages = {page.get('page'): page for page in storyboard.get('pages', [])}
+        
+        def dump(value) -> str:
+            return json.dumps(value, ensure_ascii=False)
+        
+        sections = [
+            guidelines,
+            "\n###스토리 정보",
+            f"제목: {storyboard.get('wholeTitle', '')}",
+            f"핵심 주제: {storyboard.get('storyTopic', '')}",
+            f"전체 분량: {len(pages)}장",
+        ]
+        if page_number - 1 in pages:
+            sections += [f"\n###이전 페이지 ({page_number - 1})", dump(pages[page_number - 1])]
+        sections += [f"\n###다시 작성할 페이지 ({page_number})", dump(pages[page_number])]
+        if page_number + 1 in pages:
+            sections += [f"\n###다음 페이지 ({page_number + 1})", dump(pages[page_number + 1])]
+        if instructions and instructions.strip():
+            sections += ["\n###수정 요청", instructions.strip()]
+        sections += [
+            "\n###출력형식",
+            f"앞뒤 페이지와 자연스럽게 이어지도록 {page_number}페이지만 새로 작성하여, 아래 형식의 JSON 객체 하나로만 응답하십시오.",
+            dump({
+                "page": page_number,
+                "character": ["<캐릭터1>", "..."],
+                "background": "<배경 설명>",
+                "dialogue": {"<캐릭터1>": "<대사1>"},
+                "expressionPose": "<주요 인물들의 표정과 액션>"
+            })
+        ]
+        return "\n".join(sections)
+
+    def regenerate_page(self, storyboard: Dict, page_number: int, instructions: str = "") -> Optional[Dict]:
+        """스토리보드의 페이지 하나만 다시 생성하여, 교체된 새 스토리보드를 반환합니다."""
         if not self.gpt_client:
             print("GPT 클라이언트가 초기화되지 않았습니다. API 키를 확인해주세요.")
             return None
         
-        prompt = self.prompt_template.format(
+        page_numbers = [page.get('page') for page in storyboard.get('pages', [])]
+        if page_number not in page_numbers:
+            print(f"오류: {page_number}페이지가 스토리보드에 없습니다.")
+            return None
+        
+        prompt = self._build_page_prompt(storyboard, page_number, instructions)
+        new_page = self.gpt_client.generate_page(prompt, max_tokens=Config.PAGE_REGEN_MAX_TOKENS)
+        if not new_page:
+            return None
+        
+        new_page['page'] = page_number
+        updated = dict(storyboard)
+        updated['pages'] = [new_page if page.get('page') == page_number else page
+                            for page in storyboard['pages']]
+        return updated
+
+    @staticmethod
+    def _page_count(user_input: Dict[str, str]) -> Optional[int]:
+        """입력의 페이지 수를 정수로 반환합니다. 해석할 수 없으면 None을 반환합니다."""
+        try:
+            return int(str(user_input.get("pages", "")).strip())
+        except ValueError:
+            return None
+
+    def _build_prompt(self, user_input: Dict[str, str]) -> str:
+        """사용자 입력으로 프롬프트를 완성합니다."""
+        return self.prompt_template.format(
             characters=user_input["characters"] or "없음",
             keywords=user_input["keywords"] or "없음",
             plot=user_input["plot"],
             pages=user_input["pages"]
         )
-        
-        return self.gpt_client.generate_storyboard(prompt)
 
-    def save_result(self, storyboard: Dict, filename: str = "storyboard.json"):
-        """생성된 스토리보드를 JSON 파일로 저장합니다."""
+    @metrics.timed('save')
+    def save_result(self, storyboard: Dict) -> Optional[Dict]:
+        """생성된 스토리보드를 저장소에 저장하고 저장 정보(id, filename 등)를 반환합니다.
+
+        같은 내용의 스토리보드가 이미 있으면 새로 저장하지 않고 기존 항목을 반환합니다.
+        """
+        try:
+            record = self.store.save(storyboard)
+            if record['deduplicated']:
+                print(f"같은 스토리보드가 이미 저장되어 있습니다: {record['id']}")
+            else:
+                print(f"스토리보드가 저장되었습니다: {record['id']}")
+                self._index_result(record, storyboard)
+            return record
+        except Exception as e:
+            print(f"스토리보드 저장 중 오류가 발생했습니다: {e}")
+            return None
+
+    def _index_result(self, record: Dict, storyboard: Dict):
+        """새로 저장한 스토리보드를 검색 색인에 추가합니다. 실패해도 저장 결과에는 영향을 주지 않습니다."""
+        if not self.search_index:
+            return
+        try:
+            self.search_index.add(record['id'], storyboard)
+        except Exception as e:
+            print(f"검색 색인 갱신 중 오류가 발생했습니다: {e}")
+    
+    def search(self, query: str, page: int = 1, per_page: int = Config.STORAGE_PAGE_SIZE) -> Tuple[List[Dict], int]:
+        """저장된 스토리보드를 검색하여 (결과, 전체 개수)를 반환합니다."""
+        if not self.search_index:
+            return [], 0
+        return self.search_index.search(query, page, per_page)
+    
+    def reindex(self) -> int:
+        """저장소에 있지만 색인에 없는 스토리보드를 검색 색인에 추가하고 추가한 개수를 반환합니다."""
+        if not self.search_index:
+            print("검색 색인이 비활성화되어 있습니다 (INSTATOON_SEARCH).")
+            return 0
+        added = self.search_index.backfill(self.store)
+        print(f"검색 색인에 스토리보드 {added}개를 추가했습니다.")
+        return added
+    
+    def export_result(self, storyboard: Dict, filename: str = "storyboard.json"):
+        """생성된 스토리보드를 지정한 JSON 파일로 내보냅니다."""
         try:
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(storyboard, f, ensure_ascii=False, indent=2)
@@ -141,6 +399,18 @@ json
             print(f"파일 저장 중 오류가 발생했습니다: {e}")
             return False
 
+    def run_batch(self, input_path: str, output_path: str, checkpoint_path: Optional[str] = None,
+                  concurrency: int = 4, rpm: float = 0, tpm: float = 0, use_cache: bool = True) -> Optional[Dict]:
+        """JSONL 입력으로 배치 생성을 실행하고 요약을 출력합니다."""
+        if not self.gpt_client:
+            print("GPT 클라이언트가 초기화되지 않았습니다. API 키를 확인해주세요.")
+            return None
+        
+        runner = BatchRunner(self, concurrency=concurrency, rpm=rpm, tpm=tpm, use_cache=use_cache)
+        summary = runner.run(input_path, output_path, checkpoint_path)
+        print_summary(summary)
+        return summary
+
     def run(self):
         """메인 실행 함수"""
         try:
@@ -165,7 +435,7 @@ json
                     filename = input("파일명 (기본값: storyboard.json): ").strip()
                     if not filename:
                         filename = "storyboard.json"
-                    self.save_result(storyboard, filename)
+                    self.export_result(storyboard, filename)
             else:
                 print("스토리보드 생성에 실패했습니다.")
                 
@@ -175,6 +445,46 @@ json
             print(f"오류가 발생했습니다: {e}")
 
 
+def parse_args(argv=None):
+    """명령줄 인자를 해석합니다."""
+    parser = argparse.ArgumentParser(description="인스타툰 스토리보드 생성기")
+    parser.add_argument('--batch', metavar='INPUT_JSONL',
+                        help="JSONL 파일의 각 레코드로 스토리보드를 일괄 생성합니다")
+    parser.add_argument('--output', default='batch_results.jsonl',
+                        help="배치 결과 JSONL 파일 (기본값: batch_results.jsonl)")
+    parser.add_argument('--checkpoint', default=None,
+                        help="체크포인트 파일 (기본값: <output>.checkpoint)")
+    parser.add_argument('--concurrency', type=int, default=Config.BATCH_CONCURRENCY,
+                        help="동시 생성 수")
+    parser.add_argument('--rpm', type=float, default=Config.BATCH_REQUESTS_PER_MINUTE,
+                        help="분당 최대 요청 수 (0이면 제한 없음)")
+    parser.add_argument('--tpm', type=float, default=Config.BATCH_TOKENS_PER_MINUTE,
+                        help="분당 최대 토큰 수 (0이면 제한 없음)")
+    parser.add_argument('--fresh', action='store_true',
+                        help="캐시를 사용하지 않고 새로 생성합니다")
+    parser.add_argument('--reindex', action='store_true',
+                        help="저장된 스토리보드 중 검색 색인에 없는 항목을 색인합니다")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
     generator = InstaToonGenerator()
-    generator.run()
\ No newline at end of file
+    
+    if args.reindex:
+        generator.reindex()
+    elif args.batch:
+        try:
+            generator.run_batch(
+                args.batch,
+                args.output,
+                checkpoint_path=args.checkpoint,
+                concurrency=args.concurrency,
+                rpm=args.rpm,
+                tpm=args.tpm,
+                use_cache=not args.fresh
+            )
+        except KeyboardInterrupt:
+            sys.exit(130)
+    else:
+        generator.run()
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""
+계측 모듈
+생성 단계별 처리 시간 히스토그램, 토큰 사용량, JSON 수정 경로, 업스트림 상태 코드를 집계하여
+Prometheus 텍스트 형식(/api/metrics)과 요청별 Server-Timing 헤더로 제공합니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """레이블별 누적 카운터"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+
+
+class Histogram:
+    """레이블별 누적 버킷 히스토그램 (초 단위)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # 레이블 → [버킷별 개수..., 합계, 개수]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0
+            for index, bound in enumerate(self.buckets):
+                cumulative += state[index]
+                labels = _format_labels(self.labelnames, key, f'le="{_format_number(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_number(state[-2])}"
+            yield f"{self.name}_count{labels} {state[-1]}"
+
+
+class Registry:
+    """지표 목록과 Prometheus 텍스트 출력"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'instatoon_stage_duration_seconds', 'Duration of each generation stage in seconds', ('stage',))
+TOKENS = REGISTRY.counter(
+    'instatoon_tokens_total', 'Tokens reported by the upstream usage block', ('kind',))
+JSON_EXTRACTIONS = REGISTRY.counter(
+    'instatoon_json_extractions_total', 'JSON extractions by path (clean, repaired, failed)', ('path',))
+JSON_REPAIRS = REGISTRY.counter(
+    'instatoon_json_repairs_total', 'JSON repairs applied by repair kind', ('repair',))
+STORYBOARD_NORMALIZATIONS = REGISTRY.counter(
+    'instatoon_storyboard_normalizations_total',
+    'Storyboard normalizations by path (clean, repaired, failed)', ('path',))
+STORYBOARD_REPAIRS = REGISTRY.counter(
+    'instatoon_storyboard_repairs_total', 'Storyboard field repairs applied by repair kind', ('repair',))
+UPSTREAM_RESPONSES = REGISTRY.counter(
+    'instatoon_upstream_responses_total', 'Upstream API responses by HTTP status (error = no response)', ('status',))
+COALESCED_REQUESTS = REGISTRY.counter(
+    'instatoon_coalesced_requests_total', 'Generation requests that joined an identical in-flight generation')
+TRUNCATED_RESPONSES = REGISTRY.counter(
+    'instatoon_truncated_responses_total', 'Storyboard responses cut off by the output token limit')
+CONTINUATIONS = REGISTRY.counter(
+    'instatoon_continuations_total', 'Continuation requests issued to complete truncated responses')
+HEDGED_REQUESTS = REGISTRY.counter(
+    'instatoon_hedged_requests_total', 'Hedged upstream requests (sent, won = hedge answered first)', ('outcome',))
+ADMISSION_DECISIONS = REGISTRY.counter(
+    'instatoon_admission_decisions_total',
+    'Generation admission outcomes (admitted, queued, rate_limited, overloaded)', ('outcome',))
+ENDPOINT_EJECTIONS = REGISTRY.counter(
+    'instatoon_endpoint_ejections_total', 'Upstream endpoints temporarily ejected after errors or rate limiting',
+    ('endpoint',))
+
+
+# 현재 요청의 단계별 누적 시간(초). 요청 밖(작업 워커 등)에서는 None입니다.
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar('instatoon_request_timings', default=None)
+
+
+def observe_stage(stage: str, seconds: float):
+    """단계 처리 시간을 히스토그램과 현재 요청의 Server-Timing에 기록합니다."""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(stage: str):
+    """with 블록의 실행 시간을 stage 이름으로 기록합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+def record_usage(usage: Optional[Dict]):
+    """API 응답의 usage 블록에서 프롬프트/완성 토큰 수를 기록합니다."""
+    if not usage:
+        return
+    for kind in ('prompt', 'completion'):
+        count = usage.get(f'{kind}_tokens')
+        if isinstance(count, int):
+            TOKENS.inc(count, kind=kind)
+
+
+def record_extraction(extraction):
+    """JSON 추출 결과(ExtractionResult)의 경로와 수정 종류를 기록합니다."""
+    if extraction.value is None:
+        path = 'failed'
+    elif extraction.repairs:
+        path = 'repaired'
+    else:
+        path = 'clean'
+    JSON_EXTRACTIONS.inc(path=path)
+    for repair in extraction.repairs:
+        JSON_REPAIRS.inc(repair=repair)
+
+
+def record_normalization(normalization):
+    """스토리보드 정규화 결과(NormalizationResult)의 경로와 수정 종류를 기록합니다."""
+    if normalization.storyboard is None:
+        path = 'failed'
+    elif normalization.repairs:
+        path = 'repaired'
+    else:
+        path = 'clean'
+    STORYBOARD_NORMALIZATIONS.inc(path=path)
+    for repair in normalization.repairs:
+        STORYBOARD_REPAIRS.inc(repair=repair)
+
+
+def record_upstream_status(status):
+    """업스트림 응답 상태 코드(응답이 없으면 'error')를 기록합니다."""
+    UPSTREAM_RESPONSES.inc(status=status)
+
+
+def render() -> str:
+    """모든 지표를 Prometheus 텍스트 형식으로 반환합니다."""
+    return REGISTRY.render()
+
+
+def server_timing_header(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    """단계별 시간(초)을 Server-Timing 헤더 값으로 변환합니다 (밀리초)."""
+    parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(parts)
+
+
+def init_app(app):
+    """요청마다 단계별 시간을 모아 Server-Timing 헤더로 응답에 붙입니다.
+
+    스트리밍 응답은 헤더를 먼저 보내므로 그 이후의 단계는 포함되지 않습니다.
+    CLI에서 Flask를 임포트하지 않도록 Flask 관련 임포트는 여기서 합니다.
+    """
+    from flask import g
+
+    @app.before_request
+    def start_request_timing():
+        g.metrics_started = time.perf_counter()
+        g.metrics_token = _request_timings.set({})
+
+    @app.after_request
+    def add_server_timing(response):
+        timings = _request_timings.get()
+        started = g.get('metrics_started')
+        if timings is not None and started is not None:
+            response.headers['Server-Timing'] = server_timing_header(timings, time.perf_counter() - started)
+        return response
+
+    @app.teardown_request
+    def reset_request_timing(exc):
+        token = g.pop('metrics_token', None)
+        if token is not None:
+            try:
+                _request_timings.reset(token)
+            except ValueError:
+                # 다른 컨텍스트에서 설정된 토큰 (스트리밍 응답 종료 시)
+                _request_timings.set(None)
@@ -0,0 +1,120 @@
+"""
+후보 스토리보드 순위 모듈
+한 번의 요청으로 받은 여러 후보를 API 호출 없이 로컬에서 점수화하여 정렬합니다.
+점수는 키워드 반영, 요청 페이지 수 일치, 페이지 필드(대사 포함) 완성도,
+세이프 존 안에 들어가는 대사 길이로 구성됩니다.
+"""
+
+import re
+from typing import Dict, List
+
+from config import Config
+
+
+# 항목별 가중치 (합계 1.0)
+WEIGHTS = {
+    'keywords': 0.3,
+    'page_count': 0.3,
+    'completeness': 0.2,
+    'safe_zone': 0.2,
+}
+
+_KEYWORD_SEPARATORS = re.compile(r'[,\n/·]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def safe_zone_char_limit(image_size: int = Config.IMAGE_SIZE, margin: int = Config.SAFE_ZONE_MARGIN,
+                         font_px: int = Config.DIALOGUE_FONT_PX, max_lines: int = Config.DIALOGUE_MAX_LINES) -> int:
+    """세이프 존 너비(이미지 크기 - 양쪽 여백)에 max_lines줄로 들어가는 한 페이지 대사 글자 수"""
+    return max(1, (image_size - 2 * margin) // font_px) * max_lines
+
+
+def keyword_terms(keywords: str) -> List[str]:
+    """키워드 입력을 개별 키워드 목록으로 나눕니다 (쉼표가 없으면 공백으로 구분)."""
+    keywords = (keywords or '').strip()
+    if not keywords or keywords == '없음':
+        return []
+    parts = _KEYWORD_SEPARATORS.split(keywords) if _KEYWORD_SEPARATORS.search(keywords) else keywords.split()
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _compact(text: str) -> str:
+    # 한국어 띄어쓰기 차이로 키워드를 놓치지 않도록 공백을 없애고 비교합니다
+    return _WHITESPACE.sub('', text).lower()
+
+
+def _storyboard_text(storyboard: Dict) -> str:
+    parts = [storyboard.get('wholeTitle', ''), storyboard.get('storyTopic', '')]
+    parts += [str(tag) for tag in storyboard.get('hashtags', [])]
+    for page in storyboard.get('pages', []):
+        parts += [str(name) for name in page.get('character', [])]
+        parts += [page.get('background', ''), page.get('expressionPose', '')]
+        for name, line in (page.get('dialogue') or {}).items():
+            parts += [str(name), str(line)]
+    return _compact(' '.join(str(part) for part in parts))
+
+
+def _dialogue_length(page: Dict) -> int:
+    return sum(len(str(line)) for line in (page.get('dialogue') or {}).values())
+
+
+def _page_completeness(page: Dict) -> float:
+    dialogue = page.get('dialogue') or {}
+    filled = [
+        bool(page.get('character')),
+        bool(str(page.get('background', '')).strip()),
+        bool(dialogue) and all(str(line).strip() for line in dialogue.values()),
+        bool(str(page.get('expressionPose', '')).strip()),
+    ]
+    return sum(filled) / len(filled)
+
+
+def score_storyboard(storyboard: Dict, user_input: Dict[str, str]) -> Dict[str, float]:
+    """후보 하나의 항목별 점수(0~1)와 가중 합계(total)를 반환합니다."""
+    pages = storyboard.get('pages') or []
+
+    terms = keyword_terms(user_input.get('keywords', ''))
+    if terms:
+        text = _storyboard_text(storyboard)
+        keywords = sum(1 for term in terms if _compact(term) in text) / len(terms)
+    else:
+        keywords = 1.0
+
+    try:
+        requested = int(str(user_input.get('pages', '')).strip())
+    except ValueError:
+        requested = 0
+    if requested > 0:
+        page_count = max(0.0, 1 - abs(len(pages) - requested) / requested)
+    else:
+        page_count = 1.0
+
+    completeness = sum(_page_completeness(page) for page in pages) / len(pages) if pages else 0.0
+
+    limit = safe_zone_char_limit()
+    if pages:
+        safe_zone = sum(min(1.0, limit / max(_dialogue_length(page), 1)) for page in pages) / len(pages)
+    else:
+        safe_zone = 0.0
+
+    scores = {
+        'keywords': round(keywords, 3),
+        'page_count': round(page_count, 3),
+        'completeness': round(completeness, 3),
+        'safe_zone': round(safe_zone, 3),
+    }
+    scores['total'] = round(sum(WEIGHTS[key] * value for key, value in scores.items()), 4)
+    return scores
+
+
+def rank_candidates(storyboards: List[Dict], user_input: Dict[str, str]) -> List[Dict]:
+    """후보들을 점수 순으로 정렬하여 ``{'storyboard', 'score', 'scores'}`` 목록으로 반환합니다.
+
+    점수가 같으면 API가 돌려준 순서를 유지합니다.
+    """
+    ranked = []
+    for storyboard in storyboards:
+        scores = score_storyboard(storyboard, user_input)
+        ranked.append({'storyboard': storyboard, 'score': scores['total'], 'scores': scores})
+    ranked.sort(key=lambda candidate: candidate['score'], reverse=True)
+    return ranked
@@ -0,0 +1,74 @@
+"""
+속도 제한 모듈
+분당 요청 수(RPM)·토큰 수(TPM) 제한에 사용하는 토큰 버킷을 제공합니다.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷
+
+    rate는 초당 충전량, capacity는 최대 보관량입니다.
+    reserve()는 잔량을 미리 차감(음수 허용)하고 대기해야 할 시간을 돌려주므로
+    동기 코드(time.sleep)와 asyncio 코드(asyncio.sleep) 양쪽에서 사용할 수 있습니다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, amount: float, burst: Optional[float] = None) -> 'TokenBucket':
+        """분당 amount 만큼 충전되는 버킷을 생성합니다."""
+        return cls(amount / 60.0, capacity=burst if burst is not None else amount)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self, amount: float = 1) -> float:
+        """amount 만큼 예약하고, 사용 전까지 기다려야 하는 시간(초)을 반환합니다."""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_acquire(self, amount: float = 1) -> bool:
+        """잔량이 충분하면 즉시 차감하고 True를, 아니면 차감 없이 False를 반환합니다."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return True
+            return False
+
+    def refund(self, amount: float = 1):
+        """사용하지 않은 amount 만큼을 돌려줍니다 (최대 보관량을 넘지 않음)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def time_until_available(self, amount: float = 1) -> float:
+        """amount 만큼 사용할 수 있을 때까지 남은 시간(초)을 반환합니다."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1):
+        """amount 만큼 사용할 수 있을 때까지 대기합니다."""
+        delay = self.reserve(amount)
+        if delay > 0:
+            time.sleep(delay)
@@ -6,8 +6,7 @@
 
 import sys
 import os
-from app import app
-from main import InstaToonGenerator
+from config import Config
 
 
 def run_web_server():
@@ -16,19 +15,88 @@ def run_web_server():
     print("📍 브라우저에서 http://localhost:5000 으로 접속하세요")
     print("⏹️  종료하려면 Ctrl+C를 누르세요\n")
     
+    from app import app  # 웹 서버 모드에서만 Flask 앱을 불러옵니다
+    
     try:
         app.run(debug=False, host='0.0.0.0', port=5000)
     except KeyboardInterrupt:
         print("\n👋 서버가 종료되었습니다.")
 
 
+def run_production_server():
+    """운영 서버 모드로 실행 (워커 프로세스 × 스레드 풀, keep-alive, SIGTERM 시 진행 중인 생성 마무리)"""
+    print("🚀 운영 서버 모드로 실행합니다...")
+    
+    # fork 전에 앱을 한 번 불러와 워커들이 임포트 결과를 공유하게 합니다.
+    # API 연결은 워커끼리 공유하면 안 되므로 예열은 앱을 불러올 때가 아니라 fork 이후 워커마다 합니다.
+    warmup_on_start = Config.WARMUP_ON_START
+    Config.WARMUP_ON_START = False
+    import app as web_app
+    # 생성기(프롬프트, 저장소·캐시·GPT 클라이언트 설정)도 fork 전에 만들어 워커들이 copy-on-write로 공유합니다.
+    # HTTP 연결은 첫 요청이나 워커별 예열 때 열리고, SQLite 연결은 닫아 두어 워커 스레드마다 새로 엽니다.
+    web_app.get_generator().close_connections()
+    from serving import serve
+    
+    def is_idle():
+        if web_app.job_manager is None:
+            return True
+        return web_app.job_manager.stats()['running'] == 0
+    
+    # 작업 상태와 수락 제어의 동시 실행 한도는 프로세스 메모리에 있으므로, 둘 중 하나라도 켜져 있으면
+    # 워커 프로세스를 1개로 줄이고 같은 수의 요청을 처리하도록 스레드를 늘립니다.
+    # (여러 워커로 나누면 다른 워커가 만든 작업을 조회할 때 404가 나고, 동시 실행 한도가 워커 수만큼 늘어납니다)
+    workers, threads = Config.SERVER_WORKERS, Config.SERVER_THREADS
+    if workers > 1 and (Config.JOBS_ENABLED or Config.ADMISSION_ENABLED):
+        print(f"⚠️  비동기 작업/수락 제어가 켜져 있어 워커 {workers}개 대신 워커 1개 × 스레드 {workers * threads}개로 실행합니다.")
+        print("   여러 워커로 실행하려면 INSTATOON_JOBS=0, INSTATOON_ADMISSION=0으로 설정하세요.")
+        workers, threads = 1, workers * threads
+    
+    serve(
+        web_app.app,
+        host=Config.SERVER_HOST,
+        port=Config.SERVER_PORT,
+        workers=workers,
+        threads=threads,
+        keepalive=Config.SERVER_KEEPALIVE_SECONDS,
+        graceful_timeout=Config.SERVER_GRACEFUL_TIMEOUT,
+        is_idle=is_idle,
+        on_worker_start=web_app.warmup if warmup_on_start else None
+    )
+
+
 def run_cli_mode():
     """CLI 모드로 실행"""
     print("💻 CLI 모드로 실행합니다...\n")
+    from main import InstaToonGenerator
     generator = InstaToonGenerator()
     generator.run()
 
 
+def run_batch_mode():
+    """배치 모드로 실행"""
+    print("📦 배치 모드로 실행합니다...\n")
+    input_path = input("입력 JSONL 파일 경로: ").strip()
+    if not input_path or not os.path.exists(input_path):
+        print("❌ 입력 파일을 찾을 수 없습니다.")
+        return
+    
+    output_path = input("결과 파일 경로 (기본값: batch_results.jsonl): ").strip() or "batch_results.jsonl"
+    concurrency = input(f"동시 생성 수 (기본값: {Config.BATCH_CONCURRENCY}): ").strip()
+    
+    from main import InstaToonGenerator
+    generator = InstaToonGenerator()
+    try:
+        generator.run_batch(
+            input_path,
+            output_path,
+            concurrency=int(concurrency) if concurrency.isdigit() else Config.BATCH_CONCURRENCY,
+            rpm=Config.BATCH_REQUESTS_PER_MINUTE,
+            tpm=Config.BATCH_TOKENS_PER_MINUTE
+        )
+    except KeyboardInterrupt:
+        print("\n👋 배치가 중단되었습니다. 다시 실행하면 이어서 진행합니다.")
+
+
 def main():
     """메인 실행 함수"""
     print("=" * 50)
@@ -38,12 +106,14 @@ def main():
     print("실행 모드를 선택하세요:")
     print("1. 웹 인터페이스 (추천)")
     print("2. 커맨드라인 인터페이스")
-    print("3. 종료")
+    print("3. 배치 생성 (JSONL)")
+    print("4. 운영 서버 (멀티 워커)")
+    print("5. 종료")
     print()
     
     while True:
         try:
-            choice = input("선택 (1-3): ").strip()
+            choice = input("선택 (1-5): ").strip()
             
             if choice == '1':
                 run_web_server()
@@ -52,10 +122,16 @@ def main():
                 run_cli_mode()
                 break
             elif choice == '3':
+                run_batch_mode()
+                break
+            elif choice == '4':
+                run_production_server()
+                break
+            elif choice == '5':
                 print("👋 프로그램을 종료합니다.")
                 break
             else:
-                print("❌ 올바른 번호를 입력해주세요 (1-3)")
+                print("❌ 올바른 번호를 입력해주세요 (1-5)")
                 
         except KeyboardInterrupt:
             print("\n👋 프로그램이 중단되었습니다.")
@@ -65,4 +141,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # 배포 환경에서는 메뉴 없이 운영 서버로 바로 실행합니다: python run.py serve
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        run_production_server()
+    else:
+        main()
\ No newline at end of file
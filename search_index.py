@@ -0,0 +1,231 @@
+"""
+스토리보드 검색 색인 모듈
+저장된 스토리보드의 제목·주제·해시태그·등장인물·대사를 문자 n-gram으로 나눈 역색인을
+SQLite 파일에 유지합니다. 저장할 때마다 해당 스토리보드만 색인에 추가하며,
+검색은 가장 드문 n-gram부터 게시 목록을 따라가므로 저장 수가 늘어도 빠르게 응답합니다.
+"""
+
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from storage import filename_for
+
+
+# 필드별 가중치 (제목에서 찾은 단어가 대사에서 찾은 단어보다 중요합니다)
+FIELD_WEIGHTS = {
+    'wholeTitle': 3.0,
+    'hashtags': 2.0,
+    'storyTopic': 1.5,
+    'character': 1.5,
+    'dialogue': 1.0,
+}
+
+NGRAM_SIZE = 2
+# 한 번의 검색에서 사용하는 최대 n-gram 수 (드문 것부터)
+MAX_QUERY_TERMS = 16
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text: str, n: int = NGRAM_SIZE) -> List[str]:
+    """텍스트를 단어별 문자 n-gram 목록으로 나눕니다.
+
+    한국어는 띄어쓰기와 조사가 일정하지 않아 단어 단위로는 찾기 어려우므로,
+    NFKC 정규화·소문자 변환 후 단어마다 n글자씩 겹쳐 자릅니다. n보다 짧은 단어는 그대로 사용합니다.
+    """
+    tokens = []
+    for word in _WORD.findall(unicodedata.normalize('NFKC', text or '').lower()):
+        word = word.replace('_', '')
+        if not word:
+            continue
+        if len(word) <= n:
+            tokens.append(word)
+        else:
+            tokens.extend(word[index:index + n] for index in range(len(word) - n + 1))
+    return tokens
+
+
+def _field_texts(storyboard: Dict) -> Iterable[Tuple[str, str]]:
+    yield 'wholeTitle', str(storyboard.get('wholeTitle', ''))
+    yield 'storyTopic', str(storyboard.get('storyTopic', ''))
+    for tag in storyboard.get('hashtags') or []:
+        yield 'hashtags', str(tag)
+    for page in storyboard.get('pages') or []:
+        if not isinstance(page, dict):
+            continue
+        for name in page.get('character') or []:
+            yield 'character', str(name)
+        for name, line in (page.get('dialogue') or {}).items():
+            yield 'character', str(name)
+            yield 'dialogue', str(line)
+
+
+def term_weights(storyboard: Dict) -> Dict[str, float]:
+    """스토리보드의 n-gram별 가중치 (필드 가중치를 곱한 빈도의 로그 스케일)"""
+    counts = Counter()
+    for field, text in _field_texts(storyboard):
+        weight = FIELD_WEIGHTS[field]
+        for token in tokenize(text):
+            counts[token] += weight
+    return {term: round(1.0 + math.log(count), 4) for term, count in counts.items()}
+
+
+class SearchIndex:
+    """SQLite에 저장하는 n-gram 역색인
+
+    게시 목록은 (n-gram, 문서) 기본 키의 WITHOUT ROWID 테이블에 두어 n-gram별로 모여 저장되며,
+    문서는 정수 키로 참조하여 색인 크기를 줄입니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._initialize()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간에 공유하지 않습니다
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """현재 스레드의 연결을 닫습니다. 다음 사용 때 다시 엽니다 (fork 전에 부모의 연결을 정리할 때 사용)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _initialize(self):
+        connection = self._connection()
+        with connection:
+            connection.executescript('''
+                CREATE TABLE IF NOT EXISTS search_docs (
+                    doc INTEGER PRIMARY KEY,
+                    id TEXT NOT NULL UNIQUE,
+                    title TEXT NOT NULL DEFAULT '',
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS search_postings (
+                    term TEXT NOT NULL,
+                    doc INTEGER NOT NULL,
+                    weight REAL NOT NULL,
+                    PRIMARY KEY (term, doc)
+                ) WITHOUT ROWID;
+            ''')
+
+    def add(self, storyboard_id: str, storyboard: Dict, created_at: float = None) -> bool:
+        """스토리보드 하나를 색인에 추가합니다. 이미 색인된 ID이면 False를 반환합니다."""
+        weights = term_weights(storyboard)
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                'INSERT OR IGNORE INTO search_docs (id, title, created_at) VALUES (?, ?, ?)',
+                (storyboard_id, str(storyboard.get('wholeTitle', '')), created_at or time.time())
+            )
+            if cursor.rowcount != 1:
+                return False
+            doc = cursor.lastrowid
+            connection.executemany(
+                'INSERT INTO search_postings (term, doc, weight) VALUES (?, ?, ?)',
+                ((term, doc, weight) for term, weight in weights.items())
+            )
+        return True
+
+    def contains(self, storyboard_id: str) -> bool:
+        return self._connection().execute(
+            'SELECT 1 FROM search_docs WHERE id = ?', (storyboard_id,)
+        ).fetchone() is not None
+
+    def search(self, query: str, page: int = 1, per_page: int = 20) -> Tuple[List[Dict], int]:
+        """query의 n-gram을 모두 포함하는 스토리보드를 점수 순으로 한 페이지 반환합니다 (결과, 전체 개수).
+
+        점수는 n-gram마다 문서 가중치 × idf를 더한 값입니다.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+
+        connection = self._connection()
+        total_docs = connection.execute('SELECT COUNT(*) FROM search_docs').fetchone()[0]
+        frequencies = []
+        for term in terms:
+            df = connection.execute('SELECT COUNT(*) FROM search_postings WHERE term = ?', (term,)).fetchone()[0]
+            if df == 0:
+                return [], 0
+            frequencies.append((df, term))
+        # 가장 드문 n-gram의 게시 목록에서 시작해 나머지는 기본 키로 확인합니다
+        frequencies.sort()
+        frequencies = frequencies[:MAX_QUERY_TERMS]
+
+        joins, score_terms, params = [], [], []
+        for index, (df, term) in enumerate(frequencies):
+            idf = math.log(1 + total_docs / df)
+            score_terms.append(f'p{index}.weight * {idf!r}')
+            if index:
+                joins.append(f'JOIN search_postings p{index} ON p{index}.term = ? AND p{index}.doc = p0.doc')
+                params.append(term)
+        params.append(frequencies[0][1])
+        matches = f"FROM search_postings p0 {' '.join(joins)} WHERE p0.term = ?"
+
+        # 점수 계산과 정렬은 게시 목록만으로 하고, 문서 정보는 한 페이지 분량만 가져옵니다.
+        # 문서 키는 색인 순서대로 늘어나므로 점수가 같으면 나중에 색인된 스토리보드가 먼저 옵니다.
+        offset = (max(1, page) - 1) * per_page
+        rows = connection.execute(
+            'SELECT d.id, d.title, d.created_at, ranked.score, ranked.total FROM ('
+            f"SELECT p0.doc AS doc, {' + '.join(score_terms)} AS score, COUNT(*) OVER () AS total {matches} "
+            'ORDER BY score DESC, p0.doc DESC LIMIT ? OFFSET ?'
+            ') AS ranked JOIN search_docs d ON d.doc = ranked.doc ORDER BY ranked.score DESC, ranked.doc DESC',
+            params + [per_page, offset]
+        ).fetchall()
+        if rows:
+            total = rows[0][4]
+        else:
+            # 마지막 페이지를 넘긴 경우에만 개수를 따로 셉니다
+            total = connection.execute(f'SELECT COUNT(*) {matches}', params).fetchone()[0]
+
+        results = [{
+            'id': storyboard_id,
+            'filename': filename_for(storyboard_id),
+            'title': title,
+            'created_at': datetime.fromtimestamp(created_at).isoformat(),
+            'score': round(score, 3),
+        } for storyboard_id, title, created_at, score, _ in rows]
+        return results, total
+
+    def backfill(self, store, batch_size: int = 100) -> int:
+        """저장소에 있지만 색인에 없는 스토리보드를 추가하고 추가한 개수를 반환합니다.
+
+        저장소 목록은 최신순이므로 마지막 페이지부터 거꾸로 읽어 오래된 것부터 색인합니다.
+        """
+        added = 0
+        _, total = store.list(1, batch_size)
+        for page in range((total + batch_size - 1) // batch_size, 0, -1):
+            records, _ = store.list(page, batch_size)
+            for record in reversed(records):
+                if self.contains(record['id']):
+                    continue
+                storyboard = store.get(record['id'])
+                created_at = datetime.fromisoformat(record['created_at']).timestamp()
+                if storyboard and self.add(record['id'], storyboard, created_at):
+                    added += 1
+        return added
+
+    def stats(self) -> Dict[str, int]:
+        """색인된 문서 수를 반환합니다."""
+        return {
+            'documents': self._connection().execute('SELECT COUNT(*) FROM search_docs').fetchone()[0],
+        }
@@ -0,0 +1,204 @@
+"""
+운영 서버 모듈
+앱을 한 번 불러온 뒤 워커 프로세스를 fork하고, 각 워커는 고정 크기 스레드 풀로 요청을 처리합니다.
+HTTP/1.1 keep-alive를 지원하며, SIGTERM을 받으면 새 연결을 받지 않고
+진행 중인 요청(생성 포함)이 끝날 때까지 기다린 뒤 종료합니다.
+fork를 지원하지 않는 환경(Windows)에서는 스레드 풀 워커 하나로 실행합니다.
+"""
+
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from werkzeug.wsgi import ClosingIterator
+
+
+class InFlightCounter:
+    """응답 본문 전송이 끝날 때까지를 하나의 진행 중인 요청으로 세는 WSGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return self._count
+
+    def _done(self):
+        with self._lock:
+            self._count -= 1
+
+    def __call__(self, environ, start_response):
+        with self._lock:
+            self._count += 1
+        try:
+            body = self.app(environ, start_response)
+        except BaseException:
+            self._done()
+            raise
+        return ClosingIterator(body, self._done)
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """HTTP/1.1 keep-alive 요청 처리기. timeout초 동안 다음 요청이 없으면 연결을 닫습니다."""
+
+    protocol_version = 'HTTP/1.1'
+    timeout = 5
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """연결마다 스레드를 만드는 대신 고정 크기 스레드 풀에서 요청을 처리하는 WSGI 서버
+
+    풀이 모두 사용 중이면 수락한 연결은 풀에서 차례를 기다립니다.
+    """
+
+    multithread = True
+
+    def __init__(self, host: str, port: int, app, threads: int = 8, keepalive: float = 5,
+                 fd: Optional[int] = None):
+        handler = type('BoundKeepAliveRequestHandler', (KeepAliveRequestHandler,), {'timeout': keepalive})
+        super().__init__(host, port, app, handler=handler, fd=fd)
+        self.threads = threads
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='http')
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def _listen(host: str, port: int, backlog: int = 1024) -> socket.socket:
+    """워커들이 함께 사용할 수신 소켓을 엽니다."""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, host: str, port: int, threads: int, keepalive: float, graceful_timeout: float,
+                fd: Optional[int] = None, is_idle: Optional[Callable[[], bool]] = None,
+                on_start: Optional[Callable[[], None]] = None) -> int:
+    """워커 하나를 실행합니다. SIGTERM/SIGINT를 받으면 진행 중인 요청을 마무리하고 종료 코드를 반환합니다."""
+    counter = InFlightCounter(app)
+    server = PooledWSGIServer(host, port, counter, threads=threads, keepalive=keepalive, fd=fd)
+    # 여러 워커가 같은 소켓을 기다리므로, 다른 워커가 먼저 가져간 연결을 accept()에서 기다리며 멈추지 않게 합니다
+    server.socket.setblocking(False)
+    stopping = threading.Event()
+
+    def request_stop(signum, frame):
+        if stopping.is_set():
+            return
+        stopping.set()
+        # serve_forever를 실행 중인 스레드에서 shutdown()을 부르면 멈추므로 다른 스레드에서 호출합니다
+        threading.Thread(target=server.shutdown, name='http-shutdown', daemon=True).start()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    if on_start:
+        threading.Thread(target=on_start, name='worker-start', daemon=True).start()
+
+    print(f"워커 {os.getpid()} 시작 (스레드 {threads}개)")
+    server.serve_forever()
+
+    # 새 연결은 더 받지 않고, 진행 중인 요청과 작업이 끝날 때까지 기다립니다
+    server.socket.close()
+    deadline = time.monotonic() + graceful_timeout
+    while time.monotonic() < deadline:
+        if counter.count == 0 and (is_idle is None or is_idle()):
+            print(f"워커 {os.getpid()} 종료 (진행 중인 요청 없음)")
+            return 0
+        time.sleep(0.1)
+    print(f"워커 {os.getpid()} 종료: {graceful_timeout}초 안에 끝나지 않은 요청 {counter.count}개를 중단합니다.")
+    return 1
+
+
+def serve(app, host: str = '0.0.0.0', port: int = 5000, workers: int = 2, threads: int = 8,
+          keepalive: float = 5, graceful_timeout: float = 120,
+          is_idle: Optional[Callable[[], bool]] = None,
+          on_worker_start: Optional[Callable[[], None]] = None):
+    """이미 불러온 WSGI 앱을 workers개의 프로세스 × threads개의 스레드로 실행합니다.
+
+    - is_idle: 종료 전에 함께 기다릴 작업이 없는지 확인하는 함수 (예: 비동기 작업 워커)
+    - on_worker_start: fork 이후 각 워커에서 실행할 함수 (예: API 연결 예열)
+
+    앱은 fork 전에 불러오므로 워커들이 임포트 결과를 공유하지만, 스레드·연결·메모리 캐시·
+    요청 병합·지표·비동기 작업·수락 제어 상태는 워커마다 따로 가집니다. 부모 프로세스는 종료된 워커를 다시 띄우고,
+    SIGTERM/SIGINT를 받으면 워커에 전달한 뒤 모두 끝날 때까지 기다립니다.
+    """
+    if workers <= 1 or not hasattr(os, 'fork'):
+        code = _run_worker(app, host, port, threads, keepalive, graceful_timeout,
+                           is_idle=is_idle, on_start=on_worker_start)
+        # 남은 keep-alive 연결이나 제한 시간을 넘긴 요청 스레드를 기다리지 않고 종료합니다
+        sys.stdout.flush()
+        os._exit(code)
+
+    sock = _listen(host, port)
+    print(f"운영 서버: http://{host}:{sock.getsockname()[1]} (워커 {workers}개 × 스레드 {threads}개)")
+    children: Dict[int, int] = {}
+    stopping = threading.Event()
+
+    def spawn(slot: int):
+        # 버퍼에 남은 출력이 워커마다 중복되지 않도록 fork 전에 비웁니다
+        sys.stdout.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = _run_worker(app, host, port, threads, keepalive, graceful_timeout,
+                                   fd=sock.fileno(), is_idle=is_idle, on_start=on_worker_start)
+            finally:
+                sys.stdout.flush()
+                os._exit(code)
+        children[pid] = slot
+
+    def request_stop(signum, frame):
+        stopping.set()
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    for slot in range(workers):
+        spawn(slot)
+
+    kill_at = None
+    while children:
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid == 0:
+            if stopping.is_set():
+                # 워커의 정리 시간보다 조금 더 기다린 뒤에도 남아 있으면 강제로 종료합니다
+                kill_at = kill_at or time.monotonic() + graceful_timeout + 5
+                if time.monotonic() > kill_at:
+                    for child in list(children):
+                        os.kill(child, signal.SIGKILL)
+            time.sleep(0.2)
+            continue
+        slot = children.pop(pid, None)
+        if slot is not None and not stopping.is_set():
+            print(f"워커 {pid}가 종료되어 다시 시작합니다 (상태 {status})")
+            spawn(slot)
+
+    sock.close()
+    print("👋 서버가 종료되었습니다.")
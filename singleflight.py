@@ -0,0 +1,97 @@
+"""
+요청 병합(singleflight) 모듈
+같은 키의 작업이 이미 진행 중이면 새로 시작하지 않고 그 결과를 함께 기다립니다.
+생성 버튼을 여러 번 누르거나 느린 응답 중 재시도할 때 중복 API 호출을 막습니다.
+"""
+
+import copy
+import threading
+from typing import Callable, Dict, Optional
+
+import metrics
+
+
+class SingleFlightTimeout(TimeoutError):
+    """진행 중인 작업을 기다리다 제한 시간을 넘긴 경우"""
+
+
+class _Call:
+    """진행 중인 작업 하나와 그 결과"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별로 동시에 하나의 작업만 실행하고, 나머지 호출자는 결과를 공유합니다.
+
+    먼저 도착한 호출자(leader)가 작업을 실행하며, 작업이 끝나면 키가 해제되어
+    이후 호출은 새로 실행됩니다. 작업에서 발생한 예외는 기다리던 호출자에게도 그대로 전달됩니다.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {'leaders': 0, 'coalesced': 0, 'timeouts': 0, 'errors': 0}
+
+    def do(self, key: str, fn: Callable[[], object], timeout: Optional[float] = None):
+        """key에 대해 fn을 실행하거나 진행 중인 실행의 결과를 기다려 반환합니다.
+
+        기다리던 호출자에게는 결과의 복사본을 반환하여 서로의 수정이 섞이지 않게 합니다.
+        timeout(기본값: 생성자 값) 안에 끝나지 않으면 SingleFlightTimeout을 발생시킵니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._stats['leaders'] += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self._stats['coalesced'] += 1
+                leader = False
+
+        if leader:
+            return self._run(key, call, fn)
+
+        metrics.COALESCED_REQUESTS.inc()
+        if not call.done.wait(self.timeout if timeout is None else timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise SingleFlightTimeout("진행 중인 동일 요청의 응답 대기 시간이 초과되었습니다.")
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    def _run(self, key: str, call: _Call, fn: Callable[[], object]):
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        finally:
+            # 결과를 기록한 뒤 키를 해제하고 대기자를 깨웁니다
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """실행/병합/시간 초과/오류 횟수와 진행 중인 작업 수를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+            stats['waiting'] = sum(call.waiters for call in self._calls.values())
+            return stats
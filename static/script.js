@@ -61,25 +61,15 @@ class StoryboardGenerator {
                 pages: formData.get('pages') || ''
             };
 
-            // API 호출
-            const response = await fetch('/api/generate', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(data)
-            });
+            // 스트리밍 API 호출 (지원하지 않는 브라우저는 일반 API 사용)
+            const result = window.ReadableStream && window.TextDecoder
+                ? await this.generateStreaming(data)
+                : await this.generateOnce(data);
 
-            const result = await response.json();
-
-            if (response.ok && result.success) {
-                this.displayResult(result.storyboard);
-                this.currentFilename = result.filename;
-                this.currentStoryboard = result.storyboard;
-                this.currentTextContent = result.text_content;
-            } else {
-                throw new Error(result.error || '스토리보드 생성에 실패했습니다.');
-            }
+            this.displayResult(result.storyboard);
+            this.currentFilename = result.filename;
+            this.currentStoryboard = result.storyboard;
+            this.currentTextContent = result.text_content;
 
         } catch (error) {
             console.error('Error:', error);
@@ -89,6 +79,109 @@ class StoryboardGenerator {
         }
     }
 
+    async generateOnce(data) {
+        const response = await fetch('/api/generate', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (!response.ok || !result.success) {
+            throw new Error(result.error || '스토리보드 생성에 실패했습니다.');
+        }
+        return result;
+    }
+
+    async generateStreaming(data) {
+        const response = await fetch('/api/generate/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json();
+            throw new Error(errorData.error || '스토리보드 생성에 실패했습니다.');
+        }
+
+        this.beginStreamingResult();
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder('utf-8');
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+
+            // SSE 메시지는 빈 줄로 구분됩니다
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const message = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                const result = this.handleStreamEvent(message);
+                if (result) {
+                    reader.cancel();
+                    return result;
+                }
+            }
+        }
+
+        throw new Error('스트리밍 응답이 완료되지 않았습니다.');
+    }
+
+    handleStreamEvent(message) {
+        let event = 'message';
+        let dataText = '';
+        message.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                event = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataText += line.slice(5).trim();
+            }
+        });
+
+        if (!dataText) return null;
+        const value = JSON.parse(dataText);
+
+        switch (event) {
+            case 'wholeTitle':
+                document.getElementById('story-title').textContent = value;
+                break;
+            case 'storyTopic':
+                document.getElementById('story-topic').textContent = value;
+                break;
+            case 'hashtags':
+                this.renderHashtags(value);
+                break;
+            case 'page':
+                document.getElementById('pages-container').appendChild(this.createPageCard(value));
+                break;
+            case 'error':
+                throw new Error(value || '스토리보드 생성에 실패했습니다.');
+            case 'done':
+                return value;
+        }
+        return null;
+    }
+
+    beginStreamingResult() {
+        document.getElementById('story-title').textContent = '';
+        document.getElementById('story-topic').textContent = '';
+        document.getElementById('hashtags').innerHTML = '';
+        document.getElementById('pages-container').innerHTML = '';
+        this.showResult();
+    }
+
     setLoading(isLoading) {
         const btnText = this.generateBtn.querySelector('.btn-text');
         const spinner = this.generateBtn.querySelector('.loading-spinner');
@@ -110,14 +203,7 @@ class StoryboardGenerator {
         document.getElementById('story-topic').textContent = storyboard.storyTopic;
         
         // 해시태그 표시
-        const hashtagsContainer = document.getElementById('hashtags');
-        hashtagsContainer.innerHTML = '';
-        storyboard.hashtags.forEach(tag => {
-            const span = document.createElement('span');
-            span.className = 'hashtag';
-            span.textContent = tag;
-            hashtagsContainer.appendChild(span);
-        });
+        this.renderHashtags(storyboard.hashtags);
 
         // 페이지들 표시
         const pagesContainer = document.getElementById('pages-container');
@@ -132,12 +218,28 @@ class StoryboardGenerator {
         this.showResult();
     }
 
+    renderHashtags(hashtags) {
+        const hashtagsContainer = document.getElementById('hashtags');
+        hashtagsContainer.innerHTML = '';
+        hashtags.forEach(tag => {
+            const span = document.createElement('span');
+            span.className = 'hashtag';
+            span.textContent = tag;
+            hashtagsContainer.appendChild(span);
+        });
+    }
+
     createPageCard(page) {
         const card = document.createElement('div');
         card.className = 'page-card';
         
+        card.dataset.page = page.page;
+        
         card.innerHTML = `
-            <div class="page-number">페이지 ${page.page}</div>
+            <div class="page-header">
+                <div class="page-number">페이지 ${page.page}</div>
+                <button type="button" class="regenerate-page-btn">이 페이지 다시 만들기</button>
+            </div>
             <div class="page-content">
                 <div class="content-section">
                     <div class="content-label">등장인물</div>
@@ -167,9 +269,57 @@ class StoryboardGenerator {
             </div>
         `;
         
+        card.querySelector('.regenerate-page-btn').addEventListener('click', () => this.regeneratePage(page.page, card));
+        
         return card;
     }
 
+    async regeneratePage(pageNumber, card) {
+        if (!this.currentStoryboard) {
+            this.showError('다시 만들 스토리보드가 없습니다.');
+            return;
+        }
+
+        const instructions = window.prompt(`${pageNumber}페이지 수정 요청 (선택사항)`, '');
+        if (instructions === null) return;
+
+        const button = card.querySelector('.regenerate-page-btn');
+        button.disabled = true;
+        button.textContent = '다시 만드는 중...';
+        this.hideError();
+
+        try {
+            const response = await fetch('/api/regenerate-page', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    storyboard: this.currentStoryboard,
+                    page: pageNumber,
+                    instructions: instructions
+                })
+            });
+
+            const result = await response.json();
+
+            if (!response.ok || !result.success) {
+                throw new Error(result.error || '페이지 재생성에 실패했습니다.');
+            }
+
+            this.currentStoryboard = result.storyboard;
+            this.currentTextContent = result.text_content;
+            this.currentFilename = result.filename;
+            card.replaceWith(this.createPageCard(result.page));
+
+        } catch (error) {
+            console.error('페이지 재생성 오류:', error);
+            this.showError(error.message || '네트워크 오류가 발생했습니다.');
+            button.disabled = false;
+            button.textContent = '이 페이지 다시 만들기';
+        }
+    }
+
     async downloadDOCX() {
         if (!this.currentStoryboard) {
             this.showError('다운로드할 스토리보드가 없습니다.');
@@ -0,0 +1,233 @@
+"""
+스토리보드 저장소 모듈
+생성된 스토리보드를 SQLite(WAL 모드) 또는 JSON 파일로 저장하고 조회합니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+# 다운로드 파일명 형식: storyboard_<id>.json
+_ID_PATTERN = re.compile(r'^[A-Za-z0-9_]{1,64}$')
+_FILENAME_PATTERN = re.compile(r'^storyboard_([A-Za-z0-9_]{1,64})\.json$')
+
+
+def content_hash(storyboard: Dict) -> str:
+    """스토리보드 내용의 SHA-256 해시 (키 순서와 무관)"""
+    encoded = json.dumps(storyboard, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def filename_for(storyboard_id: str) -> str:
+    """저장 ID에 해당하는 다운로드 파일명"""
+    return f"storyboard_{storyboard_id}.json"
+
+
+def id_from_filename(filename: str) -> Optional[str]:
+    """다운로드 파일명에서 저장 ID를 추출합니다. 형식이 다르면 None을 반환합니다."""
+    match = _FILENAME_PATTERN.match(filename or '')
+    return match.group(1) if match else None
+
+
+def _record(storyboard_id: str, title: str, created_at: float, deduplicated: bool = False) -> Dict:
+    return {
+        'id': storyboard_id,
+        'filename': filename_for(storyboard_id),
+        'title': title,
+        'created_at': datetime.fromtimestamp(created_at).isoformat(),
+        'deduplicated': deduplicated,
+    }
+
+
+class SQLiteStoryboardStore:
+    """SQLite 기반 스토리보드 저장소
+
+    - WAL 모드로 읽기와 쓰기가 서로를 막지 않습니다.
+    - 내용 해시에 UNIQUE 제약을 두어 같은 스토리보드는 한 번만 저장합니다.
+    - 생성 시각과 제목에 인덱스를 두어 목록 조회와 제목 검색을 빠르게 합니다.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._initialize()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간에 공유하지 않습니다
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """현재 스레드의 연결을 닫습니다. 다음 사용 때 다시 엽니다 (fork 전에 부모의 연결을 정리할 때 사용)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _initialize(self):
+        connection = self._connection()
+        with connection:
+            connection.executescript('''
+                CREATE TABLE IF NOT EXISTS storyboards (
+                    id TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL UNIQUE,
+                    title TEXT NOT NULL DEFAULT '',
+                    created_at REAL NOT NULL,
+                    body TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_storyboards_created_at ON storyboards (created_at);
+                CREATE INDEX IF NOT EXISTS idx_storyboards_title ON storyboards (title);
+            ''')
+
+    def save(self, storyboard: Dict) -> Dict:
+        """스토리보드를 저장하고 저장 정보를 반환합니다. 같은 내용이 있으면 기존 항목을 반환합니다."""
+        digest = content_hash(storyboard)
+        title = str(storyboard.get('wholeTitle', ''))
+        storyboard_id = uuid.uuid4().hex
+        created_at = time.time()
+        body = json.dumps(storyboard, ensure_ascii=False)
+
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                'INSERT OR IGNORE INTO storyboards (id, content_hash, title, created_at, body) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (storyboard_id, digest, title, created_at, body)
+            )
+            if cursor.rowcount == 1:
+                return _record(storyboard_id, title, created_at)
+
+            existing_id, existing_title, existing_created_at = connection.execute(
+                'SELECT id, title, created_at FROM storyboards WHERE content_hash = ?', (digest,)
+            ).fetchone()
+        return _record(existing_id, existing_title, existing_created_at, deduplicated=True)
+
+    def get_raw(self, storyboard_id: str) -> Optional[str]:
+        """저장된 JSON 문자열을 그대로 반환합니다 (다운로드용, 재직렬화 없음)."""
+        if not _ID_PATTERN.match(storyboard_id or ''):
+            return None
+        row = self._connection().execute(
+            'SELECT body FROM storyboards WHERE id = ?', (storyboard_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get(self, storyboard_id: str) -> Optional[Dict]:
+        """저장된 스토리보드를 반환합니다."""
+        raw = self.get_raw(storyboard_id)
+        return json.loads(raw) if raw is not None else None
+
+    def list(self, page: int = 1, per_page: int = 20, title_prefix: str = '') -> Tuple[List[Dict], int]:
+        """최신순 목록의 한 페이지와 전체 개수를 반환합니다. title_prefix로 제목 앞부분을 거를 수 있습니다."""
+        offset = (max(1, page) - 1) * per_page
+        where, params = '', []
+        if title_prefix:
+            # 범위 조건으로 작성하여 제목 인덱스를 사용합니다
+            where = 'WHERE title >= ? AND title < ?'
+            params = [title_prefix, title_prefix + '\U0010ffff']
+
+        connection = self._connection()
+        total = connection.execute(f'SELECT COUNT(*) FROM storyboards {where}', params).fetchone()[0]
+        rows = connection.execute(
+            f'SELECT id, title, created_at FROM storyboards {where} '
+            'ORDER BY created_at DESC LIMIT ? OFFSET ?',
+            params + [per_page, offset]
+        ).fetchall()
+        return [_record(*row) for row in rows], total
+
+
+class JSONFileStoryboardStore:
+    """JSON 파일 기반 저장소 (기존 동작과 같은 파일 저장 방식의 대체 백엔드)
+
+    파일명에 타임스탬프와 임의 접미사를 붙여 같은 초에 저장해도 덮어쓰지 않습니다.
+    """
+
+    backend = 'json'
+
+    def __init__(self, directory: str = '.'):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def close(self):
+        """열어 둔 연결이 없으므로 아무 것도 하지 않습니다 (SQLite 저장소와 같은 인터페이스)."""
+
+    def _path(self, storyboard_id: str) -> Optional[str]:
+        if not _ID_PATTERN.match(storyboard_id or ''):
+            return None
+        return os.path.join(self.directory, filename_for(storyboard_id))
+
+    def save(self, storyboard: Dict) -> Dict:
+        """스토리보드를 새 JSON 파일로 저장하고 저장 정보를 반환합니다."""
+        created_at = time.time()
+        timestamp = datetime.fromtimestamp(created_at).strftime('%Y%m%d_%H%M%S')
+        storyboard_id = f"{timestamp}_{uuid.uuid4().hex[:8]}"
+        with open(self._path(storyboard_id), 'x', encoding='utf-8') as f:
+            json.dump(storyboard, f, ensure_ascii=False, indent=2)
+        return _record(storyboard_id, str(storyboard.get('wholeTitle', '')), created_at)
+
+    def get_raw(self, storyboard_id: str) -> Optional[str]:
+        path = self._path(storyboard_id)
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def get(self, storyboard_id: str) -> Optional[Dict]:
+        raw = self.get_raw(storyboard_id)
+        return json.loads(raw) if raw is not None else None
+
+    def list(self, page: int = 1, per_page: int = 20, title_prefix: str = '') -> Tuple[List[Dict], int]:
+        """파일명(타임스탬프) 역순으로 목록을 반환합니다. 제목 필터는 파일을 읽어야 하므로 느립니다."""
+        ids = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                storyboard_id = id_from_filename(entry.name)
+                if storyboard_id and entry.is_file():
+                    ids.append((entry.stat().st_mtime, storyboard_id))
+        ids.sort(reverse=True)
+
+        offset = (max(1, page) - 1) * per_page
+        if not title_prefix:
+            # 필터가 없으면 요청한 페이지의 파일만 읽습니다
+            records = []
+            for created_at, storyboard_id in ids[offset:offset + per_page]:
+                storyboard = self.get(storyboard_id) or {}
+                records.append(_record(storyboard_id, str(storyboard.get('wholeTitle', '')), created_at))
+            return records, len(ids)
+
+        records = []
+        for created_at, storyboard_id in ids:
+            storyboard = self.get(storyboard_id) or {}
+            title = str(storyboard.get('wholeTitle', ''))
+            if title.startswith(title_prefix):
+                records.append(_record(storyboard_id, title, created_at))
+        return records[offset:offset + per_page], len(records)
+
+
+def create_store(backend: str, sqlite_path: str, json_dir: str):
+    """설정에 맞는 저장소를 생성합니다. SQLite를 열 수 없으면 JSON 파일 저장소로 대체합니다."""
+    if backend == 'sqlite':
+        try:
+            return SQLiteStoryboardStore(sqlite_path)
+        except (sqlite3.Error, OSError) as e:
+            print(f"SQLite 저장소를 열 수 없어 JSON 파일 저장소를 사용합니다: {e}")
+    return JSONFileStoryboardStore(json_dir)
@@ -0,0 +1,357 @@
+"""
+스토리보드 모델·정규화 모듈
+GPT 응답의 스토리보드가 스키마와 조금 다를 때(문자열 페이지 번호, 문자열 등장인물,
+"이름: 대사" 목록 형태의 대사, 빠지거나 뒤섞인 페이지 번호 등) 다시 생성하지 않고 로컬에서 고칩니다.
+텍스트·DOCX 변환은 정규화된 스토리보드를 __slots__ 모델 클래스로 읽어 필드 형식 차이로 실패하지 않습니다.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from storyboard_schema import validate_storyboard
+
+
+# 대사의 화자를 알 수 없을 때 사용하는 이름
+NARRATION = '나레이션'
+
+# GPT가 자주 바꿔 쓰는 필드 이름 → 스키마 필드 이름
+STORYBOARD_ALIASES = {'title': 'wholeTitle', 'topic': 'storyTopic', 'tags': 'hashtags'}
+PAGE_ALIASES = {
+    'pageNumber': 'page',
+    'characters': 'character',
+    'dialogues': 'dialogue',
+    'expression_pose': 'expressionPose',
+    'expression': 'expressionPose',
+}
+TOP_LEVEL_FIELDS = ('wholeTitle', 'storyTopic', 'hashtags', 'pages')
+# 대사 목록의 {"character": ..., "line": ...} 형태에서 화자·대사로 쓰는 키
+_SPEAKER_KEYS = ('character', 'name', 'speaker', '캐릭터', '이름')
+_LINE_KEYS = ('line', 'text', 'dialogue', '대사')
+
+_NUMBER = re.compile(r'\d+')
+_NAME_SEPARATORS = re.compile(r'\s*[,、/·\n]\s*')
+_HASHTAG_SEPARATORS = re.compile(r'[\s,]+')
+_DIALOGUE_LINE = re.compile(r'\s*([^:：\n]{1,30}?)\s*[:：]\s*(.*?)\s*$', re.DOTALL)
+
+Note = Callable[[str], None]
+
+
+class Page:
+    """스토리보드의 한 페이지"""
+
+    __slots__ = ('number', 'characters', 'background', 'dialogue', 'expression_pose')
+
+    def __init__(self, number: int, characters: List[str], background: str, dialogue: Dict[str, str],
+                 expression_pose: str):
+        self.number = number
+        self.characters = characters
+        self.background = background
+        self.dialogue = dialogue
+        self.expression_pose = expression_pose
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Page':
+        """정규화된 페이지 dict로 만듭니다. 형식은 다시 검사하지 않습니다."""
+        return cls(data['page'], data['character'], data['background'], data['dialogue'], data['expressionPose'])
+
+    def to_dict(self) -> Dict:
+        return {
+            'page': self.number,
+            'character': self.characters,
+            'background': self.background,
+            'dialogue': self.dialogue,
+            'expressionPose': self.expression_pose,
+        }
+
+
+class Storyboard:
+    """제목·주제·해시태그와 페이지 목록으로 이루어진 스토리보드"""
+
+    __slots__ = ('title', 'topic', 'hashtags', 'pages')
+
+    def __init__(self, title: str, topic: str, hashtags: List[str], pages: List[Page]):
+        self.title = title
+        self.topic = topic
+        self.hashtags = hashtags
+        self.pages = pages
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Storyboard':
+        """정규화된 스토리보드 dict로 만듭니다. 형식은 다시 검사하지 않습니다."""
+        return cls(data['wholeTitle'], data['storyTopic'], data['hashtags'],
+                   [Page.from_dict(page) for page in data['pages']])
+
+    def to_dict(self) -> Dict:
+        return {
+            'wholeTitle': self.title,
+            'storyTopic': self.topic,
+            'hashtags': self.hashtags,
+            'pages': [page.to_dict() for page in self.pages],
+        }
+
+
+@dataclass
+class NormalizationResult:
+    """스토리보드 정규화 결과
+
+    storyboard는 형식을 고친 새 dict이며, 살릴 수 있는 페이지가 하나도 없으면 None입니다.
+    제목·주제·해시태그가 없으면 채우지 않으므로 사용하기 전에 validate_storyboard로 확인해야 합니다.
+    dropped는 복구할 수 없어 제외한 페이지의 원래 위치(0부터)입니다.
+    """
+    storyboard: Optional[Dict]
+    repairs: List[str] = field(default_factory=list)
+    dropped: List[int] = field(default_factory=list)
+
+
+def _rename(value: Dict, aliases: Dict[str, str], note: Note) -> Dict:
+    if not any(alias in value for alias in aliases):
+        return value
+    renamed = {}
+    for key, item in value.items():
+        target = aliases.get(key)
+        if target is None:
+            renamed[key] = item
+        elif target not in value:
+            renamed[target] = item
+            note('renamed_field')
+    return renamed
+
+
+def _text(value: Any, note: Note) -> str:
+    if isinstance(value, str):
+        return value
+    if value is None:
+        note('missing_field')
+        return ''
+    if isinstance(value, list):
+        note('list_to_text')
+        return ', '.join(_text(item, note) for item in value if item is not None)
+    if isinstance(value, dict):
+        note('list_to_text')
+        return ', '.join(f"{key}: {_text(item, note)}" for key, item in value.items())
+    note('non_string')
+    return str(value)
+
+
+def _string_list(value: Any, separators, note: Note) -> List[str]:
+    if isinstance(value, list):
+        if all(isinstance(item, str) and item for item in value):
+            return value
+        note('non_string')
+        return [_text(item, note) for item in value if item not in (None, '')]
+    if value is None:
+        note('missing_field')
+        return []
+    if isinstance(value, dict):
+        note('string_to_list')
+        return [str(key) for key in value]
+    note('string_to_list')
+    return [item for item in separators.split(_text(value, note).strip()) if item]
+
+
+def _hashtags(value: Any, note: Note) -> List[str]:
+    return _string_list(value, _HASHTAG_SEPARATORS, note)
+
+
+def _split_line(text: str) -> Tuple[str, str]:
+    """"이름: 대사" 형태를 (이름, 대사)로 나눕니다. 이름이 없으면 나레이션으로 봅니다."""
+    match = _DIALOGUE_LINE.match(text)
+    if match and match.group(2):
+        return match.group(1), match.group(2)
+    return NARRATION, text.strip()
+
+
+def _dialogue(value: Any, note: Note) -> Dict[str, str]:
+    if isinstance(value, dict):
+        if all(isinstance(line, str) for line in value.values()):
+            return value
+        note('non_string')
+        return {str(name): (' '.join(_text(item, note) for item in line) if isinstance(line, list)
+                            else _text(line, note))
+                for name, line in value.items()}
+    if value is None:
+        note('missing_field')
+        return {}
+
+    if isinstance(value, str):
+        note('dialogue_string')
+        items = [line for line in value.splitlines() if line.strip()]
+    elif isinstance(value, list):
+        note('dialogue_list')
+        items = value
+    else:
+        note('non_string')
+        items = [_text(value, note)]
+
+    pairs = []
+    for item in items:
+        if isinstance(item, dict):
+            speaker = next((item[key] for key in _SPEAKER_KEYS if key in item), None)
+            line = next((item[key] for key in _LINE_KEYS if key in item), None)
+            if line is not None:
+                pairs.append((_text(speaker, note) if speaker is not None else NARRATION, _text(line, note)))
+            else:
+                pairs.extend((str(name), _text(text, note)) for name, text in item.items())
+        elif isinstance(item, list) and len(item) == 2:
+            pairs.append((_text(item[0], note), _text(item[1], note)))
+        elif item is not None:
+            pairs.append(_split_line(_text(item, note)))
+
+    # 같은 화자의 대사가 여러 줄이면 한 줄로 잇습니다 (대사는 화자를 키로 하는 객체)
+    dialogue: Dict[str, str] = {}
+    for name, line in pairs:
+        dialogue[name] = f"{dialogue[name]} {line}" if name in dialogue else line
+    return dialogue
+
+
+def _page_number(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        match = _NUMBER.search(value)
+        if match:
+            return int(match.group())
+    return None
+
+
+def _normalize_page(value: Any, note: Note) -> Optional[Dict]:
+    """페이지 하나를 스키마 형식으로 고칩니다.
+
+    배경·대사·표정/포즈가 모두 비어 있거나 객체가 아니면 복구할 수 없는 페이지로 보고 None을 반환합니다.
+    페이지 번호를 알 수 없으면 'page'는 None이며, normalize_storyboard에서 다시 매깁니다.
+    """
+    if not isinstance(value, dict):
+        return None
+    value = _rename(value, PAGE_ALIASES, note)
+
+    number = value.get('page')
+    page_number = _page_number(number)
+    if page_number is not None and not (isinstance(number, int) and not isinstance(number, bool)):
+        note('page_number_string')
+
+    dialogue = _dialogue(value.get('dialogue'), note)
+    background = _text(value.get('background'), note)
+    expression_pose = _text(value.get('expressionPose'), note)
+    if not (dialogue or background.strip() or expression_pose.strip()):
+        return None
+
+    characters = _string_list(value.get('character'), _NAME_SEPARATORS, note)
+    if not characters and dialogue:
+        note('character_from_dialogue')
+        characters = [name for name in dialogue if name != NARRATION]
+
+    page = {
+        'page': page_number,
+        'character': characters,
+        'background': background,
+        'dialogue': dialogue,
+        'expressionPose': expression_pose,
+    }
+    for key, item in value.items():
+        page.setdefault(key, item)
+    return page
+
+
+def _pages(value: Any, note: Note) -> Optional[List[Any]]:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        # {"1": {...}, "2": {...}} 처럼 페이지 번호를 키로 한 객체
+        note('pages_object')
+        pages = []
+        for key, page in value.items():
+            if isinstance(page, dict) and 'page' not in page:
+                page = dict(page, page=key)
+            pages.append(page)
+        return pages
+    return None
+
+
+def _collector() -> Tuple[List[str], Note]:
+    repairs: List[str] = []
+
+    def note(name: str):
+        if name not in repairs:
+            repairs.append(name)
+    return repairs, note
+
+
+def normalize_page(value: Any) -> Tuple[Optional[Dict], List[str]]:
+    """페이지 하나를 정규화하여 (페이지, 적용한 수정 목록)을 반환합니다. 복구할 수 없으면 페이지는 None입니다."""
+    repairs, note = _collector()
+    return _normalize_page(value, note), repairs
+
+
+def normalize_storyboard(value: Any) -> NormalizationResult:
+    """스토리보드를 스키마 형식으로 고치고, 페이지를 번호순으로 정렬해 1부터 다시 매깁니다.
+
+    값이 이미 올바르면 같은 내용의 dict를 반환하고 repairs는 비어 있습니다.
+    적용한 수정은 repairs에 이름으로 기록됩니다:
+    renamed_field, unwrapped, missing_field, non_string, list_to_text, string_to_list,
+    dialogue_list, dialogue_string, character_from_dialogue, page_number_string,
+    pages_object, pages_reordered, pages_renumbered, page_dropped
+    """
+    repairs, note = _collector()
+    if not isinstance(value, dict):
+        return NormalizationResult(None, repairs)
+    # {"storyboard": {...}} 처럼 한 번 감싸서 응답한 경우
+    if 'pages' not in value and isinstance(value.get('storyboard'), dict):
+        note('unwrapped')
+        value = value['storyboard']
+    value = _rename(value, STORYBOARD_ALIASES, note)
+
+    raw_pages = _pages(value.get('pages'), note)
+    if not raw_pages:
+        return NormalizationResult(None, repairs)
+
+    pages, dropped = [], []
+    for index, raw_page in enumerate(raw_pages):
+        page = _normalize_page(raw_page, note)
+        if page is None:
+            dropped.append(index)
+        else:
+            pages.append(page)
+    if dropped:
+        note('page_dropped')
+    if not pages:
+        return NormalizationResult(None, repairs, dropped)
+
+    # 번호가 모두 있고 겹치지 않을 때만 번호순으로 정렬하고, 아니면 응답 순서를 따릅니다
+    numbers = [page['page'] for page in pages]
+    if None not in numbers and len(set(numbers)) == len(numbers) and numbers != sorted(numbers):
+        note('pages_reordered')
+        pages.sort(key=lambda page: page['page'])
+    for number, page in enumerate(pages, 1):
+        if page['page'] != number:
+            note('pages_renumbered')
+            page['page'] = number
+
+    # 제목·주제·해시태그는 대신 채울 수 없으므로, 없으면 그대로 두어 스키마 검증에서 거절되게 합니다
+    storyboard = {}
+    for key, convert in (('wholeTitle', _text), ('storyTopic', _text), ('hashtags', _hashtags)):
+        if value.get(key) is not None:
+            storyboard[key] = convert(value[key], note)
+    storyboard['pages'] = pages
+    for key, item in value.items():
+        if key not in TOP_LEVEL_FIELDS:
+            storyboard[key] = item
+    return NormalizationResult(storyboard, repairs, dropped)
+
+
+def load_storyboard(value: Any) -> Storyboard:
+    """저장되었거나 외부에서 받은 스토리보드를 정규화하여 모델로 읽습니다.
+
+    살릴 수 있는 페이지가 없거나 정규화 후에도 스키마에 맞지 않으면 ValueError가 발생합니다.
+    """
+    normalization = normalize_storyboard(value)
+    if normalization.storyboard is None:
+        raise ValueError("스토리보드에 사용할 수 있는 페이지가 없습니다.")
+    errors = validate_storyboard(normalization.storyboard)
+    if errors:
+        raise ValueError(f"스토리보드 형식이 올바르지 않습니다: {errors[0]}")
+    return Storyboard.from_dict(normalization.storyboard)
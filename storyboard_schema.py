@@ -0,0 +1,121 @@
+"""
+스토리보드 스키마 모듈
+프롬프트 템플릿의 출력형식과 같은 구조를 JSON Schema로 정의하고,
+시작 시 한 번 컴파일한 검증기로 스토리보드 전체를 한 번에 검사합니다.
+"""
+
+from typing import Any, Callable, Dict, List
+
+
+# InstaToonGenerator._load_prompt_template()의 ###출력형식 과 같은 구조
+PAGE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "page": {"type": "integer"},
+        "character": {"type": "array", "items": {"type": "string"}},
+        "background": {"type": "string"},
+        # 대사는 캐릭터 이름을 키로 하는 객체입니다
+        "dialogue": {"type": "object", "additionalProperties": {"type": "string"}},
+        "expressionPose": {"type": "string"},
+    },
+    "required": ["page", "character", "background", "dialogue", "expressionPose"],
+}
+
+STORYBOARD_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "wholeTitle": {"type": "string"},
+        "storyTopic": {"type": "string"},
+        "hashtags": {"type": "array", "items": {"type": "string"}},
+        "pages": {"type": "array", "items": PAGE_SCHEMA, "minItems": 1},
+    },
+    "required": ["wholeTitle", "storyTopic", "hashtags", "pages"],
+}
+
+
+def response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """chat/completions 요청의 response_format 값을 만듭니다.
+
+    대사 객체의 키가 캐릭터 이름이라 고정할 수 없으므로 strict 모드는 사용하지 않습니다.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema, "strict": False},
+    }
+
+
+Validator = Callable[[Any, str, List[str]], None]
+
+_TYPE_CHECKS = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+}
+
+
+def _compile(schema: Dict[str, Any]) -> Validator:
+    """스키마 노드를 검사 함수로 변환합니다 (type, properties, required,
+    additionalProperties, items, minItems 만 지원)."""
+    schema_type = schema.get("type")
+    type_check = _TYPE_CHECKS.get(schema_type)
+
+    if schema_type == "object":
+        required = tuple(schema.get("required", ()))
+        properties = {key: _compile(sub) for key, sub in schema.get("properties", {}).items()}
+        extra = schema.get("additionalProperties")
+        extra_validator = _compile(extra) if isinstance(extra, dict) else None
+
+        def validate_object(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: object가 필요합니다")
+                return
+            for key in required:
+                if key not in value:
+                    errors.append(f"{path}.{key}: 필수 필드가 없습니다")
+            for key, item in value.items():
+                validator = properties.get(key, extra_validator)
+                if validator is not None:
+                    validator(item, f"{path}.{key}", errors)
+        return validate_object
+
+    if schema_type == "array":
+        item_validator = _compile(schema["items"]) if "items" in schema else None
+        min_items = schema.get("minItems", 0)
+
+        def validate_array(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: array가 필요합니다")
+                return
+            if len(value) < min_items:
+                errors.append(f"{path}: 최소 {min_items}개 항목이 필요합니다")
+            if item_validator is not None:
+                for index, item in enumerate(value):
+                    item_validator(item, f"{path}[{index}]", errors)
+        return validate_array
+
+    def validate_scalar(value, path, errors):
+        if type_check is not None and not type_check(value):
+            errors.append(f"{path}: {schema_type}이(가) 필요합니다")
+    return validate_scalar
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], List[str]]:
+    """스키마를 검증 함수로 컴파일합니다. 반환된 함수는 오류 메시지 목록을 돌려줍니다."""
+    validator = _compile(schema)
+
+    def validate(value: Any) -> List[str]:
+        errors: List[str] = []
+        validator(value, "$", errors)
+        return errors
+    return validate
+
+
+# 모듈 로드 시 한 번만 컴파일합니다
+validate_storyboard = compile_schema(STORYBOARD_SCHEMA)
+validate_page = compile_schema(PAGE_SCHEMA)
+
+STORYBOARD_RESPONSE_FORMAT = response_format("instatoon_storyboard", STORYBOARD_SCHEMA)
+PAGE_RESPONSE_FORMAT = response_format("instatoon_page", PAGE_SCHEMA)
@@ -0,0 +1,18 @@
+import pytest
+
+from upstream_stub import StubUpstream
+
+
+@pytest.fixture
+def stub_upstream():
+    """StubUpstream을 만드는 함수. 테스트가 끝나면 서버를 모두 닫습니다."""
+    stubs = []
+
+    def start(respond=None, delay=0.0):
+        stub = StubUpstream(respond, delay)
+        stubs.append(stub)
+        return stub
+
+    yield start
+    for stub in stubs:
+        stub.close()
@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected
+from app import app
+from config import Config
+
+
+def test_client_burst_is_rate_limited_per_client():
+    controller = AdmissionController(requests_per_minute=60, burst=2)
+
+    for _ in range(2):
+        with controller.admit('a'):
+            pass
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire('a')
+
+    assert rejected.value.reason == 'rate_limited'
+    assert rejected.value.retry_after_header == '1'
+    with controller.admit('b'):
+        pass
+    assert controller.stats()['rate_limited'] == 1
+
+
+def test_refund_returns_the_clients_token():
+    controller = AdmissionController(requests_per_minute=1, burst=1)
+
+    with controller.admit('a'):
+        controller.refund('a')
+    with controller.admit('a'):
+        pass
+    with pytest.raises(AdmissionRejected):
+        controller.acquire('a')
+
+
+def test_overload_rejection_does_not_spend_a_token():
+    controller = AdmissionController(max_in_flight=1, max_waiting=0, requests_per_minute=1, burst=1)
+    controller.acquire('busy')
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire('a')
+    assert rejected.value.reason == 'overloaded'
+
+    controller.release()
+    with controller.admit('a'):
+        pass
+
+
+def test_queued_request_is_admitted_when_a_slot_frees():
+    controller = AdmissionController(max_in_flight=1, max_waiting=1, wait_timeout=2, requests_per_minute=0)
+    controller.acquire('first')
+    threading.Timer(0.05, controller.release).start()
+
+    started = time.monotonic()
+    with controller.admit('second'):
+        assert controller.stats()['in_flight'] == 1
+
+    assert time.monotonic() - started < 1
+    assert controller.stats()['queued'] == 1
+
+
+def test_queued_request_times_out():
+    controller = AdmissionController(max_in_flight=1, max_waiting=1, wait_timeout=0.05, requests_per_minute=0)
+    controller.acquire('first')
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire('second')
+
+    assert rejected.value.reason == 'overloaded'
+    assert controller.stats()['waiting'] == 0
+
+
+def test_slot_is_released_when_the_view_raises():
+    controller = AdmissionController(max_in_flight=1, max_waiting=0, requests_per_minute=0)
+
+    with pytest.raises(RuntimeError):
+        with controller.admit('a'):
+            raise RuntimeError('view failed')
+
+    assert controller.stats()['in_flight'] == 0
+
+
+def test_invalid_generation_requests_are_refunded():
+    client = app.test_client()
+    for _ in range(Config.CLIENT_BURST + 3):
+        response = client.post('/api/generate', json={'plot': ''})
+        assert response.status_code == 400
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from async_gpt_client import AsyncEndpointPool, AsyncGPTClient, AsyncHTTPError, AsyncHTTPTransport
+from gpt_client import GPTConfig
+from upstream_stub import completion
+
+
+STORYBOARD = {
+    'wholeTitle': '비 오는 날',
+    'storyTopic': '작은 친절',
+    'hashtags': ['#인스타툰'],
+    'pages': [{
+        'page': number,
+        'character': ['지민'],
+        'background': '버스 정류장',
+        'dialogue': {'지민': '우산 같이 쓸래요?'},
+        'expressionPose': '웃는 얼굴',
+    } for number in (1, 2)],
+}
+CONTENT = json.dumps(STORYBOARD, ensure_ascii=False)
+
+
+def client_for(*stubs, **overrides):
+    settings = dict(api_key='sk-test', base_url=stubs[0].base_url, backoff_base=0.01, backoff_max=0.01)
+    if len(stubs) > 1:
+        settings['endpoints'] = [{'base_url': stub.base_url, 'api_key': f'key-{index}', 'weight': 1.0}
+                                 for index, stub in enumerate(stubs)]
+    settings.update(overrides)
+    return AsyncGPTClient(GPTConfig(**settings))
+
+
+async def generate(client, *args, **kwargs):
+    async with client:
+        return await client.generate_storyboard(*args, **kwargs)
+
+
+def test_generate_storyboard_reuses_the_connection(stub_upstream):
+    stub = stub_upstream(lambda request: (200, completion(CONTENT), {}))
+    client = client_for(stub)
+
+    async def run():
+        async with client:
+            first = await client.generate_storyboard('프롬프트')
+            second = await client.generate_storyboard('프롬프트')
+            return first, second, client.get_transport_stats()
+
+    first, second, stats = asyncio.run(run())
+
+    assert first == second == STORYBOARD
+    assert stats['connections_opened'] == 1
+    assert stats['connections_reused'] == 1
+    assert stub.requests[0]['authorization'] == 'Bearer sk-test'
+
+
+def test_gather_bounds_concurrency_and_keeps_order(stub_upstream):
+    lock = threading.Lock()
+    active = {'now': 0, 'max': 0}
+
+    def respond(request):
+        with lock:
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+        time.sleep(0.05)
+        with lock:
+            active['now'] -= 1
+        title = request['messages'][-1]['content']
+        return 200, completion(json.dumps(dict(STORYBOARD, wholeTitle=title), ensure_ascii=False)), {}
+
+    client = client_for(stub_upstream(respond))
+
+    async def run():
+        async with client:
+            return await client.gather_storyboards([f'제목 {index}' for index in range(6)], concurrency=3)
+
+    results = asyncio.run(run())
+
+    assert [result['wholeTitle'] for result in results] == [f'제목 {index}' for index in range(6)]
+    assert active['max'] == 3
+
+
+def test_cancel_event_skips_pending_prompts(stub_upstream):
+    stub = stub_upstream(lambda request: (200, completion(CONTENT), {}), delay=0.2)
+    client = client_for(stub)
+
+    async def run():
+        cancel = asyncio.Event()
+        async with client:
+            task = asyncio.ensure_future(client.gather_storyboards(['a', 'b', 'c', 'd'], concurrency=1,
+                                                                   cancel_event=cancel))
+            await asyncio.sleep(0.05)
+            cancel.set()
+            return await task
+
+    assert asyncio.run(run()) == [None] * 4
+    assert len(stub.requests) == 1
+
+
+def test_page_budget_and_continuation_match_the_sync_client(stub_upstream):
+    cut = len(CONTENT) // 2
+
+    def respond(request):
+        if request['messages'][-2]['role'] == 'assistant':
+            return 200, completion(CONTENT[cut - 10:], completion_tokens=80), {}
+        return 200, completion(CONTENT[:cut], finish_reason='length', completion_tokens=100), {}
+
+    stub = stub_upstream(respond)
+    client = client_for(stub)
+    expected_budget = client.token_budget.budget(2)
+
+    storyboard = asyncio.run(generate(client, '프롬프트', pages=2))
+
+    assert storyboard == STORYBOARD
+    assert stub.requests[0]['body']['max_tokens'] == expected_budget
+    assert stub.requests[1]['body']['messages'][-2] == {'role': 'assistant', 'content': CONTENT[:cut]}
+    assert client.get_token_budget_stats()['truncations'] == 1
+
+
+def test_endpoint_pool_fails_over_with_each_endpoint_key(stub_upstream):
+    failing = stub_upstream(lambda request: (503, {'error': {'message': 'busy'}}, {}))
+    healthy = stub_upstream(lambda request: (200, completion(CONTENT), {}))
+    client = client_for(failing, healthy)
+    assert isinstance(client.transport, AsyncEndpointPool)
+    client.transport.endpoints[0].weight = 10.0
+
+    assert asyncio.run(generate(client, '프롬프트')) == STORYBOARD
+    assert [request['authorization'] for request in failing.requests] == ['Bearer key-0']
+    assert [request['authorization'] for request in healthy.requests] == ['Bearer key-1']
+    assert client.get_transport_stats()['endpoints'][0]['ejections'] == 1
+
+
+def test_slow_endpoint_is_hedged(stub_upstream):
+    slow = stub_upstream(lambda request: (200, completion(CONTENT), {}), delay=1.0)
+    fast = stub_upstream(lambda request: (200, completion(CONTENT), {}))
+    client = client_for(slow, fast, hedge_percentile=0.5, hedge_min_samples=1)
+    client.transport.endpoints[0].weight = 10.0
+    client.transport._latencies.append(0.05)
+
+    started = time.perf_counter()
+    assert asyncio.run(generate(client, '프롬프트')) == STORYBOARD
+
+    assert time.perf_counter() - started < 0.8
+    assert client.get_transport_stats()['hedge_wins'] == 1
+
+
+def raw_server(handle):
+    """handle(reader, writer)로 연결을 처리하는 asyncio 서버를 열고 base_url을 반환합니다."""
+    async def start():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/v1"
+    return start()
+
+
+def test_body_without_length_is_capped():
+    async def handle(reader, writer):
+        await reader.readuntil(b'\r\n\r\n')
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n' + b'x' * 4096)
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server, base_url = await raw_server(handle)
+        async with server:
+            transport = AsyncHTTPTransport(base_url, max_retries=0, max_body_bytes=1024)
+            with pytest.raises(AsyncHTTPError, match='너무 큽니다'):
+                await transport.post_json('chat/completions', {}, {})
+            await transport.aclose()
+
+    asyncio.run(run())
+
+
+def test_silent_server_times_out():
+    async def handle(reader, writer):
+        await asyncio.sleep(5)
+
+    async def run():
+        server, base_url = await raw_server(handle)
+        async with server:
+            transport = AsyncHTTPTransport(base_url, read_timeout=0.1, max_retries=0)
+            started = time.perf_counter()
+            with pytest.raises(AsyncHTTPError):
+                await transport.post_json('chat/completions', {}, {})
+            assert time.perf_counter() - started < 1
+            await transport.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,89 @@
+import io
+import json
+import zipfile
+
+from app import app, storyboard_to_text
+from bulk_export import iter_export_zip
+from docx_render import DocxRenderer
+
+
+STORYBOARD = {
+    'wholeTitle': '비 오는 날',
+    'storyTopic': '작은 친절',
+    'hashtags': ['#인스타툰'],
+    'pages': [{
+        'page': 1,
+        'character': ['지민'],
+        'background': '버스 정류장',
+        'dialogue': {'지민': '우산 같이 쓸래요?'},
+        'expressionPose': '웃는 얼굴',
+    }],
+}
+
+
+def export(items):
+    data = b''.join(iter_export_zip(items, DocxRenderer().render_uncached, storyboard_to_text))
+    return zipfile.ZipFile(io.BytesIO(data))
+
+
+def test_each_storyboard_gets_a_folder_with_json_text_and_docx():
+    archive = export([('first', STORYBOARD), ('second', dict(STORYBOARD, wholeTitle='맑은 날'))])
+
+    assert archive.testzip() is None
+    assert archive.namelist() == [
+        '001_first/storyboard.json', '001_first/storyboard.txt', '001_first/storyboard.docx',
+        '002_second/storyboard.json', '002_second/storyboard.txt', '002_second/storyboard.docx',
+    ]
+    assert json.loads(archive.read('002_second/storyboard.json'))['wholeTitle'] == '맑은 날'
+    assert '비 오는 날' in archive.read('001_first/storyboard.txt').decode('utf-8')
+    assert archive.getinfo('001_first/storyboard.docx').compress_type == zipfile.ZIP_STORED
+
+
+def test_chunks_are_yielded_before_later_items_are_read():
+    consumed = []
+
+    def items():
+        for name in ('a', 'b'):
+            consumed.append(name)
+            yield name, STORYBOARD
+
+    chunks = iter_export_zip(items(), DocxRenderer().render_uncached, storyboard_to_text)
+    next(chunks)
+
+    assert consumed == ['a']
+
+
+def test_missing_storyboard_is_listed_in_export_errors():
+    archive = export([('gone', None), ('ok', STORYBOARD)])
+
+    assert '002_ok/storyboard.docx' in archive.namelist()
+    assert 'gone: 스토리보드를 찾을 수 없습니다.' in archive.read('export_errors.txt').decode('utf-8')
+
+
+def test_unconvertible_storyboard_is_reported_instead_of_cutting_off_the_zip():
+    archive = export([
+        ('empty', dict(STORYBOARD, pages=[])),
+        ('untitled', {'pages': STORYBOARD['pages']}),
+        ('ok', STORYBOARD),
+    ])
+
+    names = archive.namelist()
+    assert '003_ok/storyboard.docx' in names
+    assert not any(name.startswith(('001_', '002_')) for name in names)
+    errors = archive.read('export_errors.txt').decode('utf-8')
+    assert 'empty: 변환 실패' in errors
+    assert 'untitled: 변환 실패' in errors
+
+
+def test_bulk_endpoint_streams_a_zip_and_rejects_invalid_storyboards():
+    client = app.test_client()
+
+    response = client.post('/api/export/bulk', json={'storyboards': [STORYBOARD]})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    assert any(name.endswith('/storyboard.docx') for name in archive.namelist())
+
+    response = client.post('/api/export/bulk', json={'storyboards': [{'pages': []}]})
+    assert response.status_code == 400
+    assert client.post('/api/export/bulk', json={}).status_code == 400
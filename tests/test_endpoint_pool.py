@@ -0,0 +1,156 @@
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gpt_client import EndpointPool, GPTClient, GPTConfig
+
+
+def make_pool(*stubs, weights=None, **overrides):
+    weights = weights or [1.0] * len(stubs)
+    endpoints = [{'base_url': stub if isinstance(stub, str) else stub.base_url,
+                  'api_key': f'key-{index}', 'weight': weight}
+                 for index, (stub, weight) in enumerate(zip(stubs, weights))]
+    settings = dict(api_key='unused', endpoints=endpoints, hedge_percentile=0, max_retries=2,
+                    backoff_base=0.01, backoff_max=0.01)
+    settings.update(overrides)
+    return EndpointPool.from_config(GPTConfig(**settings))
+
+
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/v1"
+
+
+def post(pool):
+    return pool.post('chat/completions', headers={'Content-Type': 'application/json'}, json={'model': 'm'})
+
+
+def test_each_endpoint_receives_its_own_api_key(stub_upstream):
+    first, second = stub_upstream(), stub_upstream()
+    pool = make_pool(first, second)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: post(pool), range(8)))
+    finally:
+        pool.close()
+
+    assert {request['authorization'] for request in first.requests} == {'Bearer key-0'}
+    assert {request['authorization'] for request in second.requests} == {'Bearer key-1'}
+
+
+def test_selection_prefers_fewest_outstanding_requests_per_weight(stub_upstream):
+    heavy, light = stub_upstream(), stub_upstream()
+    pool = make_pool(heavy, light, weights=[3.0, 1.0])
+    try:
+        heavy_endpoint, light_endpoint = pool.endpoints
+        assert pool._select() is heavy_endpoint
+
+        heavy_endpoint.outstanding = 3  # (3 + 1) / 3 > (0 + 1) / 1
+        assert pool._select() is light_endpoint
+        heavy_endpoint.outstanding = 0
+
+        slow = [stub_upstream(delay=0.2), stub_upstream(delay=0.2)]
+        slow_pool = make_pool(*slow, weights=[3.0, 1.0])
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: post(slow_pool), range(8)))
+        slow_pool.close()
+        assert len(slow[0].requests) > len(slow[1].requests) > 0
+    finally:
+        pool.close()
+
+
+def test_failing_endpoint_is_ejected_and_the_request_fails_over(stub_upstream):
+    failing = stub_upstream(lambda request: (503, {'error': {'message': 'busy'}}, {}))
+    healthy = stub_upstream()
+    pool = make_pool(failing, healthy, weights=[10.0, 1.0], eject_seconds=30)
+    try:
+        assert post(pool).status_code == 200
+        assert post(pool).status_code == 200
+
+        stats = {endpoint['base_url']: endpoint for endpoint in pool.stats()['endpoints']}
+        assert stats[failing.base_url]['ejections'] == 1
+        assert stats[failing.base_url]['ejected_for'] > 0
+        assert len(failing.requests) == 1
+        assert len(healthy.requests) == 2
+    finally:
+        pool.close()
+
+
+def test_retry_after_sets_the_ejection_time(stub_upstream):
+    limited = stub_upstream(lambda request: (429, {'error': {'message': 'slow down'}}, {'Retry-After': '5'}))
+    healthy = stub_upstream()
+    pool = make_pool(limited, healthy, weights=[10.0, 1.0], eject_seconds=60)
+    try:
+        assert post(pool).status_code == 200
+        ejected_for = pool.stats()['endpoints'][0]['ejected_for']
+        assert 4 <= ejected_for <= 5
+    finally:
+        pool.close()
+
+
+def test_unreachable_endpoint_is_ejected(stub_upstream):
+    healthy = stub_upstream()
+    pool = make_pool(closed_port_url(), healthy, weights=[10.0, 1.0])
+    try:
+        assert post(pool).status_code == 200
+        assert pool.stats()['endpoints'][0]['ejections'] == 1
+    finally:
+        pool.close()
+
+
+def test_slow_request_is_hedged_to_another_endpoint(stub_upstream):
+    slow = stub_upstream(delay=1.0)
+    fast = stub_upstream()
+    pool = make_pool(slow, fast, weights=[10.0, 1.0], hedge_percentile=0.5, hedge_min_samples=1)
+    try:
+        pool._latencies.append(0.05)
+
+        started = time.perf_counter()
+        response = post(pool)
+        elapsed = time.perf_counter() - started
+
+        assert response.status_code == 200
+        assert elapsed < 0.8
+        assert len(slow.requests) == 1 and len(fast.requests) == 1
+        assert pool.stats()['hedged'] == 1
+        assert pool.stats()['hedge_wins'] == 1
+    finally:
+        pool.close()
+
+
+def test_no_hedging_until_enough_latency_samples(stub_upstream):
+    first, second = stub_upstream(), stub_upstream()
+    pool = make_pool(first, second, hedge_percentile=0.5, hedge_min_samples=20)
+    try:
+        post(pool)
+        assert pool.hedge_delay() is None
+        assert pool.stats()['hedged'] == 0
+    finally:
+        pool.close()
+
+
+def test_endpoints_only_config_targets_the_first_endpoint(monkeypatch, stub_upstream):
+    stub = stub_upstream()
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.delenv('OPENAI_BASE_URL', raising=False)
+    monkeypatch.setenv('OPENAI_ENDPOINTS', f"{stub.base_url}|sk-first|2, http://127.0.0.1:9/v1|sk-second")
+
+    client = GPTClient()
+    try:
+        assert client.config.base_url == stub.base_url
+        assert client.config.api_key == 'sk-first'
+        assert isinstance(client.transport, EndpointPool)
+    finally:
+        client.transport.close()
+
+
+def test_endpoint_without_a_key_is_rejected(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.setenv('OPENAI_ENDPOINTS', 'http://127.0.0.1:9/v1')
+
+    with pytest.raises(ValueError):
+        GPTClient()
@@ -0,0 +1,47 @@
+import pytest
+
+from json_repair import extract_json
+
+
+def test_valid_json_inside_prose_and_code_fence_needs_no_repair():
+    text = '설명에 {중괄호}가 있어도\n```json\n{"wholeTitle": "제목", "pages": [{"page": 1}]}\n```\n끝'
+
+    result = extract_json(text)
+
+    assert result.value == {'wholeTitle': '제목', 'pages': [{'page': 1}]}
+    assert result.repairs == []
+    assert not result.repaired
+
+
+@pytest.mark.parametrize('text, repair, expected', [
+    ('{"a": [1, 2,], "b": 3,}', 'trailing_comma', {'a': [1, 2], 'b': 3}),
+    ('{"a": 1,, "b": 2}', 'extra_comma', {'a': 1, 'b': 2}),
+    ('{"a": 1\n "b": 2}', 'missing_comma', {'a': 1, 'b': 2}),
+    ('{"a": }', 'missing_value', {'a': None}),
+    ('{“wholeTitle”: “제목”}', 'smart_quotes', {'wholeTitle': '제목'}),
+    ('{"지민": "그가 "안녕" 이라고 했어"}', 'unescaped_quote', {'지민': '그가 "안녕" 이라고 했어'}),
+    ('{"a": "첫 줄\n둘째 줄"}', 'control_char', {'a': '첫 줄\n둘째 줄'}),
+    ('{"a": True, "b": None}', 'python_literal', {'a': True, 'b': None}),
+    ('{"a": [1, 2}', 'mismatched_bracket', {'a': [1, 2]}),
+])
+def test_common_defects_are_repaired_and_named(text, repair, expected):
+    result = extract_json(text)
+
+    assert result.value == expected
+    assert repair in result.repairs
+
+
+def test_truncated_response_is_cut_back_to_the_last_complete_value():
+    text = '{"wholeTitle": "제목", "pages": [{"page": 1, "background": "카페"}, {"page": 2, "backgr'
+
+    result = extract_json(text)
+
+    assert result.value == {'wholeTitle': '제목', 'pages': [{'page': 1, 'background': '카페'}, {'page': 2}]}
+    assert 'truncated' in result.repairs
+
+
+def test_text_without_an_object_returns_no_json():
+    for text in ('', 'JSON을 만들 수 없습니다.', '[1, 2, 3]'):
+        result = extract_json(text)
+        assert result.json_str is None
+        assert result.value is None
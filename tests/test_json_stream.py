@@ -0,0 +1,78 @@
+import json
+
+from json_stream import StoryboardStreamParser
+
+
+STORYBOARD = {
+    'wholeTitle': '비 오는 날 {우산}',
+    'storyTopic': '작은 "친절"',
+    'hashtags': ['#인스타툰', '#비'],
+    'pages': [
+        {
+            'page': 1,
+            'character': ['지민'],
+            'background': '버스 정류장',
+            'dialogue': {'지민': '우산 같이 쓸래요? }]'},
+            'expressionPose': '웃는 얼굴',
+        },
+        {
+            'page': 2,
+            'character': ['지민', '서연'],
+            'background': '횡단보도',
+            'dialogue': {'서연': '고마워요\n정말로'},
+            'expressionPose': '수줍은 미소',
+        },
+    ],
+}
+
+
+def feed_in_chunks(text, size):
+    parser = StoryboardStreamParser()
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return parser, events
+
+
+def test_fields_and_pages_are_emitted_as_they_complete():
+    text = '```json\n' + json.dumps(STORYBOARD, ensure_ascii=False, indent=2) + '\n```'
+
+    for size in (1, 7, len(text)):
+        parser, events = feed_in_chunks(text, size)
+
+        assert [name for name, _ in events] == ['wholeTitle', 'storyTopic', 'hashtags', 'page', 'page']
+        assert dict(events[:3]) == {key: STORYBOARD[key] for key in ('wholeTitle', 'storyTopic', 'hashtags')}
+        assert [page for name, page in events if name == 'page'] == STORYBOARD['pages']
+        assert parser.finished
+        assert parser.document == STORYBOARD
+        assert not parser.errors
+
+
+def test_page_is_emitted_before_the_array_closes():
+    text = json.dumps(STORYBOARD, ensure_ascii=False)
+    second_page = text.index('{"page": 2')
+
+    parser = StoryboardStreamParser()
+    events = parser.feed(text[:second_page])
+
+    assert events[-1] == ('page', STORYBOARD['pages'][0])
+    assert not parser.finished
+
+
+def test_text_after_the_object_is_ignored():
+    parser = StoryboardStreamParser()
+    parser.feed(json.dumps(STORYBOARD, ensure_ascii=False))
+
+    assert parser.feed('\n추가 설명입니다. {"wholeTitle": "다른 제목"}') == []
+    assert parser.document['wholeTitle'] == STORYBOARD['wholeTitle']
+
+
+def test_completed_pages_survive_a_broken_array():
+    first_page = json.dumps(STORYBOARD['pages'][0], ensure_ascii=False)
+    text = '{"wholeTitle": "제목", "pages": [' + first_page + ', {"page": 2,}]}'
+
+    parser, events = feed_in_chunks(text, 5)
+
+    assert ('page', STORYBOARD['pages'][0]) in events
+    assert parser.document['pages'] == [STORYBOARD['pages'][0]]
+    assert parser.errors
@@ -0,0 +1,62 @@
+from ranking import keyword_terms, rank_candidates, safe_zone_char_limit, score_storyboard
+
+
+def page(number, dialogue='우산 같이 쓸래요?', **overrides):
+    data = {
+        'page': number,
+        'character': ['지민'],
+        'background': '버스 정류장',
+        'dialogue': {'지민': dialogue},
+        'expressionPose': '웃는 얼굴',
+    }
+    data.update(overrides)
+    return data
+
+
+def storyboard(pages, title='비 오는 날'):
+    return {'wholeTitle': title, 'storyTopic': '작은 친절', 'hashtags': ['#인스타툰'], 'pages': pages}
+
+
+USER_INPUT = {'keywords': '우산, 버스 정류장', 'pages': '2'}
+
+
+def test_keyword_terms_split_on_commas_or_whitespace():
+    assert keyword_terms('우산, 버스 정류장') == ['우산', '버스 정류장']
+    assert keyword_terms('우산 비') == ['우산', '비']
+    assert keyword_terms('없음') == []
+    assert keyword_terms('') == []
+
+
+def test_safe_zone_char_limit():
+    assert safe_zone_char_limit(image_size=1080, margin=90, font_px=45, max_lines=3) == 60
+    assert safe_zone_char_limit(image_size=100, margin=50, font_px=45, max_lines=2) == 2
+
+
+def test_complete_matching_storyboard_scores_full_marks():
+    scores = score_storyboard(storyboard([page(1), page(2)]), USER_INPUT)
+
+    assert scores == {'keywords': 1.0, 'page_count': 1.0, 'completeness': 1.0, 'safe_zone': 1.0, 'total': 1.0}
+
+
+def test_keywords_ignore_spacing_differences():
+    scores = score_storyboard(storyboard([page(1, background='버스정류장'), page(2)]), {'keywords': '버스 정류장'})
+
+    assert scores['keywords'] == 1.0
+
+
+def test_each_component_penalises_its_own_defect():
+    assert score_storyboard(storyboard([page(1)]), USER_INPUT)['page_count'] == 0.5
+    assert score_storyboard(storyboard([page(1), page(2, background='')]), USER_INPUT)['completeness'] == 0.875
+    assert score_storyboard(storyboard([page(1), page(2, dialogue='가' * 1000)]), USER_INPUT)['safe_zone'] < 1.0
+    assert score_storyboard(storyboard([]), USER_INPUT)['total'] < 0.5
+
+
+def test_rank_candidates_orders_by_score_and_keeps_ties_stable():
+    complete = storyboard([page(1), page(2)], title='완성')
+    short = storyboard([page(1)], title='짧음')
+    tie = storyboard([page(1), page(2)], title='동점')
+
+    ranked = rank_candidates([short, complete, tie], USER_INPUT)
+
+    assert [candidate['storyboard']['wholeTitle'] for candidate in ranked] == ['완성', '동점', '짧음']
+    assert ranked[0]['score'] == ranked[0]['scores']['total']
@@ -0,0 +1,72 @@
+from search_index import SearchIndex, tokenize
+from storage import SQLiteStoryboardStore, filename_for
+
+
+def storyboard(title, dialogue='안녕하세요', hashtags=()):
+    return {
+        'wholeTitle': title,
+        'storyTopic': '일상',
+        'hashtags': list(hashtags),
+        'pages': [{'page': 1, 'character': ['지민'], 'background': '교실',
+                   'dialogue': {'지민': dialogue}, 'expressionPose': '웃음'}],
+    }
+
+
+def test_tokenize_splits_words_into_overlapping_ngrams():
+    assert tokenize('비 오는 날') == ['비', '오는', '날']
+    assert tokenize('고양이') == ['고양', '양이']
+    assert tokenize('ＡＢＣ_d') == ['ab', 'bc', 'cd']
+    assert tokenize('') == []
+
+
+def test_add_is_idempotent_per_id(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+
+    assert index.add('a', storyboard('비 오는 날'))
+    assert not index.add('a', storyboard('비 오는 날'))
+    assert index.contains('a')
+    assert not index.contains('b')
+    assert index.stats() == {'documents': 1}
+
+
+def test_search_requires_every_ngram_and_ranks_title_matches_first(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    index.add('title', storyboard('고양이 카페'), created_at=1)
+    index.add('dialogue', storyboard('평범한 하루', dialogue='고양이가 좋아'), created_at=2)
+    index.add('other', storyboard('강아지 산책'), created_at=3)
+
+    results, total = index.search('고양이')
+
+    assert total == 2
+    assert [result['id'] for result in results] == ['title', 'dialogue']
+    assert results[0]['filename'] == filename_for('title')
+    assert results[0]['score'] > results[1]['score']
+    assert index.search('고양이 산책') == ([], 0)
+    assert index.search('!!!') == ([], 0)
+
+
+def test_search_paginates_and_reports_the_total_past_the_last_page(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    for number in range(5):
+        index.add(f'id-{number}', storyboard(f'여름 방학 {number}'), created_at=number + 1)
+
+    first, total = index.search('여름', page=1, per_page=2)
+    second, _ = index.search('여름', page=2, per_page=2)
+    past, past_total = index.search('여름', page=9, per_page=2)
+
+    assert total == past_total == 5
+    assert [result['id'] for result in first] == ['id-4', 'id-3']
+    assert [result['id'] for result in second] == ['id-2', 'id-1']
+    assert past == []
+
+
+def test_backfill_indexes_only_missing_storyboards(tmp_path):
+    store = SQLiteStoryboardStore(str(tmp_path / 'storyboards.db'))
+    saved = [store.save(storyboard(f'벚꽃 이야기 {number}')) for number in range(3)]
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    index.add(saved[0]['id'], storyboard('벚꽃 이야기 0'))
+
+    assert index.backfill(store, batch_size=2) == 2
+    assert index.backfill(store, batch_size=2) == 0
+    _, total = index.search('벚꽃')
+    assert total == 3
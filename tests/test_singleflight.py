@@ -0,0 +1,93 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from singleflight import SingleFlight, SingleFlightTimeout
+
+
+def run_concurrently(flight, key, fn, callers):
+    """leader가 fn 안에서 기다리는 동안 나머지 호출자를 모두 합류시킨 뒤 fn을 끝냅니다."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def leader_fn():
+        started.set()
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(flight.do, key, leader_fn)]
+        assert started.wait(5)
+        futures += [executor.submit(flight.do, key, leader_fn) for _ in range(callers - 1)]
+        while flight.stats()['waiting'] < callers - 1:
+            time.sleep(0.001)
+        release.set()
+        return futures
+
+
+def test_concurrent_callers_share_one_execution_and_get_copies():
+    flight = SingleFlight(timeout=5)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return {'pages': [{'page': 1}]}
+
+    futures = run_concurrently(flight, 'key', fn, callers=4)
+    results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result == {'pages': [{'page': 1}]} for result in results)
+    results[1]['pages'].clear()
+    assert results[0]['pages'] and results[2]['pages']
+    assert flight.stats() == {'leaders': 1, 'coalesced': 3, 'timeouts': 0, 'errors': 0,
+                              'in_flight': 0, 'waiting': 0}
+
+
+def test_error_reaches_every_waiter():
+    flight = SingleFlight(timeout=5)
+
+    def fn():
+        raise RuntimeError('upstream failed')
+
+    futures = run_concurrently(flight, 'key', fn, callers=3)
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match='upstream failed'):
+            future.result()
+    assert flight.stats()['errors'] == 1
+
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    results = iter([1, 2])
+
+    assert flight.do('key', lambda: next(results)) == 1
+    assert flight.do('key', lambda: next(results)) == 2
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+
+    assert flight.do('cached', lambda: 'a') == 'a'
+    assert flight.do('cached:fresh', lambda: 'b') == 'b'
+    assert flight.stats()['coalesced'] == 0
+
+
+def test_waiter_times_out_while_the_leader_keeps_running():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=('key', lambda: release.wait(5)))
+    leader.start()
+    while not flight.in_flight():
+        time.sleep(0.001)
+
+    with pytest.raises(SingleFlightTimeout):
+        flight.do('key', lambda: None, timeout=0.05)
+
+    release.set()
+    leader.join()
+    assert flight.stats()['timeouts'] == 1
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from gpt_client import GPTClient, GPTConfig
+from storyboard_model import NARRATION, Storyboard, load_storyboard, normalize_page, normalize_storyboard
+
+
+def page(number, **overrides):
+    data = {
+        'page': number,
+        'character': ['지민'],
+        'background': '버스 정류장',
+        'dialogue': {'지민': '우산 같이 쓸래요?'},
+        'expressionPose': '웃는 얼굴',
+    }
+    data.update(overrides)
+    return data
+
+
+STORYBOARD = {'wholeTitle': '비 오는 날', 'storyTopic': '작은 친절', 'hashtags': ['#인스타툰'],
+              'pages': [page(1), page(2)]}
+
+
+def test_valid_storyboard_is_unchanged():
+    result = normalize_storyboard(STORYBOARD)
+
+    assert result.storyboard == STORYBOARD
+    assert result.repairs == []
+    assert result.dropped == []
+
+
+def test_page_field_shapes_are_repaired():
+    normalized, repairs = normalize_page({
+        'pageNumber': '3페이지',
+        'characters': '지민, 현우',
+        'dialogue': ['지민: 우산 같이 쓸래요?', '고마워요'],
+        'background': '버스 정류장',
+        'expression': '웃는 얼굴',
+    })
+
+    assert normalized == {
+        'page': 3,
+        'character': ['지민', '현우'],
+        'background': '버스 정류장',
+        'dialogue': {'지민': '우산 같이 쓸래요?', NARRATION: '고마워요'},
+        'expressionPose': '웃는 얼굴',
+    }
+    assert set(repairs) == {'renamed_field', 'page_number_string', 'string_to_list', 'dialogue_list'}
+
+
+def test_characters_are_taken_from_dialogue_when_missing():
+    normalized, repairs = normalize_page(page(1, character=None, dialogue={'지민': '안녕', NARRATION: '비가 온다'}))
+
+    assert normalized['character'] == ['지민']
+    assert 'character_from_dialogue' in repairs
+
+
+def test_empty_page_cannot_be_recovered():
+    assert normalize_page({'page': 1, 'character': ['지민']})[0] is None
+    assert normalize_page('1페이지')[0] is None
+
+
+def test_pages_are_unwrapped_reordered_and_unrecoverable_ones_dropped():
+    result = normalize_storyboard({'storyboard': {
+        'title': '비 오는 날', 'storyTopic': '작은 친절', 'tags': '#인스타툰 #비',
+        'pages': {'2': {'background': '집'}, '1': {'background': '버스 정류장'}, '3': {'character': ['지민']}},
+    }})
+
+    pages = result.storyboard['pages']
+    assert [(item['page'], item['background']) for item in pages] == [(1, '버스 정류장'), (2, '집')]
+    assert result.storyboard['hashtags'] == ['#인스타툰', '#비']
+    assert result.dropped == [2]
+    assert {'unwrapped', 'renamed_field', 'pages_object', 'pages_reordered', 'page_dropped'} <= set(result.repairs)
+
+
+def test_missing_top_level_fields_are_not_filled_in():
+    result = normalize_storyboard({'pages': [page(1)]})
+
+    assert 'wholeTitle' not in result.storyboard
+    assert 'hashtags' not in result.storyboard
+    with pytest.raises(ValueError):
+        load_storyboard({'pages': [page(1)]})
+
+
+def test_load_storyboard_returns_the_model_or_raises():
+    storyboard = load_storyboard(dict(STORYBOARD, pages=[page('2'), page('1', dialogue='지민: 고마워요')]))
+
+    assert isinstance(storyboard, Storyboard)
+    assert [item.number for item in storyboard.pages] == [1, 2]
+    assert storyboard.pages[0].dialogue == {'지민': '고마워요'}
+    assert storyboard.to_dict()['wholeTitle'] == '비 오는 날'
+    with pytest.raises(ValueError):
+        load_storyboard(dict(STORYBOARD, pages=[{'page': 1}]))
+
+
+def test_streamed_pages_are_normalized_and_numbered_in_arrival_order():
+    raw = dict(STORYBOARD, pages=[
+        page(5, character='지민', dialogue=['지민: 우산 같이 쓸래요?']),
+        {'page': 6},
+        page('7'),
+    ])
+    text = json.dumps(raw, ensure_ascii=False)
+    client = GPTClient(GPTConfig(api_key='sk-test', base_url='http://127.0.0.1:9/v1'))
+    client._stream_request = lambda prompt, max_tokens=None, outcome=None: iter(
+        text[index:index + 7] for index in range(0, len(text), 7))
+
+    try:
+        events = list(client.stream_storyboard('프롬프트'))
+    finally:
+        client.transport.close()
+
+    streamed = [value for event, value in events if event == 'page']
+    assert [item['page'] for item in streamed] == [1, 2]
+    assert streamed[0]['character'] == ['지민']
+    assert streamed[0]['dialogue'] == {'지민': '우산 같이 쓸래요?'}
+    assert events[-1][0] == 'done'
@@ -0,0 +1,45 @@
+from token_budget import TokenBudget
+
+
+def test_budget_scales_with_pages_and_is_clamped():
+    budget = TokenBudget(overhead_tokens=100, per_page_tokens=200, per_page_stddev=50, margin=2,
+                         min_tokens=600, max_tokens=2000)
+
+    assert budget.budget(None) is None
+    assert budget.budget(0) is None
+    assert budget.budget(1) == 600
+    assert budget.budget(4) == 100 + 4 * 300
+    assert budget.budget(10) == 2000
+
+
+def test_observations_move_the_per_page_estimate():
+    budget = TokenBudget(overhead_tokens=100, per_page_tokens=300, per_page_stddev=0, margin=0,
+                         alpha=0.5, min_tokens=1, max_tokens=10000)
+
+    budget.observe(4, 100 + 4 * 200)
+
+    assert budget.stats()['per_page_mean'] == 250
+    assert budget.stats()['observations'] == 1
+    assert budget.budget(4) < 100 + 4 * 300
+
+
+def test_truncation_grows_the_estimate_without_counting_as_an_observation():
+    budget = TokenBudget(per_page_tokens=300, truncation_growth=1.5)
+
+    budget.observe(4, 500, truncated=True)
+
+    stats = budget.stats()
+    assert stats['per_page_mean'] == 450
+    assert stats['truncations'] == 1
+    assert stats['observations'] == 0
+
+
+def test_unusable_observations_are_ignored():
+    budget = TokenBudget()
+    before = budget.stats()
+
+    budget.observe(None, 1000)
+    budget.observe(4, None)
+    budget.observe(4, 0)
+
+    assert budget.stats() == before
@@ -0,0 +1,71 @@
+"""테스트용 로컬 업스트림(chat/completions) 스텁 서버"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def completion(content, finish_reason='stop', completion_tokens=100):
+    """chat/completions 응답 본문"""
+    return {
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content},
+                     'finish_reason': finish_reason}],
+        'usage': {'prompt_tokens': 10, 'completion_tokens': completion_tokens},
+    }
+
+
+class StubUpstream:
+    """테스트용 로컬 업스트림 서버
+
+    POST 요청마다 respond(요청 JSON)가 돌려준 (상태 코드, 본문, 헤더)로 응답하고,
+    받은 요청의 본문과 Authorization 헤더를 requests에 기록합니다. delay만큼 늦게 응답합니다.
+    """
+
+    def __init__(self, respond=None, delay=0.0):
+        self.respond = respond or (lambda request: (200, completion('{}'), {}))
+        self.delay = delay
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                self._send(200, {'object': 'list', 'data': []}, {})
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                stub.requests.append({'path': self.path, 'authorization': self.headers.get('Authorization'),
+                                      'body': request})
+                time.sleep(stub.delay)
+                status, payload, headers = stub.respond(request)
+                try:
+                    self._send(status, payload, headers)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # 중복 요청에서 진 쪽은 클라이언트가 먼저 연결을 닫습니다
+
+            def _send(self, status, payload, headers):
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/v1"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
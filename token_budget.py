@@ -0,0 +1,72 @@
+"""
+출력 토큰 예산 모듈
+요청한 페이지 수와 실제 응답에서 측정한 페이지당 토큰 수로 max_tokens를 정하고,
+관측값이 쌓일수록 예산을 조정합니다.
+"""
+
+import math
+import threading
+from typing import Dict, Optional
+
+
+class TokenBudget:
+    """페이지 수 기반 출력 토큰 예산
+
+    예산 = 고정 부분(제목·주제·해시태그) + 페이지 수 × (페이지당 평균 + margin × 표준편차)
+    페이지당 토큰 수의 평균과 분산은 지수 이동 평균으로 갱신합니다.
+    응답이 잘린(finish_reason == "length") 경우 추정치를 늘려 다음 요청부터 반영합니다.
+    """
+
+    def __init__(self, overhead_tokens: int = 150, per_page_tokens: float = 300.0,
+                 per_page_stddev: float = 60.0, margin: float = 2.0, alpha: float = 0.2,
+                 min_tokens: int = 600, max_tokens: int = 6000, truncation_growth: float = 1.25):
+        self.overhead_tokens = overhead_tokens
+        self.margin = margin
+        self.alpha = alpha
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.truncation_growth = truncation_growth
+        self._mean = per_page_tokens
+        self._variance = per_page_stddev ** 2
+        self._lock = threading.Lock()
+        self._stats = {'observations': 0, 'truncations': 0}
+
+    def budget(self, pages: Optional[int]) -> Optional[int]:
+        """pages 페이지 스토리보드의 max_tokens를 반환합니다. pages가 없으면 None을 반환합니다."""
+        if not pages or pages < 1:
+            return None
+        with self._lock:
+            per_page = self._mean + self.margin * math.sqrt(self._variance)
+        tokens = int(math.ceil(self.overhead_tokens + pages * per_page))
+        return max(self.min_tokens, min(self.max_tokens, tokens))
+
+    def observe(self, pages: Optional[int], completion_tokens: Optional[int], truncated: bool = False):
+        """완성된 응답의 토큰 사용량으로 페이지당 추정치를 갱신합니다.
+
+        completion_tokens는 이어쓰기를 포함한 전체 출력 토큰 수입니다.
+        """
+        if not pages or pages < 1:
+            return
+        with self._lock:
+            if truncated:
+                # 잘린 응답의 토큰 수는 실제 필요량보다 작으므로 추정치만 키웁니다
+                self._stats['truncations'] += 1
+                self._mean *= self.truncation_growth
+                return
+            if not isinstance(completion_tokens, int) or completion_tokens <= 0:
+                return
+            sample = max(completion_tokens - self.overhead_tokens, 0) / pages
+            delta = sample - self._mean
+            self._mean += self.alpha * delta
+            self._variance = (1 - self.alpha) * (self._variance + self.alpha * delta * delta)
+            self._stats['observations'] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """현재 페이지당 추정치와 관측/잘림 횟수를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['per_page_mean'] = round(self._mean, 1)
+            stats['per_page_stddev'] = round(math.sqrt(self._variance), 1)
+        stats['budget_4_pages'] = self.budget(4)
+        stats['budget_10_pages'] = self.budget(10)
+        return stats